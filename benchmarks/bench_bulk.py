@@ -0,0 +1,52 @@
+"""
+Benchmark: serial get_detail_mhs loop vs get_detail_mhs_many fan-out.
+
+Runs against the local stub server with a fixed per-response latency, so the
+numbers show how much of the upstream latency the fan-out hides.
+
+Usage:
+    python benchmarks/bench_bulk.py [--ids 400] [--latency 0.02] [--workers 1 8 32 64]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from pddiktipy import api
+from stub_server import StubServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ids", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, nargs="+", default=[8, 32, 64])
+    args = parser.parse_args()
+    logging.getLogger("pddiktipy").setLevel(logging.WARNING)
+
+    ids = [f"mahasiswa-{i:06d}" for i in range(args.ids)]
+    print(f"{args.ids} IDs, {args.latency * 1000:.0f} ms upstream latency")
+    print(f"{'mode':<22}{'seconds':>10}{'req/s':>10}{'errors':>8}")
+
+    with StubServer(latency=args.latency) as server:
+        with api(base_url=server.base_url, user_ip="127.0.0.1") as client:
+            start = time.perf_counter()
+            errors = sum(client.get_detail_mhs(i) is None for i in ids)
+            elapsed = time.perf_counter() - start
+            print(f"{'serial loop':<22}{elapsed:>10.2f}{len(ids) / elapsed:>10.0f}{errors:>8}")
+
+        for workers in args.workers:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", max_threads=workers) as client:
+                start = time.perf_counter()
+                errors = sum(not r.ok for r in client.get_detail_mhs_many(ids, max_workers=workers))
+                elapsed = time.perf_counter() - start
+                print(f"{f'many, {workers} workers':<22}{elapsed:>10.2f}{len(ids) / elapsed:>10.0f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
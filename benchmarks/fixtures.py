@@ -0,0 +1,308 @@
+"""
+Fixture payloads for the benchmark stub server.
+
+One payload per endpoint template used by ``api`` (see
+``pddiktipy.endpoints.endpoint_template``). Payloads mirror the field names
+and typical sizes of live PDDIKTI responses: searches return a page of
+rows, ``pt/prodi`` and ``dosen/homebase`` return dozens of records and the
+``visualisasi/*`` datasets hundreds. Values are synthetic and deterministic.
+
+Recorded responses can replace them: ``load_fixtures(path)`` reads a
+cassette file (``pddiktipy.cassette``) or a directory of ``<template>.json``
+files named like ``pt__prodi__id__tahun.json``.
+
+``WORKLOAD`` lists one call per public ``api`` method with arguments the
+stub answers, for mixed-traffic benchmarks.
+"""
+
+import base64
+import json
+import os
+import random
+
+PT_ID = "6m7kg4twGiZAdNiUDMC9Q6KaGqUBqNU9_fLWD8DaSxMF-cIjwu8A7K6lWYKzaJXGBDQHsQ=="
+PRODI_ID = "lCOatIX_hCe2RQSG1Rghn5kO81hHLJdYawJxkqiblUu6ZPeJ9OkBwbb5tnuvQqb-WcMSAg=="
+DOSEN_ID = "cWS5HuRYaG9KU4nyNc5Ue2dYqK6Y87qxHe3an1uTAhr-ohr7y-Lm6G7pQP2Jy0V_KR-q4A=="
+MHS_ID = "zQpt4pGGyVuhVoglK-qW4_C9iM-y-8vcO5EVX04cycXvwpx4Tvi8FbeyI5MbUrakrD_C0w=="
+SEMESTER = "20241"
+
+# 1x1 transparent PNG
+LOGO_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+_rng = random.Random(20241)
+_NAMES = ["Ahmad", "Siti", "Budi", "Dewi", "Rizky", "Putri", "Agus", "Nur", "Eko", "Fitri"]
+_PRODI = ["Sistem Informasi", "Teknik Informatika", "Manajemen", "Akuntansi", "Hukum",
+          "Psikologi", "Arsitektur", "Kedokteran", "Ilmu Komunikasi", "Teknik Sipil"]
+_PROVINSI = ["Jawa Tengah", "Jawa Barat", "Jawa Timur", "DKI Jakarta", "D.I. Yogyakarta",
+             "Sumatera Utara", "Sulawesi Selatan", "Bali", "Kalimantan Timur", "Papua"]
+
+
+def _id():
+    return base64.urlsafe_b64encode(_rng.getrandbits(384).to_bytes(48, "big")).decode()
+
+
+def _name():
+    return f"{_rng.choice(_NAMES)} {_rng.choice(_NAMES)}"
+
+
+def _mahasiswa():
+    return {"id": _id(), "nama": _name().upper(), "nim": str(_rng.randrange(10 ** 9, 10 ** 10)),
+            "nama_pt": "UNIVERSITAS KATOLIK SOEGIJAPRANATA", "sinkatan_pt": "UNIKA",
+            "nama_prodi": _rng.choice(_PRODI)}
+
+
+def _dosen():
+    return {"id": _id(), "nama": _name(), "nidn": str(_rng.randrange(10 ** 9, 10 ** 10)), "nuptk": "",
+            "nama_pt": "Universitas Katolik Soegijapranata", "sinkatan_pt": "UNIKA",
+            "nama_prodi": _rng.choice(_PRODI)}
+
+
+def _pt():
+    return {"id": _id(), "kode": str(_rng.randrange(10 ** 5, 10 ** 6)), "nama_singkat": "UNIKA",
+            "nama": "UNIVERSITAS KATOLIK SOEGIJAPRANATA"}
+
+
+def _prodi_row():
+    return {"id": _id(), "nama": _rng.choice(_PRODI), "jenjang": _rng.choice(["S1", "S2", "S3", "D3"]),
+            "pt": "UNIVERSITAS KATOLIK SOEGIJAPRANATA", "pt_singkat": "UNIKA"}
+
+
+def _portofolio(kind):
+    return [{"id_sdm": DOSEN_ID, "jenis_kegiatan": kind, "judul_kegiatan": f"{kind} tentang {_rng.choice(_PRODI)}",
+             "tahun_kegiatan": str(_rng.randrange(2005, 2025))} for _ in range(25)]
+
+
+def _series(labels, years=range(2015, 2025)):
+    return [{"nama": label, "tahun": str(year), "jumlah": _rng.randrange(100, 100000)}
+            for label in labels for year in years]
+
+
+def _build():
+    prodi_pt = [{
+        "id_sms": _id(), "kode_prodi": str(_rng.randrange(10 ** 4, 10 ** 5)), "nama_prodi": _rng.choice(_PRODI),
+        "status": "Aktif", "jenjang_didik": _rng.choice(["S1", "S2", "S3", "D3", "Profesi"]),
+        "akreditasi": _rng.choice(["Unggul", "Baik Sekali", "Baik", "A", "B"]),
+        "jumlah_dosen_penghitung_ratio": _rng.randrange(5, 40), "jumlah_dosen_permanen": _rng.randrange(5, 40),
+        "jumlah_dosen_tidak_permanen": _rng.randrange(0, 10), "jumlah_dosen": _rng.randrange(5, 50),
+        "jumlah_mahasiswa": _rng.randrange(50, 3000), "rasio": f"1:{_rng.randrange(5, 60)}",
+        "keterangan_rasio": "Sesuai", "status_rasio": "Sesuai", "rasio_list": {"dosen": 20, "mahasiswa": 600},
+    } for _ in range(60)]
+    homebase = [{
+        "nidn": str(_rng.randrange(10 ** 9, 10 ** 10)), "nuptk": "", "nama_dosen": _name(),
+        "pendidikan": _rng.choice(["S2", "S3"]), "status": "Aktif", "status_pegawai": "Dosen Tetap",
+        "ikatan_kerja": "Dosen Tetap", "id_sdm": _id(),
+    } for _ in range(45)]
+
+    return {
+        "pencarian/all/{keyword}": {
+            "mahasiswa": [_mahasiswa() for _ in range(50)], "dosen": [_dosen() for _ in range(50)],
+            "pt": [_pt() for _ in range(10)], "prodi": [_prodi_row() for _ in range(20)],
+        },
+        "pencarian/mhs/{keyword}": [_mahasiswa() for _ in range(100)],
+        "pencarian/dosen/{keyword}": [_dosen() for _ in range(100)],
+        "pencarian/pt/{keyword}": [_pt() for _ in range(50)],
+        "pencarian/prodi/{keyword}": [_prodi_row() for _ in range(100)],
+        "detail/mhs/{id}": {
+            "id": MHS_ID, "nama_pt": "Universitas Katolik Soegijapranata", "kode_pt": "061032",
+            "kode_prodi": "57201", "prodi": "Sistem Informasi", "nama": "ILHAM RISKI WIBOWO",
+            "nim": "19N10001", "jenis_daftar": "Peserta didik baru", "id_pt": PT_ID, "id_sms": PRODI_ID,
+            "jenis_kelamin": "L", "jenjang": "S1", "status_saat_ini": "Lulus - 2023/2024 Genap",
+            "tanggal_masuk": "2019-08-26",
+        },
+        "dosen/profile/{id}": {
+            "id_sdm": DOSEN_ID, "nama_dosen": "Ridwan Sanjaya", "nama_pt": "Universitas Katolik Soegijapranata",
+            "nama_prodi": "Sistem Informasi", "jenis_kelamin": "Laki-laki", "jabatan_akademik": "Profesor",
+            "pendidikan_tertinggi": "S3", "status_ikatan_kerja": "Dosen Tetap", "status_aktivitas": "Aktif",
+        },
+        "dosen/portofolio/penelitian/{id}": _portofolio("Penelitian"),
+        "dosen/portofolio/pengabdian/{id}": _portofolio("Pengabdian"),
+        "dosen/portofolio/karya/{id}": _portofolio("Karya"),
+        "dosen/portofolio/paten/{id}": _portofolio("Paten")[:3],
+        "dosen/study-history/{id}": [{
+            "id_sdm": DOSEN_ID, "nidn": "0600000000", "nama": "Ridwan Sanjaya", "nama_pt": "Universitas " + name,
+            "nama_prodi": "Sistem Informasi", "jenjang": jenjang, "gelar_akademik": gelar,
+            "bidang_studi": "Sistem Informasi", "tahun_lulus": year,
+        } for name, jenjang, gelar, year in (("Gadjah Mada", "S1", "S.E.", "1997"), ("Indonesia", "S2", "M.S.I.E.", "2001"),
+                                             ("Katolik Soegijapranata", "S3", "Ph.D.", "2012"))],
+        "dosen/teaching-history/{id}": [{
+            "id_sdm": DOSEN_ID, "nama_semester": f"{_rng.randrange(2015, 2025)}/{_rng.choice(['Ganjil', 'Genap'])}",
+            "kode_matkul": f"SI{_rng.randrange(100, 999)}", "nama_matkul": f"Mata Kuliah {_rng.choice(_PRODI)}",
+            "nama_kelas": _rng.choice("ABCD"), "nama_pt": "Universitas Katolik Soegijapranata",
+        } for _ in range(120)],
+        "detail/pt/{id}": {
+            "kelompok": "PTS", "pembina": "Kementerian Pendidikan Tinggi", "id_sp": PT_ID, "kode_pt": "061032",
+            "email": "info@unika.ac.id", "no_tel": "0248441555", "no_fax": "0248415429", "website": "www.unika.ac.id",
+            "alamat": "Jl. Pawiyatan Luhur IV/1 Bendan Duwur", "nama_pt": "Universitas Katolik Soegijapranata",
+            "nm_singkat": "UNIKA", "kode_pos": "50234", "provinsi_pt": "Prov. Jawa Tengah", "kab_kota_pt": "Kota Semarang",
+            "kecamatan_pt": "Kec. Gajah Mungkur", "lintang_pt": -7.0238, "bujur_pt": 110.4069, "tgl_berdiri_pt": "1982-08-05",
+            "tgl_sk_pendirian_sp": "1982-08-05", "sk_pendirian_sp": "0385/O/1982", "status_pt": "A",
+            "akreditasi_pt": "Unggul", "status_akreditasi": "A", "tgl_akhir_akreditasi": "2027-11-15",
+        },
+        "pt/prodi/{id}/{tahun}": prodi_pt,
+        "pt/logo/{id}": LOGO_PNG,
+        "pt/rasio/{id}": {"jumlah_dosen": 350, "jumlah_mahasiswa": 9000, "rasio": "1:26"},
+        "pt/mahasiswa/{id}": _series(["Mahasiswa"]),
+        "pt/waktu-studi/{id}": [{"jenjang": j, "rata_rata": round(_rng.uniform(3.5, 6), 2)} for j in ("S1", "S2", "S3")],
+        "pt/name-histories/{id}": [{"nama": "Universitas Katolik Soegijapranata", "tahun": "1982"}],
+        "pt/cost-range/{id}": {"biaya_min": 8500000, "biaya_max": 75000000},
+        "pt/graduation-rate/{id}": _series(["Lulus Tepat Waktu"]),
+        "pt/jumlah-prodi/{id}": _series(["S1", "S2", "S3"]),
+        "pt/jumlah-mahasiswa/{id}": _series(["Aktif", "Cuti", "Non Aktif"]),
+        "pt/jumlah-dosen/{id}": _series(["Tetap", "Tidak Tetap"]),
+        "pt/sarpras-file-name/{id}": [{"id_sarpras": _id(), "nama_file": f"sarpras-{i}.pdf"} for i in range(5)],
+        "pt/sarpras-blob/{id}": {"blob": base64.b64encode(bytes(_rng.getrandbits(8) for _ in range(4096))).decode()},
+        "prodi/detail/{id}": {
+            "id_sp": PT_ID, "id_sms": PRODI_ID, "nama_pt": "Universitas Katolik Soegijapranata", "kode_pt": "061032",
+            "nama_prodi": "Sistem Informasi", "kode_prodi": "57201", "jenjang_didik": "S1", "status": "A",
+            "akreditasi": "Baik Sekali", "tgl_berdiri": "2003-06-20", "email": "si@unika.ac.id",
+            "visi": "Menjadi program studi unggul. " * 10, "misi": "Menyelenggarakan pendidikan. " * 20,
+        },
+        "prodi/desc/{id}": {"deskripsi": "Program studi Sistem Informasi. " * 30, "kompetensi": "Analis sistem. " * 10},
+        "prodi/name-histories/{id}": [{"nama": "Sistem Informasi", "tahun": "2003"}],
+        "prodi/num-students-lecturers/{id}": _series(["Mahasiswa", "Dosen"]),
+        "prodi/cost-range/{id}": {"biaya_min": 8500000, "biaya_max": 25000000},
+        "prodi/daya-tampung/{id}": _series(["Daya Tampung", "Peminat"]),
+        "prodi/rasio-dosen-mahasiswa/{id}": _series(["Rasio"]),
+        "prodi/graduation-rate/{id}": _series(["Lulus Tepat Waktu"]),
+        "prodi/logo-pt/{id}": LOGO_PNG,
+        "dosen/homebase/{id}": homebase,
+        "dosen/penghitung-ratio/{id}": homebase[:30],
+        "dosen/count-active": 312456,
+        "mahasiswa/count-active": 9876543,
+        "prodi/count": 31234,
+        "pt/count": 4523,
+        "visualisasi/dosen-keaktifan": _series(["Aktif", "Tugas Belajar", "Ijin Belajar", "Cuti"]),
+        "visualisasi/dosen-bidang": _series([f"Bidang {i}" for i in range(25)]),
+        "visualisasi/dosen-jenis-kelamin": _series(["Laki-laki", "Perempuan"]),
+        "visualisasi/dosen-jenjang": _series(["S1", "S2", "S3", "Profesi", "Sp-1", "Sp-2"]),
+        "visualisasi/dosen-ikatan": _series(["Dosen Tetap", "Dosen Tidak Tetap", "Dosen NIDK"]),
+        "visualisasi/mahasiswa-bidang": _series([f"Bidang {i}" for i in range(25)]),
+        "visualisasi/mahasiswa-jenis-kelamin": _series(["Laki-laki", "Perempuan"]),
+        "visualisasi/mahasiswa-jenjang": _series(["D3", "D4", "S1", "S2", "S3", "Profesi"]),
+        "visualisasi/mahasiswa-kelompok-lembaga": _series(["PTN", "PTS", "PTK", "PTA"]),
+        "visualisasi/mahasiswa-status": _series(["Aktif", "Cuti", "Non Aktif", "Lulus", "Keluar"]),
+        "visualisasi/pt-bentuk": _series(["Universitas", "Institut", "Sekolah Tinggi", "Politeknik", "Akademi"]),
+        "visualisasi/pt-akreditasi": _series(["Unggul", "Baik Sekali", "Baik", "A", "B", "C"]),
+        "visualisasi/pt-kelompok-pembina": _series(["Kemdiktisaintek", "Kemenag", "Kementerian Lain"]),
+        "visualisasi/pt-provinsi": _series(_PROVINSI * 4),
+        "visualisasi/prodi-jenjang": _series(["D3", "D4", "S1", "S2", "S3", "Profesi"]),
+        "visualisasi/prodi-akreditasi": _series(["Unggul", "Baik Sekali", "Baik", "A", "B", "C"]),
+        "visualisasi/prodi-bidang-ilmu": _series([f"Bidang {i}" for i in range(25)]),
+        "visualisasi/prodi-kelompok-pembina": _series(["Kemdiktisaintek", "Kemenag", "Kementerian Lain"]),
+        "contributor/contributor": [{"nama": _name(), "github": f"user{i}"} for i in range(12)],
+        "news/list": [{"judul": f"Berita {i}", "isi": "Isi berita. " * 40, "tanggal": "2024-08-01"} for i in range(20)],
+        "prodi/bidang-ilmu": [{"id": str(i), "nama": f"Bidang Ilmu {i}"} for i in range(60)],
+    }
+
+
+FIXTURES = _build()
+
+
+def fixture_file(template):
+    """File name of a template in a fixture directory, e.g. ``pt__prodi__id__tahun.json``."""
+    return template.replace("/", "__").replace("{", "").replace("}", "") + ".json"
+
+
+def load_fixtures(directory):
+    """
+    Returns ``FIXTURES`` with recorded payloads replacing the synthetic ones.
+
+    ``directory`` is a directory of ``<template>.json`` files, or a
+    cassette file recorded with ``pddiktipy.cassette`` (its last successful
+    response per template is used).
+    """
+    fixtures = dict(FIXTURES)
+    if os.path.isfile(directory):
+        from pddiktipy.cassette import Cassette
+        from pddiktipy.endpoints import endpoint_template
+        with Cassette(directory) as cassette:
+            for entry in cassette.entries():
+                template = endpoint_template(entry.key.split("?", 1)[0].strip("/"))
+                if entry.status == 200 and template in fixtures:
+                    is_json = entry.headers.get("Content-Type", "").startswith("application/json")
+                    fixtures[template] = json.loads(entry.body) if is_json else entry.body
+        return fixtures
+    for template in FIXTURES:
+        path = os.path.join(directory, fixture_file(template))
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                fixtures[template] = json.load(f)
+    return fixtures
+
+
+def encode(payload):
+    """Returns ``(body, content_type)`` for a fixture payload."""
+    if isinstance(payload, bytes):
+        return payload, "image/png"
+    return json.dumps(payload).encode("utf-8"), "application/json"
+
+
+WORKLOAD = [
+    ("search_all", ("Ahmad",)),
+    ("search_mahasiswa", ("Ahmad",)),
+    ("search_dosen", ("Ridwan",)),
+    ("search_pt", ("Institut",)),
+    ("search_prodi", ("Teknik Informatika",)),
+    ("get_detail_mhs", (MHS_ID,)),
+    ("get_dosen_profile", (DOSEN_ID,)),
+    ("get_dosen_penelitian", (DOSEN_ID,)),
+    ("get_dosen_pengabdian", (DOSEN_ID,)),
+    ("get_dosen_karya", (DOSEN_ID,)),
+    ("get_dosen_paten", (DOSEN_ID,)),
+    ("get_dosen_study_history", (DOSEN_ID,)),
+    ("get_dosen_teaching_history", (DOSEN_ID,)),
+    ("get_detail_pt", (PT_ID,)),
+    ("get_prodi_pt", (PT_ID, SEMESTER)),
+    ("get_logo_pt", (PT_ID,)),
+    ("stream_logo_pt", (PT_ID, os.devnull)),
+    ("get_rasio_pt", (PT_ID,)),
+    ("get_mahasiswa_pt", (PT_ID,)),
+    ("get_waktu_studi_pt", (PT_ID,)),
+    ("get_name_histories_pt", (PT_ID,)),
+    ("get_cost_range_pt", (PT_ID,)),
+    ("get_graduation_rate_pt", (PT_ID,)),
+    ("get_jumlah_prodi_pt", (PT_ID,)),
+    ("get_jumlah_mahasiswa_pt", (PT_ID,)),
+    ("get_jumlah_dosen_pt", (PT_ID,)),
+    ("get_sarpras_file_name_pt", (PT_ID,)),
+    ("get_sarpras_blob_pt", (PT_ID,)),
+    ("get_detail_prodi", (PRODI_ID,)),
+    ("get_desc_prodi", (PRODI_ID,)),
+    ("get_name_histories_prodi", (PRODI_ID,)),
+    ("get_num_students_lecturers_prodi", (PRODI_ID,)),
+    ("get_cost_range_prodi", (PRODI_ID,)),
+    ("get_daya_tampung_prodi", (PRODI_ID,)),
+    ("get_rasio_dosen_mahasiswa_prodi", (PRODI_ID,)),
+    ("get_graduation_rate_prodi", (PRODI_ID,)),
+    ("get_logo_prodi", (PT_ID,)),
+    ("stream_logo_prodi", (PT_ID, os.devnull)),
+    ("get_homebase_prodi", (PRODI_ID, SEMESTER)),
+    ("get_penghitung_ratio_prodi", (PRODI_ID, SEMESTER)),
+    ("get_dosen_count_active", ()),
+    ("get_mahasiswa_count_active", ()),
+    ("get_prodi_count", ()),
+    ("get_pt_count", ()),
+    ("get_data_dosen_keaktifan", ()),
+    ("get_data_dosen_bidang", ()),
+    ("get_data_dosen_jenis_kelamin", ()),
+    ("get_data_dosen_jenjang", ()),
+    ("get_data_dosen_ikatan", ()),
+    ("get_data_mahasiswa_bidang", ()),
+    ("get_data_mahasiswa_jenis_kelamin", ()),
+    ("get_data_mahasiswa_jenjang", ()),
+    ("get_data_mahasiswa_kelompok_lembaga", ()),
+    ("get_data_mahasiswa_status", ()),
+    ("get_data_pt_bentuk", ()),
+    ("get_data_pt_akreditasi", ()),
+    ("get_data_pt_kelompok_pembina", ()),
+    ("get_data_pt_provinsi", ()),
+    ("get_data_prodi_jenjang", ()),
+    ("get_data_prodi_akreditasi", ()),
+    ("get_data_prodi_bidang_ilmu", ()),
+    ("get_data_prodi_kelompok_pembina", ()),
+    ("get_contributor", ()),
+    ("get_news", ()),
+    ("get_bidang_ilmu_prodi", ()),
+]
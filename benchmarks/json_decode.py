@@ -0,0 +1,115 @@
+"""
+Micro-benchmark of JSON decoding backends over the fixture payloads.
+
+Decodes every JSON fixture (``fixtures.FIXTURES``, or recorded payloads via
+``--fixtures``) with ``requests.Response.json()``, the path the client used
+before ``pddiktipy.jsondecode``, and with each installed backend decoding
+the raw bytes. Reports microseconds per decode for the largest payloads
+and for the whole set, relative to ``Response.json()``.
+
+Usage:
+    python benchmarks/json_decode.py [--repeat 200] [--top 8]
+        [--fixtures traffic.ndjson] [--output report.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from pddiktipy.jsondecode import available_decoders
+from fixtures import FIXTURES, encode, load_fixtures
+
+BASELINE = "response.json"
+
+
+def payloads(fixtures=None):
+    """Encoded JSON bodies by endpoint template, largest first."""
+    bodies = {}
+    for template, payload in (fixtures or FIXTURES).items():
+        body, content_type = encode(payload)
+        if content_type == "application/json":
+            bodies[template] = body
+    return dict(sorted(bodies.items(), key=lambda item: -len(item[1])))
+
+
+def response_json(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = body
+    return response.json()
+
+
+def decoders():
+    """Decoding functions to compare, the ``Response.json()`` baseline first."""
+    return {BASELINE: response_json, **available_decoders()}
+
+
+def time_decode(decode, body, repeat):
+    """Best-of-three mean seconds per decode of ``body``."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            decode(body)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def run(repeat=200, top=8, fixtures=None):
+    """Times every decoder on every payload; returns the report dict."""
+    bodies = payloads(fixtures)
+    functions = decoders()
+    rows = {}
+    for template, body in bodies.items():
+        rows[template] = {"bytes": len(body)}
+        for name, decode in functions.items():
+            rows[template][name] = round(time_decode(decode, body, repeat) * 1e6, 2)
+    total = {"bytes": sum(len(body) for body in bodies.values())}
+    for name in functions:
+        total[name] = round(sum(row[name] for row in rows.values()), 2)
+    return {
+        "meta": {"repeat": repeat, "payloads": len(bodies), "decoders": list(functions)},
+        "payloads": dict(list(rows.items())[:top]),
+        "all": total,
+    }
+
+
+def print_report(report):
+    names = report["meta"]["decoders"]
+    print(f"{'payload (us/decode)':<34}{'bytes':>9}" + "".join(f"{name:>20}" for name in names))
+    for label, row in list(report["payloads"].items()) + [(f"all {report['meta']['payloads']} payloads", report["all"])]:
+        line = f"{label:<34}{row['bytes']:>9}"
+        for name in names:
+            value = f"{row[name]}"
+            if name != BASELINE and row[BASELINE]:
+                value += f" (x{row[BASELINE] / row[name]:.1f})"
+            line += f"{value:>20}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200, help="decodes per timing round")
+    parser.add_argument("--top", type=int, default=8, help="largest payloads listed individually")
+    parser.add_argument("--fixtures", help="cassette file or directory of recorded fixture files")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.top, load_fixtures(args.fixtures) if args.fixtures else None)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
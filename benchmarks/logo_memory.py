@@ -0,0 +1,101 @@
+"""
+Memory benchmark of logo downloads: peak traced bytes per logo.
+
+Serves synthetic logos of several sizes from the stub server and measures
+the tracemalloc peak of one call in each mode:
+
+- ``get_logo_pt``: whole body, base64 ``str`` (the classic method)
+- ``stream_raw``: ``stream_logo_pt`` writing raw bytes to a file
+- ``stream_base64``: ``stream_logo_pt`` writing chunked base64 to a file
+- ``iterate``: ``stream_logo_pt`` chunk iterator, consumed and discarded
+
+Usage:
+    python benchmarks/logo_memory.py [--sizes 64 1024 4096] [--chunk-size 65536]
+        [--output report.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from pddiktipy import api
+from pddiktipy.images import CHUNK_SIZE
+from fixtures import FIXTURES, LOGO_PNG, PT_ID
+from stub_server import StubServer
+
+MODES = ("get_logo_pt", "stream_raw", "stream_base64", "iterate")
+
+
+def logo(size):
+    """Deterministic image body of ``size`` bytes starting with a PNG header."""
+    return (LOGO_PNG + random.Random(size).getrandbits(size * 8).to_bytes(size, "big"))[:size]
+
+
+def call(client, mode, chunk_size):
+    if mode == "get_logo_pt":
+        return client.get_logo_pt(PT_ID)
+    if mode == "iterate":
+        for _ in client.stream_logo_pt(PT_ID, chunk_size=chunk_size):
+            pass
+        return None
+    return client.stream_logo_pt(PT_ID, os.devnull, encode_base64=mode == "stream_base64", chunk_size=chunk_size)
+
+
+def peak_bytes(client, mode, chunk_size):
+    """Traced allocation peak of one call, after a warm-up call."""
+    call(client, mode, chunk_size)
+    tracemalloc.start()
+    try:
+        call(client, mode, chunk_size)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes_kb=(64, 1024, 4096), chunk_size=CHUNK_SIZE):
+    """Measures every mode for every logo size; returns the report dict."""
+    report = {"meta": {"chunk_size": chunk_size, "modes": list(MODES)}, "sizes": {}}
+    for size_kb in sizes_kb:
+        size = size_kb * 1024
+        fixtures = dict(FIXTURES, **{"pt/logo/{id}": logo(size)})
+        with StubServer(fixtures=fixtures) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                peaks = {mode: peak_bytes(client, mode, chunk_size) for mode in MODES}
+        report["sizes"][str(size)] = {mode: {"peak_bytes": peak, "per_logo_byte": round(peak / size, 2)}
+                                      for mode, peak in peaks.items()}
+    return report
+
+
+def print_report(report):
+    modes = report["meta"]["modes"]
+    print(f"{'logo bytes':>12}" + "".join(f"{mode:>24}" for mode in modes))
+    for size, stats in report["sizes"].items():
+        print(f"{size:>12}" + "".join(
+            f"{stats[mode]['peak_bytes']:>14} (x{stats[mode]['per_logo_byte']:<5})" for mode in modes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 1024, 4096], help="logo sizes in KiB")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+    logging.getLogger("pddiktipy").setLevel(logging.CRITICAL)
+
+    report = run(args.sizes, args.chunk_size)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
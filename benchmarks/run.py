@@ -0,0 +1,201 @@
+"""
+Offline benchmark suite: client throughput, latency and memory per usage mode.
+
+Starts the local stub server (fixture payloads for every ``api`` endpoint)
+and runs these scenarios:
+
+- ``single``: one client, a serial loop over the mixed ``WORKLOAD``
+- ``bulk``: ``get_detail_mhs_many`` fan-out
+- ``threaded``: one shared client driven by a thread pool over the workload
+- ``async``: ``AsyncApi`` with a bounded number of concurrent calls
+  (skipped without aiohttp)
+
+Each scenario reports calls, errors, seconds, calls/s, p50/p99/mean call
+latency and peak traced memory. The JSON report of a run can be compared
+with an earlier one.
+
+Usage:
+    python benchmarks/run.py [--calls 1000] [--latency 0.005] [--workers 16]
+        [--error-rate 0.0] [--scenarios single bulk threaded async]
+        [--output report.json] [--compare previous.json] [--no-memory]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import cycle, islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pddiktipy
+from pddiktipy import api
+from fixtures import MHS_ID, WORKLOAD
+from stub_server import StubServer
+
+SCENARIOS = ("single", "bulk", "threaded", "async")
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def timed_call(client, method, args):
+    """Returns ``(latency, failed)`` of one API call."""
+    start = time.perf_counter()
+    result = getattr(client, method)(*args)
+    return time.perf_counter() - start, result is None
+
+
+def run_single(base_url, calls, workers):
+    with api(base_url=base_url, user_ip="127.0.0.1", retries=0) as client:
+        return [timed_call(client, method, args) for method, args in islice(cycle(WORKLOAD), calls)]
+
+
+def run_bulk(base_url, calls, workers):
+    ids = [f"{MHS_ID}{i:06d}" for i in range(calls)]
+    with api(base_url=base_url, user_ip="127.0.0.1", retries=0, max_threads=workers) as client:
+        return [(r.latency, not r.ok) for r in client.get_detail_mhs_many(ids, max_workers=workers)]
+
+
+def run_threaded(base_url, calls, workers):
+    with api(base_url=base_url, user_ip="127.0.0.1", retries=0, max_threads=workers) as client:
+        with ThreadPoolExecutor(workers) as pool:
+            return list(pool.map(lambda call: timed_call(client, *call), islice(cycle(WORKLOAD), calls)))
+
+
+def run_async(base_url, calls, workers):
+    from pddiktipy.aio import AsyncApi
+
+    async def main():
+        semaphore = asyncio.Semaphore(workers)
+
+        async def one(client, method, args):
+            async with semaphore:
+                start = time.perf_counter()
+                result = await getattr(client, method)(*args)
+                return time.perf_counter() - start, result is None
+
+        async with AsyncApi(base_url=base_url, user_ip="127.0.0.1", retries=0) as client:
+            return await asyncio.gather(*(one(client, method, args)
+                                          for method, args in islice(cycle(WORKLOAD), calls)))
+
+    return asyncio.run(main())
+
+
+RUNNERS = {"single": run_single, "bulk": run_bulk, "threaded": run_threaded, "async": run_async}
+
+
+def measure(name, base_url, calls, workers, memory):
+    """Runs a scenario and summarizes it; with ``memory`` a second run traces allocations."""
+    runner = RUNNERS[name]
+    start = time.perf_counter()
+    samples = runner(base_url, calls, workers)
+    elapsed = time.perf_counter() - start
+    latencies = [latency for latency, _ in samples]
+    report = {
+        "calls": len(samples),
+        "errors": sum(failed for _, failed in samples),
+        "seconds": round(elapsed, 4),
+        "throughput": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+    }
+    if memory:
+        tracemalloc.start()
+        runner(base_url, calls, workers)
+        report["peak_memory_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    return report
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(calls=1000, latency=0.005, workers=16, error_rate=0.0, scenarios=SCENARIOS, memory=True):
+    """Runs the scenarios against a fresh stub server and returns the report dict."""
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "pddiktipy": pddiktipy.__version__,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "calls": calls,
+            "latency": latency,
+            "workers": workers,
+            "error_rate": error_rate,
+        },
+        "scenarios": {},
+    }
+    with StubServer(latency=latency, error_rate=error_rate) as server:
+        for name in scenarios:
+            if name == "async":
+                if importlib.util.find_spec("aiohttp") is None:
+                    print("async: skipped (aiohttp not installed)")
+                    continue
+            report["scenarios"][name] = measure(name, server.base_url, calls, workers, memory)
+    return report
+
+
+def print_report(report, baseline=None):
+    columns = ("calls", "errors", "seconds", "throughput", "p50_ms", "p99_ms", "peak_memory_kb")
+    print(f"{'scenario':<10}" + "".join(f"{column:>16}" for column in columns))
+    for name, stats in report["scenarios"].items():
+        line = f"{name:<10}"
+        for column in columns:
+            value = stats.get(column, "-")
+            old = ((baseline or {}).get("scenarios", {}).get(name) or {}).get(column)
+            if old and isinstance(value, (int, float)) and column not in ("calls", "errors"):
+                value = f"{value} ({(value - old) / old:+.0%})"
+            line += f"{value:>16}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.005, help="stub seconds per response")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="earlier JSON report to show relative changes against")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args()
+    logging.getLogger("pddiktipy").setLevel(logging.CRITICAL)
+
+    report = run(args.calls, args.latency, args.workers, args.error_rate, args.scenarios, not args.no_memory)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Local PDDIKTI stub server for benchmarks.
+
+Answers every endpoint used by ``api`` with its fixture payload (see
+``fixtures.py``) after a configurable delay; unknown paths get a small JSON
+document. Errors can be injected at a fixed rate, so client overhead,
+concurrency and retry behaviour can be measured without the live API.
+
+Usage as a library:
+    with StubServer(latency=0.02, error_rate=0.01) as server:
+        client = api(base_url=server.base_url, user_ip="127.0.0.1")
+
+Usage from the command line:
+    python benchmarks/stub_server.py --port 8000 --latency 0.02 [--jitter 0.01]
+        [--error-rate 0.05 --error-status 503] [--fixtures traffic.ndjson]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from pddiktipy.endpoints import endpoint_template
+from fixtures import FIXTURES, encode, load_fixtures
+from tests.stub_server import StubServer as BaseStubServer
+
+
+class StubServer(BaseStubServer):
+    """
+    Stub server answering from fixtures, built on the test stub server.
+
+    Args:
+        host: Interface to bind
+        port: Port; 0 picks a free one
+        latency: Seconds to wait before every response
+        jitter: Extra random delay of up to this many seconds
+        error_rate: Share of requests answered with ``error_status``
+        error_status: Status code of injected errors
+        fixtures: Template-to-payload mapping, or a cassette file or
+            directory of recorded fixture files; defaults to
+            ``fixtures.FIXTURES``
+        seed: Seed for jitter and error injection
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, fixtures=None, seed=0):
+        super().__init__(host=host, port=port, record=False)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        if isinstance(fixtures, str):
+            fixtures = load_fixtures(fixtures)
+        self.bodies = {template: encode(payload) for template, payload in (fixtures or FIXTURES).items()}
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def payload(self, path):
+        """Returns ``(status, body, headers)`` for a request path."""
+        fixture = self.bodies.get(endpoint_template(path.split("?", 1)[0].strip("/")))
+        if fixture is not None:
+            body, content_type = fixture
+            return 200, body, {"Content-Type": content_type}
+        body = {"id": path.rsplit("/", 1)[-1], "nama": "Stub", "path": path}
+        return 200, json.dumps(body).encode("utf-8"), {"Content-Type": "application/json"}
+
+    def respond(self, handler):
+        with self._lock:
+            failed = self.error_rate and self._random.random() < self.error_rate
+            self.errors += bool(failed)
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return self.error_status, {"message": "injected error"}, {}
+        return self.payload(handler.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local PDDIKTI stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of injected errors")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--fixtures", help="cassette file or directory of recorded fixture files")
+    args = parser.parse_args()
+    server = StubServer(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                        args.error_status, args.fixtures).start()
+    print(f"Serving on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
 __version__ = "2.0.6"
 
 from .api import api
+from .aio import AsyncApi
 from .exceptions import (
     PDDIKTIError,
     APIConnectionError,
@@ -11,16 +12,19 @@ from .exceptions import (
     APIRateLimitError,
     APIResponseError,
     ValidationError,
-    AuthenticationError
+    AuthenticationError,
+    CircuitOpenError
 )
 
 __all__ = [
     'api',
+    'AsyncApi',
     'PDDIKTIError',
     'APIConnectionError', 
     'APITimeoutError',
     'APIRateLimitError',
     'APIResponseError',
     'ValidationError',
-    'AuthenticationError'
+    'AuthenticationError',
+    'CircuitOpenError'
 ]
@@ -0,0 +1,172 @@
+"""
+Composite fetches that gather several endpoints for one entity concurrently.
+
+A page about one university needs a dozen independent endpoints; issuing
+them in parallel makes the page latency the slowest call instead of the sum
+of all calls. Each section is reported separately, so one failing endpoint
+does not hide the others.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .exceptions import APITimeoutError, ValidationError
+from .result import Result
+
+# Section name -> api method taking the PT ID
+PT_SECTIONS: Dict[str, str] = {
+    "detail": "get_detail_pt",
+    "rasio": "get_rasio_pt",
+    "mahasiswa": "get_mahasiswa_pt",
+    "waktu_studi": "get_waktu_studi_pt",
+    "name_histories": "get_name_histories_pt",
+    "cost_range": "get_cost_range_pt",
+    "graduation_rate": "get_graduation_rate_pt",
+    "jumlah_prodi": "get_jumlah_prodi_pt",
+    "jumlah_mahasiswa": "get_jumlah_mahasiswa_pt",
+    "jumlah_dosen": "get_jumlah_dosen_pt",
+    "logo": "get_logo_pt",
+}
+
+# Section name -> api method taking the dosen ID
+DOSEN_SECTIONS: Dict[str, str] = {
+    "profile": "get_dosen_profile",
+    "penelitian": "get_dosen_penelitian",
+    "pengabdian": "get_dosen_pengabdian",
+    "karya": "get_dosen_karya",
+    "paten": "get_dosen_paten",
+    "study_history": "get_dosen_study_history",
+    "teaching_history": "get_dosen_teaching_history",
+}
+
+# Section name -> api method taking the prodi ID
+PRODI_SECTIONS: Dict[str, str] = {
+    "detail": "get_detail_prodi",
+    "desc": "get_desc_prodi",
+    "name_histories": "get_name_histories_prodi",
+    "num_students_lecturers": "get_num_students_lecturers_prodi",
+    "cost_range": "get_cost_range_prodi",
+    "daya_tampung": "get_daya_tampung_prodi",
+    "rasio_dosen_mahasiswa": "get_rasio_dosen_mahasiswa_prodi",
+    "graduation_rate": "get_graduation_rate_prodi",
+    "homebase": "get_homebase_prodi",
+    "penghitung_ratio": "get_penghitung_ratio_prodi",
+}
+
+# Prodi sections that also take the academic semester (YYYYS)
+PRODI_SEMESTER_SECTIONS = ("homebase", "penghitung_ratio")
+
+# Section name -> (api method, arguments)
+Sections = Dict[str, Tuple[str, Tuple[Any, ...]]]
+
+
+@dataclass
+class Profile:
+    """Composite result of a concurrent multi-endpoint fetch.
+
+    Attributes:
+        key: The entity the profile was fetched for (e.g. a PT ID)
+        sections: ``Result`` per section name
+        latency: Wall-clock duration of the whole fetch in seconds
+    """
+    key: Any
+    sections: Dict[str, Result] = field(default_factory=dict)
+    latency: float = 0.0
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Data of every successful section."""
+        return {name: result.data for name, result in self.sections.items() if result.ok}
+
+    @property
+    def errors(self) -> Dict[str, Exception]:
+        """Exception of every failed section."""
+        return {name: result.error for name, result in self.sections.items() if not result.ok}
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Latency in seconds of every section."""
+        return {name: result.latency for name, result in self.sections.items()}
+
+    @property
+    def ok(self) -> bool:
+        """True if every section succeeded."""
+        return all(result.ok for result in self.sections.values())
+
+    @property
+    def partial(self) -> bool:
+        """True if some, but not all, sections failed."""
+        return not self.ok and any(result.ok for result in self.sections.values())
+
+    def __getitem__(self, name: str) -> Any:
+        return self.sections[name].data
+
+
+def select_sections(available: Dict[str, str],
+                    include: Optional[Iterable[str]],
+                    args: Tuple[Any, ...]) -> Sections:
+    """
+    Builds the section table for the requested subset of sections.
+
+    Args:
+        available: Section name -> api method name
+        include: Section names to fetch; None fetches all of them
+        args: Arguments passed to every section method
+
+    Raises:
+        ValidationError: If ``include`` names an unknown section
+    """
+    names = list(available) if include is None else list(include)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValidationError(
+            f"Unknown section(s): {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+    return {name: (available[name], args) for name in names}
+
+
+def deadline_result(name: str, deadline: float) -> Result:
+    """Result recorded for a section that did not finish before the deadline."""
+    error = APITimeoutError(f"Section '{name}' did not complete within the {deadline:g}s deadline")
+    return Result(key=name, error=error, latency=deadline)
+
+
+def fetch_sections(call: Callable[..., Result],
+                   key: Any,
+                   sections: Sections,
+                   max_workers: Optional[int] = None,
+                   deadline: Optional[float] = None) -> Profile:
+    """
+    Fetches all sections concurrently on a thread pool.
+
+    Args:
+        call: ``api._call_result``-compatible callable
+        key: Entity key recorded on the profile
+        sections: Section table from ``select_sections``
+        max_workers: Concurrent requests; defaults to one per section
+        deadline: Seconds to wait for all sections. Sections still running
+            afterwards are reported as ``APITimeoutError`` and not waited
+            for; queued ones are cancelled, but a request already on the
+            wire runs to completion in the background.
+
+    Returns:
+        Profile: Results in the order of ``sections``
+    """
+    if not sections:
+        return Profile(key)
+    started = time.perf_counter()
+    workers = max_workers or len(sections)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pddikti-profile")
+    futures = {}
+    try:
+        futures = {name: pool.submit(call, method, name, *args)
+                   for name, (method, args) in sections.items()}
+        wait(futures.values(), timeout=deadline)
+        results = {name: future.result() if future.done() else deadline_result(name, deadline)
+                   for name, future in futures.items()}
+    finally:
+        for future in futures.values():
+            future.cancel()
+        pool.shutdown(wait=False)
+    return Profile(key, results, time.perf_counter() - started)
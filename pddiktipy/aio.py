@@ -0,0 +1,752 @@
+"""
+Asyncio client for the PDDIKTI API.
+
+``AsyncApi`` exposes an awaitable equivalent of every ``api`` method. Input
+validation and endpoint building are shared with the synchronous client, so
+both clients accept the same arguments and raise the same exceptions; only
+the HTTP exchange differs and runs over a shared ``aiohttp`` connection pool.
+
+Requires the optional ``aiohttp`` dependency (``pip install pddiktipy[async]``).
+
+Example:
+    >>> import asyncio
+    >>> from pddiktipy import AsyncApi
+    >>> async def main():
+    ...     async with AsyncApi() as client:
+    ...         return await asyncio.gather(
+    ...             client.search_pt("Unika"),
+    ...             client.search_prodi("Sistem Informasi"),
+    ...         )
+    >>> asyncio.run(main())
+"""
+import asyncio
+import inspect
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Union
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from requests.structures import CaseInsensitiveDict
+
+from .aggregate import Profile, Sections, deadline_result, select_sections
+from .cache import CacheEntry
+from .cassette import CONNECTION, TIMEOUT, CassetteEntry, cassette_key, recordable_headers
+from .api import api, APIResponse, _validate_args, _check_response, _log_error, _tracer_of
+from .helper import helper
+from .images import CHUNK_SIZE, Destination, aiter_base64, awrite_chunks
+from .logostore import LogoRecord, logo_key
+from .result import Result, capture_call, note_call, note_saved
+from .singleflight import AsyncSingleFlight
+from .exceptions import (
+    PDDIKTIError, APIConnectionError, APITimeoutError, APIResponseError,
+    ValidationError
+)
+
+
+def _release(body: Any) -> None:
+    """Releases the connection of an unread streamed response; buffered bodies need nothing."""
+    if not isinstance(body, bytes):
+        body.release()
+
+
+async def _aiter(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """Async iterator over a synchronous one, e.g. chunks read from disk."""
+    for chunk in chunks:
+        yield chunk
+
+
+class AsyncHelper(helper):
+    """
+    Helper whose ``response``, ``fetch_image_as_base64`` and ``stream_image``
+    are coroutines.
+
+    Headers, endpoint decoding and URL parsing are inherited from ``helper``.
+    Retries mirror the synchronous urllib3 strategy: up to ``retries`` extra
+    attempts with exponential backoff on connection errors and on
+    429/500/502/503/504 responses. With a ``rate_limit``, 429s are retried
+    through the limiter instead.
+    """
+
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 0,
+                 **options: Any):
+        """
+        Args:
+            limit: Maximum number of simultaneous connections in the pool
+            limit_per_host: Maximum connections per host (0 means no limit)
+            **options: Forwarded to ``helper`` (``retries``, ``backoff_factor``, ...)
+        """
+        if aiohttp is None:
+            raise PDDIKTIError(
+                "AsyncApi requires aiohttp. Install it with: pip install pddiktipy[async]"
+            )
+        super().__init__(**options)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._client_session = None
+        if self.singleflight is not None:
+            self.singleflight = AsyncSingleFlight()
+
+    @property
+    def client_session(self) -> "aiohttp.ClientSession":
+        """Lazy initialization of the pooled aiohttp session (inside the running loop)"""
+        if self._client_session is None or self._client_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host
+            )
+            self._client_session = aiohttp.ClientSession(connector=connector)
+        return self._client_session
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Returns the delay before retry number ``attempt`` (1-based).
+        """
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        if attempt <= 1:
+            return 0.0
+        return self.backoff_factor * (2 ** (attempt - 1))
+
+    async def _request(self, url: str, headers: dict, timeout: int, stream: bool = False) -> "tuple":
+        """
+        Performs a GET with retries and returns ``(status, headers, body)``.
+
+        With ``stream`` the body of a live response is left unread: ``body``
+        is then the open ``aiohttp.ClientResponse``, which the caller must
+        release, and its size is taken from ``Content-Length``.
+
+        Raises:
+            asyncio.TimeoutError: If the last attempt timed out
+            aiohttp.ClientError: If the last attempt failed to connect
+        """
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        limiter = self.rate_limiter
+        retry_statuses = self.retry_statuses()
+        attempt = throttled = size = 0
+        status = None
+        try:
+            while True:
+                try:
+                    if limiter is not None:
+                        await limiter.acquire_async()
+                    status, response_headers, body = await self._exchange(url, headers, client_timeout, stream)
+                    size += len(body) if isinstance(body, bytes) else int(body.content_length or 0)
+                    retry_after = response_headers.get('Retry-After')
+                    if limiter is not None:
+                        if status != 429:
+                            limiter.on_success()
+                        else:
+                            limiter.on_throttle(retry_after)
+                            if throttled < limiter.max_retries:
+                                throttled += 1
+                                _release(body)
+                                continue
+                    if status not in retry_statuses or attempt >= self.retries:
+                        return status, response_headers, body
+                    _release(body)
+                except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+                    if attempt >= self.retries:
+                        raise
+                    retry_after = None
+                attempt += 1
+                self.logger.debug(f"Retrying ({attempt}/{self.retries}): {url}")
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+        finally:
+            note_call(status, attempt + throttled + 1, size)
+
+    async def _exchange(self, url: str, headers: dict, client_timeout: Any, stream: bool = False) -> "tuple":
+        """
+        Sends one GET and returns ``(status, headers, body)``, recording it
+        to or replaying it from the cassette if one is configured. With
+        ``stream`` and no cassette, ``body`` is the unread response.
+        """
+        cassette = self.cassette
+        if cassette is not None and cassette.replaying:
+            entry = cassette.play(url)
+            delay = cassette.delay(entry)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if entry.error == TIMEOUT:
+                raise asyncio.TimeoutError()
+            if entry.error == CONNECTION:
+                raise aiohttp.ClientConnectionError("Recorded connection error")
+            return entry.status, CaseInsensitiveDict(entry.headers), entry.body
+
+        if stream and cassette is None:
+            response = await self.client_session.get(url, headers=headers, timeout=client_timeout)
+            return response.status, response.headers, response
+
+        started = time.perf_counter()
+        try:
+            async with self.client_session.get(url, headers=headers, timeout=client_timeout) as response:
+                body = await response.read()
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            if cassette is not None:
+                error = TIMEOUT if isinstance(e, asyncio.TimeoutError) else CONNECTION
+                cassette.record(CassetteEntry(cassette_key(url), elapsed=time.perf_counter() - started, error=error))
+            raise
+        if cassette is not None:
+            cassette.record(CassetteEntry(cassette_key(url), response.status, recordable_headers(response.headers),
+                                          body, time.perf_counter() - started))
+        return response.status, response.headers, body
+
+    async def response(self, endpoint: str, timeout: int = 30) -> Optional[dict]:
+        """
+        Sends a GET request and returns the JSON response with comprehensive error handling.
+
+        Args:
+            endpoint: The API endpoint URL
+            timeout: Request timeout in seconds
+
+        Returns:
+            JSON response or None if error occurs
+
+        Raises:
+            APIConnectionError: For connection issues
+            APITimeoutError: For timeout issues
+            APIRateLimitError: For rate limit issues
+            APIResponseError: For invalid responses
+        """
+        if not endpoint:
+            raise ValidationError("Endpoint cannot be empty")
+
+        if self.tracer is not None:
+            with self._request_span(endpoint) as attributes:
+                return await self._response(endpoint, timeout, attributes)
+        return await self._response(endpoint, timeout)
+
+    async def _response(self, endpoint: str, timeout: int, attributes: Optional[dict] = None) -> Optional[dict]:
+        """
+        Serves ``response()`` from the cache or fetches the endpoint.
+        Expired entries are served according to the policy's
+        stale-while-revalidate and stale-if-error windows.
+        """
+        entry = self._cache_lookup(endpoint, timeout)
+        if attributes is not None:
+            attributes["pddikti.cache_hit"] = entry is not None
+        if entry is not None:
+            return self._cached_value(endpoint, entry)
+
+        try:
+            return await self._fetch_shared(endpoint, timeout)
+        except PDDIKTIError as e:
+            entry = self._stale_if_error(endpoint, e)
+            if entry is None:
+                raise
+            return entry.value
+
+    async def _fetch_shared(self, endpoint: str, timeout: int) -> Optional[dict]:
+        """
+        Fetches an endpoint, sharing the request with concurrent callers when
+        coalescing is enabled.
+        """
+        if self.singleflight is not None:
+            return await self.singleflight.do(endpoint, lambda: self._fetch(endpoint, timeout))
+        return await self._fetch(endpoint, timeout)
+
+    def _refresh_in_background(self, endpoint: str, timeout: int) -> None:
+        """
+        Refreshes a stale cache entry in a background task, at most one per
+        endpoint at a time.
+        """
+        if endpoint in self._refreshes:
+            return
+        task = asyncio.ensure_future(self._refresh(endpoint, timeout))
+        self._refreshes[endpoint] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(endpoint, None))
+
+    async def _refresh(self, endpoint: str, timeout: int) -> None:
+        try:
+            await self._fetch_shared(endpoint, timeout)
+        except Exception as e:
+            # The stale entry keeps being served until its window ends
+            self.logger.warning(f"Background refresh of {endpoint} failed: {e}")
+
+    async def wait_for_refreshes(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the background cache refreshes in progress to finish.
+
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely
+
+        Returns:
+            bool: True if no refresh is left running
+        """
+        tasks = list(self._refreshes.values())
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        return not self._refreshes
+
+    async def _fetch(self, endpoint: str, timeout: int) -> Optional[dict]:
+        """
+        Requests an endpoint, records metrics and caches the decoded result.
+        An expired cache entry with validators is revalidated conditionally.
+        """
+        breaker = self._breaker_for(endpoint)
+        probe = breaker.before_call(endpoint) if breaker is not None else False
+        stale = self._cache_stale(endpoint)
+        started = time.perf_counter()
+        with capture_call() as info:
+            try:
+                entry = await self._fetch_json(endpoint, timeout, stale)
+            except PDDIKTIError as e:
+                self._cache_not_found(endpoint, e)
+                self._observe(endpoint, started, info, e)
+                if breaker is not None:
+                    breaker.record(e, probe)
+                raise
+            except BaseException:
+                if breaker is not None:
+                    breaker.release(probe)
+                raise
+        self._observe(endpoint, started, info)
+        if breaker is not None:
+            breaker.record(None, probe)
+        self._cache_set(endpoint, entry)
+        return entry.value
+
+    async def _fetch_json(self, endpoint: str, timeout: int, stale: Optional[CacheEntry] = None) -> CacheEntry:
+        """
+        Performs the HTTP exchange for ``response()`` and decodes the body;
+        see ``helper._get_json`` for ``stale``.
+        """
+        with self._span("pddikti.headers"):
+            request_headers = self.get_headers()
+            if stale is not None:
+                request_headers = dict(request_headers, **stale.conditional_headers())
+
+        try:
+            self.logger.debug(f"Making request to: {endpoint}")
+            with self._span("pddikti.http"):
+                status, headers, body = await self._request(endpoint, request_headers, timeout)
+            if stale is not None and status == 304:
+                return self._not_modified(endpoint, stale, headers)
+            self._raise_for_status(status, headers, endpoint)
+            if status >= 400:
+                raise APIResponseError(
+                    f"Request failed: HTTP {status}",
+                    status_code=status,
+                    endpoint=endpoint
+                )
+
+            try:
+                with self._span("pddikti.decode"):
+                    json_data = self.json_decoder(body)
+                self.logger.debug(f"Successful response from: {endpoint}")
+                return CacheEntry(json_data, 0.0, headers.get('ETag'), headers.get('Last-Modified'), len(body))
+            except ValueError as e:
+                raise APIResponseError(
+                    f"Invalid JSON response: {str(e)}",
+                    status_code=status,
+                    endpoint=endpoint
+                )
+
+        except PDDIKTIError:
+            raise
+        except asyncio.TimeoutError:
+            raise APITimeoutError(
+                f"Request timeout after {timeout} seconds",
+                endpoint=endpoint
+            )
+        except aiohttp.ClientConnectionError as e:
+            raise APIConnectionError(
+                f"Connection error: {str(e)}",
+                endpoint=endpoint
+            )
+        except aiohttp.ClientError as e:
+            raise APIResponseError(
+                f"Request failed: {str(e)}",
+                endpoint=endpoint
+            )
+        except Exception as e:
+            self.logger.error(f"Unexpected error in response(): {e}")
+            raise APIResponseError(
+                f"Unexpected error: {str(e)}",
+                endpoint=endpoint
+            )
+
+    async def fetch_image_as_base64(self, url: str, timeout: int = 30) -> Optional[str]:
+        """
+        Fetches an image from the given URL and returns it as a base64-encoded string.
+
+        Args:
+            url (str): URL of the image.
+            timeout (int): Request timeout in seconds.
+
+        Returns:
+            Optional[str]: Base64-encoded image string or None if an error occurs.
+
+        Raises:
+            APIConnectionError: For connection issues
+            APITimeoutError: For timeout issues
+            ValidationError: For invalid input
+        """
+        if not url:
+            raise ValidationError("Image URL cannot be empty")
+        with self._observe_image(url):
+            if self.logo_store is not None:
+                with self.logo_store.open(await self._stored_logo(url, timeout)) as data:
+                    return self.base64_encode_image(data)
+
+            with self._image_errors(url, timeout):
+                self.logger.debug(f"Fetching image from: {url}")
+                status, headers, body = await self._request(url, self.get_headers(), timeout)
+                self._check_image_status(status, url)
+                self._check_image_type(headers)
+                return self.base64_encode_image(body)
+
+    async def stream_image(self,
+                           url: str,
+                           dest: Optional[Destination] = None,
+                           encode_base64: bool = False,
+                           chunk_size: int = CHUNK_SIZE,
+                           timeout: int = 30) -> Union[AsyncIterator[bytes], int]:
+        """
+        Awaitable counterpart of ``helper.stream_image``: returns an async
+        iterator of chunks, or the number of bytes written to ``dest``.
+
+        Raises:
+            APIConnectionError: For connection issues
+            APITimeoutError: For timeout issues
+            ValidationError: For invalid input
+        """
+        if not url:
+            raise ValidationError("Image URL cannot be empty")
+        if chunk_size < 1:
+            raise ValidationError("chunk_size must be at least 1")
+
+        with self._observe_image(url):
+            if self.logo_store is not None:
+                record = await self._stored_logo(url, timeout)
+                chunks = _aiter(self.logo_store.iter_chunks(record, chunk_size))
+            else:
+                with self._image_errors(url, timeout):
+                    self.logger.debug(f"Streaming image from: {url}")
+                    status, headers, body = await self._request(url, self.get_headers(), timeout, stream=True)
+                    try:
+                        self._check_image_status(status, url)
+                    except APIResponseError:
+                        _release(body)
+                        raise
+                    self._check_image_type(headers)
+                chunks = self._iter_image(body, url, chunk_size, timeout)
+        if encode_base64:
+            chunks = aiter_base64(chunks)
+        if dest is None:
+            return chunks
+        return await awrite_chunks(chunks, dest)
+
+    async def _stored_logo(self, url: str, timeout: int) -> LogoRecord:
+        """
+        Awaitable counterpart of ``helper._stored_logo``.
+        """
+        store = self.logo_store
+        key = logo_key(url)
+        record = store.get(key)
+        if record is not None and store.is_fresh(record):
+            store.count("hits")
+            note_saved(record.size)
+            return record
+
+        request_headers = self.get_headers()
+        if record is not None:
+            request_headers = dict(request_headers, **store.conditional_headers(record))
+        with self._image_errors(url, timeout):
+            self.logger.debug(f"Fetching image into the logo store: {url}")
+            status, headers, body = await self._request(url, request_headers, timeout, stream=True)
+            try:
+                if record is not None and status == 304:
+                    store.count("revalidated")
+                    note_saved(record.size)
+                    return store.touch(record, headers)
+                self._check_image_status(status, url)
+                self._check_image_type(headers)
+                with store.writer() as writer:
+                    async for chunk in self._iter_image(body, url, CHUNK_SIZE, timeout):
+                        writer.write(chunk)
+                    record = writer.commit(key, headers)
+                store.count("downloads")
+                return record
+            finally:
+                _release(body)
+
+    async def _iter_image(self, body: Any, url: str, chunk_size: int, timeout: int) -> AsyncIterator[bytes]:
+        """
+        Yields a streamed (or, from a cassette, buffered) body in chunks,
+        then releases its connection.
+        """
+        if isinstance(body, bytes):
+            for start in range(0, len(body), chunk_size):
+                yield body[start:start + chunk_size]
+            return
+        try:
+            with self._image_errors(url, timeout):
+                async for chunk in body.content.iter_chunked(chunk_size):
+                    yield chunk
+        finally:
+            body.release()
+
+    @staticmethod
+    def _check_image_status(status: int, url: str) -> None:
+        if status >= 400:
+            raise APIResponseError(
+                f"Error fetching image: HTTP {status}",
+                status_code=status,
+                endpoint=url
+            )
+
+    @contextmanager
+    def _image_errors(self, url: str, timeout: int) -> Iterator[None]:
+        """
+        Converts aiohttp errors of an image download into API exceptions.
+        """
+        try:
+            yield
+        except PDDIKTIError:
+            raise
+        except asyncio.TimeoutError:
+            raise APITimeoutError(
+                f"Image request timeout after {timeout} seconds",
+                endpoint=url
+            )
+        except aiohttp.ClientConnectionError as e:
+            raise APIConnectionError(
+                f"Connection error fetching image: {str(e)}",
+                endpoint=url
+            )
+        except Exception as e:
+            self.logger.error(f"Unexpected error fetching image: {e}")
+            raise APIResponseError(
+                f"Unexpected error fetching image: {str(e)}",
+                endpoint=url
+            )
+
+    async def aclose(self) -> None:
+        """
+        Close the aiohttp session and the underlying synchronous session.
+        Background cache refreshes still running are cancelled.
+        """
+        tasks = list(self._refreshes.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client_session is not None:
+            await self._client_session.close()
+            self._client_session = None
+            self.logger.debug("Async session closed successfully")
+        super().close()
+
+
+async def _invoke_async(client: "AsyncApi", raw: Callable[..., Any], func_name: str,
+                        args: tuple, kwargs: Dict[str, Any]) -> APIResponse:
+    """
+    Awaitable counterpart of ``api._invoke``: validates, runs the method body,
+    awaits the coroutine it returns and checks the response.
+    """
+    tracer = _tracer_of(client)
+    if tracer is None:
+        _validate_args(args)
+        response = raw(client, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        return _check_response(func_name, response)
+    with tracer.span(f"pddikti.{func_name}", {"pddikti.method": func_name}):
+        with tracer.span("pddikti.validate"):
+            _validate_args(args)
+        response = raw(client, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        return _check_response(func_name, response)
+
+
+def _make_async_method(func: Callable[..., APIResponse]) -> Callable[..., Any]:
+    """
+    Builds the awaitable counterpart of a ``handle_errors``-decorated ``api`` method.
+
+    The undecorated method body runs unchanged: validation raises synchronously,
+    and the coroutine returned by ``AsyncHelper`` is awaited. Errors are then
+    logged and turned into ``None`` exactly like ``handle_errors`` does, or
+    returned in a ``Result`` on a ``return_results=True`` client.
+    """
+    raw = func.__wrapped__
+
+    @wraps(raw)
+    async def method(self: "AsyncApi", *args: Any, **kwargs: Any) -> APIResponse:
+        func_name = raw.__name__
+        if self.return_results:
+            return await self._call_result(func_name, args[0] if args else None, *args, **kwargs)
+        try:
+            return await _invoke_async(self, raw, func_name, args, kwargs)
+        except Exception as e:
+            _log_error(func_name, e)
+            return None
+
+    return method
+
+
+async def _async_fan_out(fn: Callable[[Any], Awaitable[Result]],
+                         items: Iterable[Any],
+                         max_workers: int = 8,
+                         ordered: bool = False) -> AsyncIterator[Result]:
+    """
+    Asyncio counterpart of ``bulk.fan_out`` with at most ``max_workers``
+    coroutines in flight.
+    """
+    if max_workers < 1:
+        raise ValidationError("max_workers must be at least 1")
+
+    items = iter(items)
+    queued = deque(asyncio.ensure_future(fn(item)) for item in islice(items, max_workers))
+    pending = set(queued)
+    try:
+        if ordered:
+            while queued:
+                task = queued.popleft()
+                result = await task
+                pending.discard(task)
+                for item in islice(items, 1):
+                    queued.append(asyncio.ensure_future(fn(item)))
+                    pending.add(queued[-1])
+                yield result
+        else:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending |= {asyncio.ensure_future(fn(item)) for item in islice(items, len(done))}
+                for task in done:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _async_fetch_sections(call: Callable[..., Awaitable[Result]],
+                                key: Any,
+                                sections: Sections,
+                                max_workers: Optional[int] = None,
+                                deadline: Optional[float] = None) -> Profile:
+    """
+    Asyncio counterpart of ``aggregate.fetch_sections``. Sections still
+    running at the deadline are cancelled.
+    """
+    if not sections:
+        return Profile(key)
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max_workers or len(sections))
+
+    async def bounded(name: str, method: str, args: tuple) -> Result:
+        async with semaphore:
+            return await call(method, name, *args)
+
+    tasks = {name: asyncio.ensure_future(bounded(name, method, args))
+             for name, (method, args) in sections.items()}
+    try:
+        await asyncio.wait(tasks.values(), timeout=deadline)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+    results = {name: task.result() if task.done() and not task.cancelled() else deadline_result(name, deadline)
+               for name, task in tasks.items()}
+    return Profile(key, results, time.perf_counter() - started)
+
+
+class AsyncApi(api):
+    """Asyncio PDDIKTI API client.
+
+    Every public method of ``api`` is available as a coroutine with the same
+    signature, validation and ``None``-on-error semantics. Use it as an async
+    context manager, or call ``await client.close()`` when done.
+
+    Bulk methods (``get_detail_mhs_many`` and friends) return async iterators:
+    ``async for result in client.get_detail_mhs_many(ids, max_workers=50)``.
+    Aggregates (``get_pt_profile``, ``get_dosen_full``, ``get_prodi_profile``)
+    are awaited like any other method; ``get_dosen_full_many`` returns an
+    async iterator.
+    """
+
+    helper_class = AsyncHelper
+
+    async def _call_result(self, method_name: str, key: Any, *args: Any, **kwargs: Any) -> Result:
+        """Awaitable counterpart of ``api._call_result``."""
+        raw = getattr(type(self), method_name).__wrapped__
+        started = time.perf_counter()
+        with capture_call() as info:
+            try:
+                data = await _invoke_async(self, raw, method_name, args, kwargs)
+                return Result(key=key, data=data, latency=time.perf_counter() - started,
+                              status_code=info["status_code"], attempts=info["attempts"])
+            except Exception as e:
+                _log_error(method_name, e)
+                return Result(key=key, error=e, latency=time.perf_counter() - started,
+                              status_code=getattr(e, 'status_code', None) or info["status_code"],
+                              attempts=info["attempts"])
+
+    def _many(self, method_name: str, ids: Iterable[str], max_workers: int, ordered: bool) -> AsyncIterator[Result]:
+        return _async_fan_out(lambda id_value: self._call_result(method_name, id_value, id_value),
+                              ids, max_workers=max_workers, ordered=ordered)
+
+    async def _profile(self,
+                       key: Any,
+                       sections: Sections,
+                       max_workers: Optional[int],
+                       deadline: Optional[float] = None) -> Profile:
+        return await _async_fetch_sections(self._call_result, key, sections, max_workers, deadline)
+
+    def _profile_many(self,
+                      available: Dict[str, str],
+                      ids: Iterable[str],
+                      include: Optional[Iterable[str]],
+                      max_workers: int,
+                      ordered: bool,
+                      section_workers: Optional[int]) -> AsyncIterator[Profile]:
+        include = None if include is None else list(include)
+        select_sections(available, include, ())
+        return _async_fan_out(lambda id_value: self._profile(id_value,
+                                                             select_sections(available, include, (id_value,)),
+                                                             section_workers),
+                              ids, max_workers=max_workers, ordered=ordered)
+
+    def __enter__(self) -> 'api':
+        raise TypeError("AsyncApi must be used with 'async with'")
+
+    async def __aenter__(self) -> 'AsyncApi':
+        """Enter the async context manager.
+
+        Returns:
+            AsyncApi: The API client instance for use within the context.
+        """
+        return self
+
+    async def __aexit__(self,
+                        exc_type: Optional[type],
+                        exc_val: Optional[BaseException],
+                        exc_tb: Optional[Any]) -> None:
+        """Exit the async context manager and close the connection pool."""
+        await self.close()
+
+        if exc_type is not None:
+            self.logger.error(f"Exception in context: {exc_type.__name__}: {exc_val}")
+
+    async def close(self) -> None:
+        """Close the API client and release the connection pool."""
+        try:
+            await self.H.aclose()
+            self.logger.debug("API client closed successfully")
+        except Exception as e:
+            self.logger.error(f"Error closing API client: {e}")
+
+
+for _name, _func in list(vars(api).items()):
+    if callable(_func) and hasattr(_func, '__wrapped__'):
+        setattr(AsyncApi, _name, _make_async_method(_func))
+
+del _name, _func
@@ -1,10 +1,19 @@
 import logging
-from typing import Any, Dict, Optional, Callable, Union, List, Tuple, TypeVar
+import time
+from typing import Any, Dict, Optional, Callable, Union, List, Tuple, TypeVar, Iterable, Iterator
 from functools import wraps
+from .aggregate import (
+    DOSEN_SECTIONS, PRODI_SECTIONS, PRODI_SEMESTER_SECTIONS, PT_SECTIONS,
+    Profile, Sections, fetch_sections, select_sections,
+)
+from .bulk import fan_out
 from .helper import helper
+from .images import CHUNK_SIZE, Destination
+from .result import Result, capture_call
+from .tracing import Tracer
 from .exceptions import (
     PDDIKTIError, APIConnectionError, APITimeoutError, 
-    APIRateLimitError, APIResponseError, ValidationError
+    APIRateLimitError, APIResponseError, ValidationError, CircuitOpenError
 )
 
 # Type variables for better type hinting
@@ -15,6 +24,98 @@ APIMethod = Callable[..., APIResponse]
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _validate_args(args: Tuple[Any, ...]) -> None:
+    """Reject empty string positional parameters before an API call.
+
+    Args:
+        args: Positional arguments passed to the API method, excluding ``self``.
+
+    Raises:
+        ValidationError: If any string parameter is empty or whitespace only.
+    """
+    for i, arg in enumerate(args, 1):
+        if isinstance(arg, str) and not arg.strip():
+            raise ValidationError(f"Parameter {i} cannot be empty string")
+
+def _check_response(func_name: str, response: APIResponse) -> APIResponse:
+    """Validate a decoded API response.
+
+    Args:
+        func_name: Name of the API method, used in log messages.
+        response: The value returned by the API method.
+
+    Returns:
+        APIResponse: The response unchanged.
+
+    Raises:
+        APIResponseError: If the API answered with an ``error`` payload.
+    """
+    if response is None:
+        logger.warning(f"{func_name}: Received None response")
+        return None
+
+    if isinstance(response, dict) and response.get("error"):
+        error_msg = response.get("error", "Unknown API error")
+        logger.error(f"{func_name}: API returned error - {error_msg}")
+        raise APIResponseError(f"API error: {error_msg}")
+
+    return response
+
+def _log_error(func_name: str, error: Exception) -> None:
+    """Log an exception raised by an API method according to its category.
+
+    Args:
+        func_name: Name of the API method that failed.
+        error: The exception that was raised.
+    """
+    if isinstance(error, ValidationError):
+        logger.error(f"{func_name}: Validation error - {error.message}")
+    elif isinstance(error, APITimeoutError):
+        logger.error(f"{func_name}: Timeout error - {error.message}")
+    elif isinstance(error, APIConnectionError):
+        logger.error(f"{func_name}: Connection error - {error.message}")
+    elif isinstance(error, APIRateLimitError):
+        logger.warning(f"{func_name}: Rate limit error - {error.message}")
+    elif isinstance(error, CircuitOpenError):
+        logger.warning(f"{func_name}: Circuit open - {error.message}")
+    elif isinstance(error, APIResponseError):
+        logger.error(f"{func_name}: Response error - {error.message}")
+    elif isinstance(error, PDDIKTIError):
+        logger.error(f"{func_name}: PDDIKTI API error - {error.message}")
+    else:
+        logger.error(f"{func_name}: Unexpected error - {str(error)}", exc_info=error)
+
+def _tracer_of(client: Any) -> Optional[Tracer]:
+    """Return the tracer configured on a client's helper, if any."""
+    return getattr(getattr(client, 'H', None), 'tracer', None)
+
+def _invoke(client: Any, func: Callable[..., APIResponse], func_name: str,
+            args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> APIResponse:
+    """Validate the arguments, run an API method body and check its response.
+    
+    This is the shared core of ``handle_errors`` and ``api._call_result``.
+    When the client has a tracer, the call and its validation are wrapped
+    in spans; otherwise no tracing code runs.
+    
+    Args:
+        client: The API client instance.
+        func: The undecorated method.
+        func_name: Name of the method, used for logs and span names.
+        args: Positional arguments without ``self``.
+        kwargs: Keyword arguments.
+        
+    Returns:
+        APIResponse: The checked response.
+    """
+    tracer = _tracer_of(client)
+    if tracer is None:
+        _validate_args(args)
+        return _check_response(func_name, func(client, *args, **kwargs))
+    with tracer.span(f"pddikti.{func_name}", {"pddikti.method": func_name}):
+        with tracer.span("pddikti.validate"):
+            _validate_args(args)
+        return _check_response(func_name, func(client, *args, **kwargs))
+
 def handle_errors(func: APIMethod) -> APIMethod:
     """Decorator to handle errors for API calls with comprehensive error categorization.
     
@@ -33,70 +134,45 @@ def handle_errors(func: APIMethod) -> APIMethod:
     Note:
         This decorator automatically validates string parameters to ensure 
         they are not empty and handles various API-specific exceptions.
+        The undecorated function stays reachable as ``__wrapped__``.
+        On a client created with ``return_results=True`` the wrapper returns
+        a ``Result`` instead of the data or None.
     """
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> APIResponse:
         func_name = getattr(func, '__name__', 'unknown_function')
         
+        if args and getattr(args[0], 'return_results', False):
+            return args[0]._call_result(func_name, args[1] if len(args) > 1 else None, *args[1:], **kwargs)
+        
         try:
-            # Input validation for common parameters
-            if len(args) > 1:  # Has parameters beyond self
-                for i, arg in enumerate(args[1:], 1):  # Skip self
-                    if isinstance(arg, str) and not arg.strip():
-                        raise ValidationError(f"Parameter {i} cannot be empty string")
-            
-            response = func(*args, **kwargs)
-            
-            # Additional response validation
-            if response is None:
-                logger.warning(f"{func_name}: Received None response")
-                return None
-                
-            if isinstance(response, dict) and response.get("error"):
-                error_msg = response.get("error", "Unknown API error")
-                logger.error(f"{func_name}: API returned error - {error_msg}")
-                raise APIResponseError(f"API error: {error_msg}")
-                
-            return response
-            
-        except ValidationError as e:
-            logger.error(f"{func_name}: Validation error - {e.message}")
-            return None
-            
-        except APITimeoutError as e:
-            logger.error(f"{func_name}: Timeout error - {e.message}")
-            return None
-            
-        except APIConnectionError as e:
-            logger.error(f"{func_name}: Connection error - {e.message}")
-            return None
-            
-        except APIRateLimitError as e:
-            logger.warning(f"{func_name}: Rate limit error - {e.message}")
-            return None
-            
-        except APIResponseError as e:
-            logger.error(f"{func_name}: Response error - {e.message}")
-            return None
-            
-        except PDDIKTIError as e:
-            logger.error(f"{func_name}: PDDIKTI API error - {e.message}")
-            return None
+            # Validation, call and response check (skip self)
+            return _invoke(args[0], func, func_name, args[1:], kwargs)
             
         except Exception as e:
-            logger.error(f"{func_name}: Unexpected error - {str(e)}", exc_info=True)
+            _log_error(func_name, e)
             return None
             
     return wrapper
 
 class api:
-    def __init__(self) -> None:
+    helper_class = helper
+
+    def __init__(self, **options: Any) -> None:
         """Initialize the PDDIKTI API client.
         
         Creates a new instance of the PDDIKTI API client with all necessary
         components including the helper class for HTTP operations, API endpoint
         configuration, and logging setup.
         
+        Args:
+            **options: Keyword arguments forwarded to the helper class, e.g.
+                ``base_url`` to point the client at a mirror or test server.
+                ``return_results=True`` is kept by the client itself: every
+                API method then returns a ``Result`` carrying the data or the
+                error, status code, latency and attempt count instead of
+                logging errors and returning None.
+        
         Raises:
             PDDIKTIError: If the API client initialization fails due to 
                          configuration issues or network problems.
@@ -108,7 +184,8 @@ class api:
             ...     result = client.search_mahasiswa("John")
         """
         try:
-            self.H: helper = helper()
+            self.return_results: bool = bool(options.pop('return_results', False))
+            self.H: helper = self.helper_class(**options)
             self.api_link: str = self.H.endpoint()
             self.logger: logging.Logger = logging.getLogger(__name__)
             self.logger.info("PDDIKTI API client initialized successfully")
@@ -302,6 +379,51 @@ class api:
         if len(id_value) < 10:
             raise ValidationError(f"{field_name} appears to be too short")
     
+    def _call_result(self, method_name: str, key: Any, *args: Any, **kwargs: Any) -> Result:
+        """Call an API method and capture its outcome instead of returning None.
+        
+        Runs the undecorated method body with the same validation and response
+        checks as ``handle_errors``, but returns the exception in the result.
+        
+        Args:
+            method_name: Name of a ``handle_errors``-decorated method.
+            key: Value recorded as ``Result.key``.
+            *args: Arguments for the method.
+            **kwargs: Keyword arguments for the method.
+            
+        Returns:
+            Result: The data or the error, with the call latency, the last
+            HTTP status code and the number of requests sent.
+        """
+        func = getattr(type(self), method_name)
+        raw = getattr(func, '__wrapped__', func)
+        started = time.perf_counter()
+        with capture_call() as info:
+            try:
+                data = _invoke(self, raw, method_name, args, kwargs)
+                return Result(key=key, data=data, latency=time.perf_counter() - started,
+                              status_code=info["status_code"], attempts=info["attempts"])
+            except Exception as e:
+                _log_error(method_name, e)
+                return Result(key=key, error=e, latency=time.perf_counter() - started,
+                              status_code=getattr(e, 'status_code', None) or info["status_code"],
+                              attempts=info["attempts"])
+    
+    def _many(self, method_name: str, ids: Iterable[str], max_workers: int, ordered: bool) -> Iterator[Result]:
+        """Fan an ID-based API method out over many IDs.
+        
+        Args:
+            method_name: Name of a single-ID ``handle_errors``-decorated method.
+            ids: IDs to fetch.
+            max_workers: Number of concurrent requests.
+            ordered: Yield results in input order instead of completion order.
+            
+        Returns:
+            Iterator[Result]: One result per ID, keyed by the ID.
+        """
+        return fan_out(lambda id_value: self._call_result(method_name, id_value, id_value),
+                       ids, max_workers=max_workers, ordered=ordered)
+    
     def _build_endpoint(self, path: str, *args: Union[str, int]) -> str:
         """Build complete API endpoint URL with parameters.
         
@@ -337,6 +459,28 @@ class api:
         except Exception as e:
             raise ValidationError(f"Error building endpoint: {str(e)}")
 
+    def _profile(self,
+                 key: Any,
+                 sections: Sections,
+                 max_workers: Optional[int],
+                 deadline: Optional[float] = None) -> Profile:
+        """Fetches ``sections`` concurrently into one ``Profile``."""
+        return fetch_sections(self._call_result, key, sections, max_workers, deadline)
+
+    def _profile_many(self,
+                      available: Dict[str, str],
+                      ids: Iterable[str],
+                      include: Optional[Iterable[str]],
+                      max_workers: int,
+                      ordered: bool,
+                      section_workers: Optional[int]) -> Iterator[Profile]:
+        include = None if include is None else list(include)
+        select_sections(available, include, ())  # fail fast on unknown names
+        return fan_out(lambda id_value: self._profile(id_value,
+                                                      select_sections(available, include, (id_value,)),
+                                                      section_workers),
+                       ids, max_workers=max_workers, ordered=ordered)
+
     # Search
     @handle_errors
     def search_all(self, keyword: str) -> Optional[Dict[str, Any]]:
@@ -909,6 +1053,39 @@ class api:
         url: str = f"{self.H.endpoint()}/pt/logo/{self.H.parse(pt_id)}"
         return self.H.fetch_image_as_base64(url)
 
+    @handle_errors
+    def stream_logo_pt(self,
+                       pt_id: str,
+                       dest: Optional[Destination] = None,
+                       encode_base64: bool = False,
+                       chunk_size: int = CHUNK_SIZE) -> Union[Iterator[bytes], int, None]:
+        """
+        Get the logo of a university by ID in chunks, without holding it in memory.
+
+        Args:
+            pt_id: The university's ID.
+            dest: File path, binary file object or socket to write the logo
+                to. Without it, an iterator of chunks is returned.
+            encode_base64: Produce base64 (as in ``get_logo_pt``) instead of
+                the raw image bytes, encoded chunk by chunk.
+            chunk_size: Bytes read per chunk.
+
+        Example:
+            >>> client.stream_logo_pt(pt_id, "logo.png")
+            >>> for chunk in client.stream_logo_pt(pt_id):
+            ...     sock.sendall(chunk)
+
+        Returns:
+            Chunk iterator, number of bytes written to ``dest``, or None if an
+            error occurs before the first byte.
+            
+        Raises:
+            ValidationError: If pt_id is invalid
+        """
+        self._validate_id(pt_id, "PT ID")
+        url: str = f"{self.H.endpoint()}/pt/logo/{self.H.parse(pt_id)}"
+        return self.H.stream_image(url, dest, encode_base64, chunk_size)
+
     @handle_errors
     def get_rasio_pt(self, pt_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -1316,6 +1493,28 @@ class api:
         url = f"{self.H.endpoint()}/prodi/logo-pt/{self.H.parse(pt_id)}"
         return self.H.fetch_image_as_base64(url)
 
+    @handle_errors
+    def stream_logo_prodi(self,
+                          pt_id: str,
+                          dest: Optional[Destination] = None,
+                          encode_base64: bool = False,
+                          chunk_size: int = CHUNK_SIZE) -> Union[Iterator[bytes], int, None]:
+        """
+        Get the logo of a study programs by ID in chunks; see ``stream_logo_pt``.
+
+        Args:
+            pt_id: The university's ID.
+            dest: File path, binary file object or socket to write the logo to.
+            encode_base64: Produce base64 instead of the raw image bytes.
+            chunk_size: Bytes read per chunk.
+
+        Returns:
+            Chunk iterator, number of bytes written to ``dest``, or None if an
+            error occurs before the first byte.
+        """
+        url = f"{self.H.endpoint()}/prodi/logo-pt/{self.H.parse(pt_id)}"
+        return self.H.stream_image(url, dest, encode_base64, chunk_size)
+
     @handle_errors
     def get_homebase_prodi(self, prodi_id: str, tahun: Union[int, str]) -> Optional[Dict[str, Any]]:
         """
@@ -1712,3 +1911,220 @@ class api:
         """
         endpoint = f"{self.api_link}/prodi/bidang-ilmu"
         return self.H.response(endpoint)
+
+    # Bulk
+    def get_detail_mhs_many(self,
+                            mahasiswa_ids: Iterable[str],
+                            max_workers: int = 8,
+                            ordered: bool = False) -> Iterator[Result]:
+        """Get student details for many IDs concurrently.
+        
+        Fans ``get_detail_mhs`` out over the pooled session with at most
+        ``max_workers`` requests in flight. For more than 10 workers, create
+        the client with ``api(max_threads=max_workers)`` so every worker
+        keeps its own pooled connection.
+        
+        Args:
+            mahasiswa_ids: Student IDs; may be a lazy iterable.
+            max_workers: Number of concurrent requests. Defaults to 8.
+            ordered: Yield results in input order instead of as they complete.
+            
+        Returns:
+            Iterator[Result]: One ``Result`` per ID with ``key`` set to the ID,
+                and either ``data`` or the ``error`` that occurred.
+                
+        Example:
+            >>> with api(max_threads=16) as client:
+            ...     for result in client.get_detail_mhs_many(ids, max_workers=16):
+            ...         if result.ok:
+            ...             save(result.key, result.data)
+            ...         else:
+            ...             retry_later(result.key, result.error)
+        """
+        return self._many("get_detail_mhs", mahasiswa_ids, max_workers, ordered)
+
+    def get_dosen_profile_many(self,
+                               dosen_ids: Iterable[str],
+                               max_workers: int = 8,
+                               ordered: bool = False) -> Iterator[Result]:
+        """Get lecturer profiles for many IDs concurrently.
+        
+        See ``get_detail_mhs_many`` for the fan-out behaviour.
+        
+        Args:
+            dosen_ids: Lecturer IDs; may be a lazy iterable.
+            max_workers: Number of concurrent requests. Defaults to 8.
+            ordered: Yield results in input order instead of as they complete.
+            
+        Returns:
+            Iterator[Result]: One ``Result`` per lecturer ID.
+        """
+        return self._many("get_dosen_profile", dosen_ids, max_workers, ordered)
+
+    def get_detail_pt_many(self,
+                           pt_ids: Iterable[str],
+                           max_workers: int = 8,
+                           ordered: bool = False) -> Iterator[Result]:
+        """Get university details for many IDs concurrently.
+        
+        See ``get_detail_mhs_many`` for the fan-out behaviour.
+        
+        Args:
+            pt_ids: University IDs; may be a lazy iterable.
+            max_workers: Number of concurrent requests. Defaults to 8.
+            ordered: Yield results in input order instead of as they complete.
+            
+        Returns:
+            Iterator[Result]: One ``Result`` per university ID.
+        """
+        return self._many("get_detail_pt", pt_ids, max_workers, ordered)
+
+    # Aggregates
+    def get_pt_profile(self,
+                       pt_id: str,
+                       include: Optional[Iterable[str]] = None,
+                       max_workers: Optional[int] = None) -> Profile:
+        """Get every ``pt/*`` section of a university in one concurrent call.
+        
+        Issues ``get_detail_pt``, ``get_rasio_pt``, ``get_mahasiswa_pt``,
+        ``get_waktu_studi_pt``, ``get_name_histories_pt``,
+        ``get_cost_range_pt``, ``get_graduation_rate_pt``,
+        ``get_jumlah_prodi_pt``, ``get_jumlah_mahasiswa_pt``,
+        ``get_jumlah_dosen_pt`` and ``get_logo_pt`` in parallel, so the
+        latency is that of the slowest call rather than the sum of all calls.
+        A failing section does not fail the others.
+        
+        Args:
+            pt_id: University ID.
+            include: Section names to fetch (keys of ``PT_SECTIONS``, e.g.
+                ``["detail", "logo"]``). Defaults to all eleven sections.
+            max_workers: Concurrent requests. Defaults to one per section.
+            
+        Returns:
+            Profile: ``data`` holds every successful section, ``errors`` the
+                exception of every failed one; ``profile["detail"]`` gives a
+                single section's data (None if it failed).
+                
+        Raises:
+            ValidationError: If ``include`` names an unknown section.
+                
+        Example:
+            >>> with api() as client:
+            ...     profile = client.get_pt_profile(pt_id, include=["detail", "rasio"])
+            ...     if profile.partial:
+            ...         print("Gagal:", list(profile.errors))
+            ...     print(profile["detail"])
+        """
+        sections = select_sections(PT_SECTIONS, include, (pt_id,))
+        return self._profile(pt_id, sections, max_workers)
+
+    def get_dosen_full(self,
+                       dosen_id: str,
+                       include: Optional[Iterable[str]] = None,
+                       max_workers: Optional[int] = None) -> Profile:
+        """Get a lecturer's profile and full portfolio in one concurrent call.
+        
+        Issues ``get_dosen_profile``, ``get_dosen_penelitian``,
+        ``get_dosen_pengabdian``, ``get_dosen_karya``, ``get_dosen_paten``,
+        ``get_dosen_study_history`` and ``get_dosen_teaching_history`` in
+        parallel over the shared connection pool. See ``get_pt_profile`` for
+        the ``Profile`` result.
+        
+        Args:
+            dosen_id: Lecturer ID.
+            include: Section names to fetch (keys of ``DOSEN_SECTIONS``).
+                Defaults to all seven sections.
+            max_workers: Concurrent requests. Defaults to one per section.
+            
+        Returns:
+            Profile: Per-section data, errors and ``timings``.
+            
+        Raises:
+            ValidationError: If ``include`` names an unknown section.
+            
+        Example:
+            >>> with api() as client:
+            ...     dosen = client.get_dosen_full(dosen_id)
+            ...     print(dosen["profile"], len(dosen["penelitian"] or []))
+            ...     print(dosen.timings)
+        """
+        sections = select_sections(DOSEN_SECTIONS, include, (dosen_id,))
+        return self._profile(dosen_id, sections, max_workers)
+
+    def get_dosen_full_many(self,
+                            dosen_ids: Iterable[str],
+                            include: Optional[Iterable[str]] = None,
+                            max_workers: int = 4,
+                            ordered: bool = False,
+                            section_workers: Optional[int] = None) -> Iterator[Profile]:
+        """Get ``get_dosen_full`` for many lecturers concurrently.
+        
+        Up to ``max_workers`` lecturers are fetched at once, each with up to
+        ``section_workers`` concurrent sections, so at most
+        ``max_workers * section_workers`` requests are in flight. Create the
+        client with ``api(max_threads=...)`` sized to match.
+        
+        Args:
+            dosen_ids: Lecturer IDs; may be a lazy iterable.
+            include: Section names to fetch. Defaults to all seven sections.
+            max_workers: Number of lecturers fetched concurrently. Defaults to 4.
+            ordered: Yield profiles in input order instead of as they complete.
+            section_workers: Concurrent sections per lecturer. Defaults to one
+                per section.
+            
+        Returns:
+            Iterator[Profile]: One ``Profile`` per lecturer ID.
+            
+        Raises:
+            ValidationError: If ``include`` names an unknown section.
+        """
+        return self._profile_many(DOSEN_SECTIONS, dosen_ids, include, max_workers, ordered, section_workers)
+
+    def get_prodi_profile(self,
+                          prodi_id: str,
+                          semester: Optional[Union[int, str]] = None,
+                          include: Optional[Iterable[str]] = None,
+                          deadline: Optional[float] = None,
+                          max_workers: Optional[int] = None) -> Profile:
+        """Get every ``prodi/*`` section of a study program in one concurrent call.
+        
+        Issues ``get_detail_prodi``, ``get_desc_prodi``,
+        ``get_name_histories_prodi``, ``get_num_students_lecturers_prodi``,
+        ``get_cost_range_prodi``, ``get_daya_tampung_prodi``,
+        ``get_rasio_dosen_mahasiswa_prodi``, ``get_graduation_rate_prodi``
+        and, when ``semester`` is given, ``get_homebase_prodi`` and
+        ``get_penghitung_ratio_prodi`` in parallel. See ``get_pt_profile``
+        for the ``Profile`` result.
+        
+        Args:
+            prodi_id: Study program ID.
+            semester: Academic semester in YYYYS format for the ``homebase``
+                and ``penghitung_ratio`` sections. Without it those two
+                sections are skipped unless named in ``include``.
+            include: Section names to fetch (keys of ``PRODI_SECTIONS``).
+            deadline: Seconds to wait for all sections. Sections still
+                running are reported as ``APITimeoutError`` in
+                ``Profile.errors`` and the call returns without them.
+            max_workers: Concurrent requests. Defaults to one per section.
+            
+        Returns:
+            Profile: Per-section data, errors and timings.
+            
+        Raises:
+            ValidationError: If ``include`` names an unknown section, or
+                names a semester section without ``semester``.
+                
+        Example:
+            >>> with api() as client:
+            ...     prodi = client.get_prodi_profile(prodi_id, semester=20241, deadline=2.0)
+            ...     render(prodi.data, missing=list(prodi.errors))
+        """
+        if include is None and semester is None:
+            include = [name for name in PRODI_SECTIONS if name not in PRODI_SEMESTER_SECTIONS]
+        sections = select_sections(PRODI_SECTIONS, include, (prodi_id,))
+        for name in PRODI_SEMESTER_SECTIONS:
+            if name in sections:
+                if semester is None:
+                    raise ValidationError(f"Section '{name}' requires a semester")
+                sections[name] = (PRODI_SECTIONS[name], (prodi_id, semester))
+        return self._profile(prodi_id, sections, max_workers, deadline)
@@ -0,0 +1,60 @@
+"""
+Bounded concurrent fan-out for bulk API calls.
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Set
+
+from .exceptions import ValidationError
+from .result import Result
+
+
+def fan_out(fn: Callable[[Any], Result],
+            items: Iterable[Any],
+            max_workers: int = 8,
+            ordered: bool = False) -> Iterator[Result]:
+    """
+    Applies ``fn`` to every item on a thread pool and yields the results.
+
+    At most ``2 * max_workers`` items are queued at any time, so ``items`` may
+    be a large or lazy iterable. Closing the generator early cancels the work
+    that has not started yet.
+
+    Args:
+        fn: Callable returning a ``Result``; it must not raise
+        items: Inputs to process
+        max_workers: Number of concurrent calls
+        ordered: Yield results in input order instead of completion order
+
+    Yields:
+        Result: One result per input item
+    """
+    if max_workers < 1:
+        raise ValidationError("max_workers must be at least 1")
+
+    items = iter(items)
+    window = max_workers * 2
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pddikti-bulk")
+    queued: "deque[Future]" = deque(pool.submit(fn, item) for item in islice(items, window))
+    pending: Set[Future] = set(queued)
+    try:
+        if ordered:
+            while queued:
+                future = queued.popleft()
+                result = future.result()
+                pending.discard(future)
+                for item in islice(items, 1):
+                    queued.append(pool.submit(fn, item))
+                    pending.add(queued[-1])
+                yield result
+        else:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                pending |= {pool.submit(fn, item) for item in islice(items, len(done))}
+                for future in done:
+                    yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
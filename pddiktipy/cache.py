@@ -0,0 +1,283 @@
+"""
+Response caching for the PDDIKTI API client.
+
+A cache backend stores decoded JSON responses keyed by endpoint URL, and a
+``CachePolicy`` decides how long each endpoint family stays fresh. Plug them
+into the client with ``api(cache=MemoryCache(), cache_policy=CachePolicy())``.
+
+Entries keep the ``ETag``/``Last-Modified`` validators of their response.
+Once such an entry expires, the client revalidates it with a conditional
+request; a ``304 Not Modified`` refreshes the entry without transferring or
+decoding the body again.
+
+A policy can also allow serving expired entries: within
+``stale_while_revalidate`` seconds past expiry the entry is returned at once
+while a background refresh runs, and within ``stale_if_error`` seconds it
+stands in for a request that fails because upstream is unreachable.
+
+Negative results, i.e. ``404 Not Found`` and empty results such as a search
+without matches, can be cached separately for ``negative_ttl`` seconds under
+``negative:<endpoint>``, where search keywords are normalized (see
+``endpoints.normalize_endpoint``) so misspellings differing only in case or
+spacing share one entry.
+
+Cached values are shared between callers; treat returned data as read-only.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Union
+
+from .endpoints import endpoint_family
+from .exceptions import ValidationError
+
+
+@dataclass
+class CacheEntry:
+    """A cached response and its expiry time (``time.time()`` based).
+
+    Attributes:
+        value: Decoded response
+        expires_at: Expiry time
+        etag: ``ETag`` of the response, if any
+        last_modified: ``Last-Modified`` of the response, if any
+        size: Body bytes of the response the value was decoded from
+        stale_until: Until when the entry may be served after expiring
+            (see ``CachePolicy``); backends keep it at least that long
+        status: HTTP status the entry stands for; ``404`` for a cached
+            not-found result
+    """
+    value: Any
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    size: int = 0
+    stale_until: float = 0.0
+    status: int = 200
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        """Whether the entry can be revalidated with a conditional request."""
+        return bool(self.etag or self.last_modified)
+
+    @property
+    def retained(self) -> bool:
+        """Whether an expired entry is still of use: revalidatable or servable stale."""
+        return self.revalidatable or time.time() < self.stale_until
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """``If-None-Match``/``If-Modified-Since`` headers revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def revalidated(self, headers: Any) -> 'CacheEntry':
+        """
+        Returns this entry refreshed by a ``304`` response, keeping any new
+        validators it carried; ``expires_at`` is left for the caller to set.
+        """
+        return replace(self, etag=headers.get("ETag") or self.etag,
+                       last_modified=headers.get("Last-Modified") or self.last_modified)
+
+
+class BaseCache:
+    """
+    Interface for cache backends.
+
+    Backends must be safe to call from several threads and count their own
+    hits and misses.
+    """
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Returns the fresh entry stored under ``key``, or None."""
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Stores ``entry`` under ``key``."""
+        raise NotImplementedError
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns the entry stored under ``key`` even if it has expired, for
+        revalidation or stale serving. Counts neither as hit nor as miss. Backends that drop
+        expired entries may return None; the client then falls back to a
+        full request.
+        """
+        return None
+
+    def delete(self, key: str) -> None:
+        """Removes ``key`` if present."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and size information."""
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """
+    In-process LRU cache with per-entry expiry.
+
+    Args:
+        maxsize: Maximum number of entries; the least recently used entry is
+            evicted when full
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValidationError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expired:
+                # Revalidatable and stale-servable entries stay for ``get_stale``
+                if not entry.retained:
+                    del self._entries[key]
+                    self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+class CachePolicy:
+    """
+    Time-to-live rules per endpoint family.
+
+    Args:
+        ttls: Overrides for ``DEFAULT_TTLS``, in seconds. A TTL of 0 disables
+            caching for that family.
+        default_ttl: TTL for families not listed in ``ttls``
+        stale_while_revalidate: Seconds past expiry during which an entry is
+            served immediately while one background request refreshes it;
+            a number for every family or a per-family dict. 0 disables it.
+        stale_if_error: Seconds past expiry during which an entry is served
+            when the refresh fails because upstream is unreachable, times
+            out, throttles or answers 5xx; a number or a per-family dict
+        negative_ttl: Seconds to cache ``404`` answers and empty results,
+            independently of ``ttls``; a number or a per-family dict.
+            0 (the default) disables negative caching: 404s are not cached
+            and empty results follow ``ttls`` like any other.
+
+    Example:
+        >>> policy = CachePolicy(ttls={"pencarian": 0, "visualisasi": 3600})
+        >>> policy.ttl_for("visualisasi/pt-provinsi")
+        3600
+        >>> dashboard = CachePolicy(stale_while_revalidate={"visualisasi": 6 * 3600, "count": 6 * 3600},
+        ...                         stale_if_error=86400)
+        >>> strict = CachePolicy(negative_ttl={"pencarian": 120, "detail": 600})
+    """
+
+    DEFAULT_TTLS: Dict[str, float] = {
+        "pencarian": 300,
+        "detail": 3600,
+        "pt": 6 * 3600,
+        "prodi": 6 * 3600,
+        "dosen": 6 * 3600,
+        "visualisasi": 24 * 3600,
+        "count": 24 * 3600,
+    }
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 3600,
+                 stale_while_revalidate: Union[float, Dict[str, float]] = 0,
+                 stale_if_error: Union[float, Dict[str, float]] = 0,
+                 negative_ttl: Union[float, Dict[str, float]] = 0):
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.negative_ttl = negative_ttl
+
+    def ttl_for(self, path: str) -> float:
+        """
+        Returns the TTL in seconds for an API path.
+
+        Args:
+            path: API path as returned by ``endpoints.endpoint_path``
+        """
+        return self.ttls.get(endpoint_family(path), self.default_ttl)
+
+    @staticmethod
+    def _window(setting: Union[float, Dict[str, float]], path: str) -> float:
+        if isinstance(setting, dict):
+            return setting.get(endpoint_family(path), 0)
+        return setting
+
+    def stale_while_revalidate_for(self, path: str) -> float:
+        """Returns the stale-while-revalidate window in seconds for an API path."""
+        return self._window(self.stale_while_revalidate, path)
+
+    def stale_if_error_for(self, path: str) -> float:
+        """Returns the stale-if-error window in seconds for an API path."""
+        return self._window(self.stale_if_error, path)
+
+    def negative_ttl_for(self, path: str) -> float:
+        """Returns the TTL in seconds of negative results for an API path."""
+        return self._window(self.negative_ttl, path)
+
+
+def is_empty_result(value: Any) -> bool:
+    """
+    Whether a decoded response holds no results: ``null``, an empty list or
+    object, or an object of empty lists (``pencarian/all``).
+    """
+    if value is None or value == [] or value == {}:
+        return True
+    return isinstance(value, dict) and all(item == [] for item in value.values())
@@ -0,0 +1,245 @@
+"""
+Record/replay of HTTP traffic ("cassettes").
+
+In ``record`` mode every response the client receives is appended to an
+NDJSON file: request path, status, headers, zlib-compressed body, elapsed
+time and the offset since recording started. Timeouts and connection
+errors are recorded too. In ``replay`` mode the same client serves those
+responses back without any network access, optionally waiting the
+recorded time (scaled by ``timing``), so production slowdowns and
+benchmark workloads can be reproduced deterministically.
+
+Responses are matched by path and query string, ignoring scheme and host,
+so a cassette recorded against the live API replays under any ``base_url``
+without a path of its own; a ``base_url`` such as ``http://proxy/pddikti``
+changes every path and needs a cassette recorded through it. Repeated
+requests for the same path get the recorded responses in order, starting
+over when they run out. While replaying, the client does not look up its
+public IP and sends the built-in fallback in ``X-User-IP``.
+
+Example:
+    >>> from pddiktipy import api
+    >>> from pddiktipy.cassette import Cassette
+    >>> with api(cassette=Cassette("traffic.ndjson", mode="record")) as client:
+    ...     client.get_detail_pt(pt_id)
+    >>> with api(cassette=Cassette("traffic.ndjson", timing=0.5)) as client:
+    ...     client.get_detail_pt(pt_id)  # served from the file at double speed
+"""
+import base64
+import json
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import APIConnectionError, ValidationError
+
+RECORD = "record"
+REPLAY = "replay"
+
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+def cassette_key(url: str) -> str:
+    """Path and query of a URL, the key responses are matched by."""
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def recordable_headers(headers: Any) -> Dict[str, str]:
+    """Response headers worth recording; transfer and encoding headers no longer apply to the decoded body."""
+    return {name: value for name, value in headers.items() if name.lower() not in _SKIPPED_HEADERS}
+
+
+@dataclass
+class CassetteEntry:
+    """One recorded exchange.
+
+    Attributes:
+        key: Request path and query string
+        status: HTTP status code; None for recorded errors
+        headers: Response headers
+        body: Raw response body
+        elapsed: Seconds the exchange took
+        offset: Seconds since recording started, when the request was sent
+        error: ``"timeout"`` or ``"connection"`` for failed exchanges
+    """
+    key: str
+    status: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    elapsed: float = 0.0
+    offset: float = 0.0
+    error: Optional[str] = None
+
+    def to_json(self) -> str:
+        record = {"key": self.key, "status": self.status, "headers": self.headers,
+                  "body": base64.b64encode(zlib.compress(self.body)).decode("ascii"),
+                  "elapsed": round(self.elapsed, 6), "offset": round(self.offset, 6)}
+        if self.error:
+            record["error"] = self.error
+        return json.dumps(record, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str) -> 'CassetteEntry':
+        record = json.loads(line)
+        return cls(record["key"], record.get("status"), record.get("headers", {}),
+                   zlib.decompress(base64.b64decode(record["body"])), record.get("elapsed", 0.0),
+                   record.get("offset", 0.0), record.get("error"))
+
+
+class Cassette:
+    """
+    Append-only file of recorded exchanges, in record or replay mode.
+
+    Args:
+        path: NDJSON file; appended to when recording
+        mode: ``"record"`` or ``"replay"``
+        timing: Replay delay as a multiple of the recorded time: 1.0 keeps
+            the original timing, 0.5 halves it, 0 or None replays instantly
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY, timing: Optional[float] = 1.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValidationError(f"mode must be '{RECORD}' or '{REPLAY}'")
+        self.path = path
+        self.mode = mode
+        self.timing = timing or 0.0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[CassetteEntry]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._file = None
+        self._started = time.perf_counter()
+        if mode == REPLAY:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = CassetteEntry.from_json(line)
+                        self._entries.setdefault(entry.key, []).append(entry)
+        else:
+            self._file = open(path, "a", encoding="utf-8")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def entries(self) -> List[CassetteEntry]:
+        """All loaded or recorded exchanges, grouped by path."""
+        with self._lock:
+            return [entry for entries in self._entries.values() for entry in entries]
+
+    def record(self, entry: CassetteEntry) -> None:
+        """Appends an exchange; ``entry.offset`` is set from the recording clock."""
+        entry.offset = time.perf_counter() - self._started - entry.elapsed
+        line = entry.to_json()
+        with self._lock:
+            self._entries.setdefault(entry.key, []).append(entry)
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def play(self, url: str) -> CassetteEntry:
+        """
+        Returns the next recorded exchange for a URL.
+
+        Raises:
+            APIConnectionError: If nothing was recorded for the URL
+        """
+        key = cassette_key(url)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise APIConnectionError(f"No recorded response in cassette {self.path}", endpoint=url)
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = (cursor + 1) % len(entries)
+            return entries[cursor]
+
+    def delay(self, entry: CassetteEntry) -> float:
+        """Seconds to wait before replaying ``entry``."""
+        return entry.elapsed * self.timing
+
+    def rewind(self) -> None:
+        """Restarts replay from the first recorded response of every path."""
+        with self._lock:
+            self._cursors.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> 'Cassette':
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_val: Optional[BaseException], exc_tb: Optional[Any]) -> None:
+        self.close()
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    ``requests`` transport adapter recording through, or replaying instead
+    of, a real adapter. A recorded exchange includes the real adapter's
+    retries, so it replays as a single attempt.
+
+    Args:
+        cassette: The cassette to record to or replay from
+        adapter: Adapter used for real requests in record mode
+    """
+
+    def __init__(self, cassette: Cassette, adapter: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if self.cassette.replaying:
+            return self._replay(request)
+        key = cassette_key(request.url)
+        started = time.perf_counter()
+        try:
+            response = self.adapter.send(request, **kwargs)
+        except requests.Timeout:
+            self.cassette.record(CassetteEntry(key, elapsed=time.perf_counter() - started, error=TIMEOUT))
+            raise
+        except requests.ConnectionError:
+            self.cassette.record(CassetteEntry(key, elapsed=time.perf_counter() - started, error=CONNECTION))
+            raise
+        self.cassette.record(CassetteEntry(key, response.status_code, recordable_headers(response.headers),
+                                           response.content, time.perf_counter() - started))
+        return response
+
+    def _replay(self, request: requests.PreparedRequest) -> requests.Response:
+        entry = self.cassette.play(request.url)
+        delay = self.cassette.delay(entry)
+        if delay > 0:
+            time.sleep(delay)
+        if entry.error == TIMEOUT:
+            raise requests.exceptions.ReadTimeout("Recorded timeout", request=request)
+        if entry.error == CONNECTION:
+            raise requests.ConnectionError("Recorded connection error", request=request)
+        response = requests.Response()
+        response.status_code = entry.status
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.body
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        return response
+
+    def close(self) -> None:
+        if self.adapter is not None:
+            self.adapter.close()
@@ -0,0 +1,258 @@
+"""
+Circuit breakers per endpoint family.
+
+When an upstream family such as ``dosen/*`` starts failing, every caller
+would otherwise wait for the full timeout and all retries. A breaker
+counts failures (timeouts, connection errors, 5xx) in a sliding window and
+opens once the error rate passes a threshold; calls then fail immediately
+with ``CircuitOpenError``. After ``open_timeout`` seconds a limited number
+of half-open probe calls are let through: if they succeed the breaker
+closes, otherwise it opens again.
+
+Example:
+    >>> from pddiktipy import api
+    >>> from pddiktipy.circuit import CircuitBreakers
+    >>> breakers = CircuitBreakers(failure_rate=0.5, min_requests=20, open_timeout=30)
+    >>> client = api(circuit_breaker=breakers)
+    >>> breakers.get("dosen").state
+    'closed'
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .endpoints import endpoint_family
+from .exceptions import (
+    APIConnectionError, APIResponseError, APITimeoutError, CircuitOpenError, ValidationError
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_failure(error: Optional[BaseException]) -> bool:
+    """
+    True if an error indicates an unhealthy upstream.
+
+    Timeouts, connection errors and 5xx responses count; client errors such
+    as 404 or validation failures do not.
+    """
+    if isinstance(error, (APITimeoutError, APIConnectionError)):
+        return True
+    return isinstance(error, APIResponseError) and (error.status_code is None or error.status_code >= 500)
+
+
+class CircuitBreaker:
+    """
+    Breaker for one endpoint family.
+
+    Args:
+        name: Family name, used in errors and state reports
+        failure_rate: Failure share in the window that opens the breaker
+        min_requests: Calls required in the window before it may open
+        window: Sliding window length in seconds
+        open_timeout: Seconds to stay open before probing
+        half_open_max: Concurrent probe calls allowed while half-open;
+            this many successful probes close the breaker
+    """
+
+    def __init__(self,
+                 name: str,
+                 failure_rate: float = 0.5,
+                 min_requests: int = 10,
+                 window: float = 30.0,
+                 open_timeout: float = 30.0,
+                 half_open_max: int = 1):
+        if not 0 < failure_rate <= 1:
+            raise ValidationError("failure_rate must be in (0, 1]")
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = max(1, min_requests)
+        self.window = window
+        self.open_timeout = open_timeout
+        self.half_open_max = max(1, half_open_max)
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        # [second, successes, failures] buckets covering the window
+        self._buckets: Deque[List[Any]] = deque()
+        self._probes = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def _counts(self, now: float) -> tuple:
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+        successes = sum(bucket[1] for bucket in self._buckets)
+        failures = sum(bucket[2] for bucket in self._buckets)
+        return successes, failures
+
+    def _add(self, now: float, failed: bool) -> None:
+        second = int(now)
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        self._buckets[-1][2 if failed else 1] += 1
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self.opened += 1
+
+    @property
+    def state(self) -> str:
+        """Current state: ``"closed"``, ``"open"`` or ``"half_open"``."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self, endpoint: Optional[str] = None) -> bool:
+        """
+        Admits a call or fails fast.
+
+        Every admitted call must be followed by ``record``, passing on the
+        returned probe flag.
+
+        Returns:
+            bool: True if the call is a half-open probe
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all
+                probe slots taken
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == OPEN and now - self._opened_at >= self.open_timeout:
+                self._state = HALF_OPEN
+                self._probes = self._probe_successes = 0
+            if self._state == CLOSED:
+                return False
+            if self._state == HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            retry_in = max(0.0, self.open_timeout - (now - self._opened_at))
+        raise CircuitOpenError(
+            f"Circuit open for '{self.name}' endpoints; retry in {retry_in:.0f}s",
+            endpoint=endpoint
+        )
+
+    def record(self, error: Optional[BaseException] = None, probe: bool = False) -> None:
+        """
+        Records the outcome of an admitted call.
+
+        Args:
+            error: The exception the call raised; None on success
+            probe: The flag returned by ``before_call``
+        """
+        failed = is_failure(error)
+        with self._lock:
+            now = time.monotonic()
+            if probe and self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed:
+                    self._open(now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_max:
+                        self._state = CLOSED
+                        self._buckets.clear()
+                return
+            self._add(now, failed)
+            if self._state == CLOSED and failed:
+                successes, failures = self._counts(now)
+                total = successes + failures
+                if total >= self.min_requests and failures / total >= self.failure_rate:
+                    self._open(now)
+
+    def release(self, probe: bool) -> None:
+        """Frees an admitted call that ended without an outcome (e.g. cancelled)."""
+        if probe:
+            with self._lock:
+                self._probes = max(0, self._probes - 1)
+
+    def reset(self) -> None:
+        """Closes the breaker and forgets its history."""
+        with self._lock:
+            self._state = CLOSED
+            self._buckets.clear()
+            self._probes = self._probe_successes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the breaker state.
+
+        Returns:
+            dict: ``state``, ``requests`` and ``failures`` in the window,
+            ``failure_rate``, ``retry_in`` (seconds until probing, when
+            open), ``opened`` (times opened) and ``rejected`` (calls failed
+            fast)
+        """
+        state = self.state
+        with self._lock:
+            now = time.monotonic()
+            successes, failures = self._counts(now)
+            total = successes + failures
+            return {
+                "state": state,
+                "requests": total,
+                "failures": failures,
+                "failure_rate": failures / total if total else 0.0,
+                "retry_in": max(0.0, self.open_timeout - (now - self._opened_at)) if state == OPEN else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class CircuitBreakers:
+    """
+    Registry of one ``CircuitBreaker`` per endpoint family.
+
+    Args:
+        overrides: Per-family keyword arguments, e.g.
+            ``{"dosen": {"open_timeout": 120}}``
+        **options: Default ``CircuitBreaker`` arguments for every family
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, Dict[str, Any]]] = None, **options: Any):
+        self.options = options
+        self.overrides = dict(overrides or {})
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, family: str) -> CircuitBreaker:
+        """Returns the breaker of a family, creating it on first use."""
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(family)
+                if breaker is None:
+                    options = dict(self.options, **self.overrides.get(family, {}))
+                    breaker = self._breakers[family] = CircuitBreaker(family, **options)
+        return breaker
+
+    def for_path(self, path: str) -> CircuitBreaker:
+        """Returns the breaker of the family an API path belongs to."""
+        return self.get(endpoint_family(path))
+
+    def is_open(self, family: str) -> bool:
+        """True if calls to ``family`` currently fail fast."""
+        return family in self._breakers and self._breakers[family].state == OPEN
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """Returns ``snapshot()`` of every family seen so far."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {family: breaker.snapshot() for family, breaker in breakers.items()}
+
+    def reset(self, family: Optional[str] = None) -> None:
+        """Closes one family's breaker, or all of them."""
+        with self._lock:
+            breakers = [self._breakers[family]] if family in self._breakers else (
+                list(self._breakers.values()) if family is None else [])
+        for breaker in breakers:
+            breaker.reset()
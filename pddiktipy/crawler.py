@@ -0,0 +1,425 @@
+"""
+Resumable full-catalogue crawler: PT -> prodi -> homebase dosen.
+
+Starting from ``search_pt`` keywords, the crawler lists every study program
+of each university with ``get_prodi_pt`` and the homebase lecturers of each
+program with ``get_homebase_prodi``. Records are appended to one NDJSON file
+per entity type in the output directory:
+
+    pt.ndjson        search_pt records
+    prodi.ndjson     get_prodi_pt records, with ``pt_id``
+    homebase.ndjson  get_homebase_prodi records, with ``prodi_id``
+
+With ``details=True`` it also fetches ``get_detail_pt`` and
+``get_detail_prodi`` into ``pt_detail.ndjson`` and ``prodi_detail.ndjson``.
+
+With a ``SnapshotStore`` only records that were added or changed since the
+previous crawl are written, and the IDs that disappeared are written to
+``removed.ndjson`` once the crawl completes. Homebase lists are compared per
+prodi; when one changes, the whole list is written.
+
+Every task is recorded in an append-only journal (``journal.ndjson``) when it
+is discovered and when it completes. Running the crawler again on the same
+directory skips finished tasks and continues with the rest, so an
+interrupted run resumes where it stopped. A task interrupted after its
+records were written is repeated, so records are delivered at least once;
+deduplicate on ``id``/``id_sms`` if that matters downstream.
+
+Failed calls are journaled and left pending for the next run, except
+permanent failures (invalid IDs, HTTP 404), which are marked done.
+
+Example:
+    >>> from pddiktipy import api
+    >>> from pddiktipy.crawler import Crawler
+    >>> with api(max_threads=16) as client:
+    ...     Crawler(client, "mirror/2024-1", semester=20241, max_workers=16).run(["universitas", "institut"])
+
+From the command line:
+
+    python -m pddiktipy.crawler mirror/2024-1 --semester 20241 universitas institut
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .exceptions import PDDIKTIError, ValidationError
+from .result import Result
+from .snapshot import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# (kind, argument), e.g. ("pt", "<pt id>")
+Task = Tuple[str, str]
+
+ENTITY_FILES = {
+    "pt": "pt.ndjson",
+    "prodi": "prodi.ndjson",
+    "homebase": "homebase.ndjson",
+    "pt_detail": "pt_detail.ndjson",
+    "prodi_detail": "prodi_detail.ndjson",
+}
+JOURNAL_FILE = "journal.ndjson"
+REMOVED_FILE = "removed.ndjson"
+
+# Task kind -> (api method, takes the semester)
+TASK_METHODS = {
+    "search": ("search_pt", False),
+    "pt": ("get_prodi_pt", True),
+    "prodi": ("get_homebase_prodi", True),
+    "pt_detail": ("get_detail_pt", False),
+    "prodi_detail": ("get_detail_prodi", False),
+}
+
+
+def is_permanent(error: Exception) -> bool:
+    """True for failures that retrying will not fix."""
+    return isinstance(error, ValidationError) or (
+        isinstance(error, PDDIKTIError) and error.status_code == 404
+    )
+
+
+def records(data: Any) -> List[Dict[str, Any]]:
+    """Normalizes an API response to a list of records."""
+    if data is None:
+        return []
+    if isinstance(data, dict) and isinstance(data.get("data"), list):
+        data = data["data"]
+    return data if isinstance(data, list) else [data]
+
+
+class Journal:
+    """
+    Append-only NDJSON log of discovered and completed crawl tasks.
+
+    Each line is ``{"op": "add" | "done" | "fail", "task": [kind, arg]}``.
+    A task is pending if it was added but never marked done.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.added: Dict[Task, None] = {}
+        self.done: Set[Task] = set()
+        if os.path.exists(path):
+            self._load()
+        self._file: IO[str] = open(path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line from an interrupted write
+                    continue
+                task = tuple(entry["task"])
+                if entry["op"] == "add":
+                    self.added[task] = None
+                elif entry["op"] == "done":
+                    self.done.add(task)
+
+    def pending(self) -> List[Task]:
+        """Tasks added but not completed, in discovery order."""
+        return [task for task in self.added if task not in self.done]
+
+    def _write(self, op: str, task: Task, **extra: Any) -> None:
+        self._file.write(json.dumps(dict(op=op, task=list(task), **extra), ensure_ascii=False) + "\n")
+
+    def add(self, task: Task) -> bool:
+        """Records a newly discovered task; returns False if already known."""
+        if task in self.added:
+            return False
+        self.added[task] = None
+        self._write("add", task)
+        return True
+
+    def complete(self, task: Task) -> None:
+        self.done.add(task)
+        self._write("done", task)
+
+    def fail(self, task: Task, error: Exception) -> None:
+        """Records a failed attempt; the task stays pending."""
+        self._write("fail", task, error=f"{type(error).__name__}: {error}")
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class CrawlStats:
+    """Progress of a crawl run.
+
+    Attributes:
+        done: Tasks completed in this run
+        failed: Tasks that failed in this run
+        pending: Known tasks not yet completed
+        records: Records written per entity type
+        changes: With a snapshot store, counts of added, changed, unchanged
+            and removed entities
+        elapsed: Seconds since the run started
+    """
+    done: int = 0
+    failed: int = 0
+    pending: int = 0
+    records: Optional[Dict[str, int]] = None
+    changes: Optional[Dict[str, int]] = None
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Completed tasks per second."""
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds until the currently known tasks are done, if estimable."""
+        return self.pending / self.rate if self.rate else None
+
+    def __str__(self) -> str:
+        eta = f"{self.eta:.0f}s" if self.eta is not None else "?"
+        return (f"{self.done} done, {self.failed} failed, {self.pending} pending, "
+                f"{self.rate:.1f} tasks/s, ETA {eta}")
+
+
+class Crawler:
+    """
+    Crawls PT -> prodi -> homebase with bounded concurrency and checkpoints.
+
+    Args:
+        client: An ``api`` instance; create it with ``max_threads`` at least
+            ``max_workers`` so every worker has a pooled connection
+        output_dir: Directory for the NDJSON files and the journal
+        semester: Academic semester (YYYYS) for ``get_prodi_pt`` and
+            ``get_homebase_prodi``
+        max_workers: Concurrent API calls
+        homebase: Also fetch homebase lecturers for every prodi
+        details: Also fetch ``get_detail_pt`` and ``get_detail_prodi``
+        snapshot: Store of previous crawls; only deltas are written
+        progress_interval: Seconds between progress log lines
+        progress: Optional callback receiving ``CrawlStats`` at the same
+            interval and once at the end
+    """
+
+    def __init__(self,
+                 client: Any,
+                 output_dir: str,
+                 semester: Union[int, str],
+                 max_workers: int = 8,
+                 homebase: bool = True,
+                 details: bool = False,
+                 snapshot: Optional[SnapshotStore] = None,
+                 progress_interval: float = 10.0,
+                 progress: Optional[Callable[[CrawlStats], None]] = None):
+        if max_workers < 1:
+            raise ValidationError("max_workers must be at least 1")
+        client._validate_semester(semester, "Semester")
+        self.client = client
+        self.output_dir = output_dir
+        self.semester = str(semester)
+        self.max_workers = max_workers
+        self.homebase = homebase
+        self.details = details
+        self.snapshot = snapshot
+        self.progress_interval = progress_interval
+        self.progress = progress
+        self.entities = ["pt", "prodi"] + ["homebase"] * homebase + ["pt_detail", "prodi_detail"] * details
+        self.stats = CrawlStats(records={entity: 0 for entity in self.entities})
+        if snapshot is not None:
+            self.stats.changes = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+
+    def _fetch(self, task: Task) -> Result:
+        kind, arg = task
+        method, semester = TASK_METHODS[kind]
+        args = (arg, self.semester) if semester else (arg,)
+        return self.client._call_result(method, task, *args)
+
+    def _observe(self, entity: str, id: Any, record: Any) -> bool:
+        """Records ``record`` in the snapshot; True if it should be written."""
+        if self.snapshot is None:
+            return True
+        change = self.snapshot.observe(entity, str(id), record)
+        self.stats.changes[change or "unchanged"] += 1
+        return change is not None
+
+    def _write(self, outputs: Dict[str, IO[str]], entity: str, record: Any) -> None:
+        outputs[entity].write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stats.records[entity] += 1
+
+    def _discover(self, journal: Journal, *tasks: Task) -> List[Task]:
+        return [task for task in tasks if task[1] and journal.add(task)]
+
+    def _handle(self, task: Task, data: Any, journal: Journal, outputs: Dict[str, IO[str]]) -> List[Task]:
+        """Writes a task's records and returns the tasks it discovered."""
+        kind, arg = task
+        children: List[Task] = []
+        if kind in ("prodi", "pt_detail", "prodi_detail"):
+            entity = "homebase" if kind == "prodi" else kind
+            items = records(data) if kind == "prodi" else [data]
+            if self._observe(entity, arg, items if kind == "prodi" else data):
+                for record in items:
+                    self._write(outputs, entity, {"prodi_id": arg, **record} if kind == "prodi" else record)
+            return children
+
+        for record in records(data):
+            if kind == "search":
+                pt_id = record.get("id")
+                if ("pt", pt_id) in journal.added:
+                    continue  # already found by an earlier keyword
+                found = [("pt", pt_id)] + [("pt_detail", pt_id)] * self.details
+                entity, id_value = "pt", pt_id
+            else:
+                prodi_id = record.get("id_sms")
+                record = {"pt_id": arg, **record}
+                found = [("prodi", prodi_id)] * self.homebase + [("prodi_detail", prodi_id)] * self.details
+                entity, id_value = "prodi", prodi_id
+            if self._observe(entity, id_value, record):
+                self._write(outputs, entity, record)
+            children += self._discover(journal, *found)
+        return children
+
+    def _finish_snapshot(self) -> None:
+        """Writes the entities that disappeared since the previous crawl."""
+        removed = self.snapshot.finish(self.entities)
+        with open(os.path.join(self.output_dir, REMOVED_FILE), "a", encoding="utf-8") as f:
+            for change in removed:
+                f.write(json.dumps({"entity": change.entity, "id": change.id}, ensure_ascii=False) + "\n")
+        self.stats.changes["removed"] = len(removed)
+
+    def run(self, keywords: Iterable[str] = ()) -> CrawlStats:
+        """
+        Crawls from the given ``search_pt`` keywords, resuming pending work.
+
+        Keywords already searched in an earlier run are not repeated, so
+        calling ``run`` again with the same keywords resumes the crawl. Once
+        the crawl in ``output_dir`` is complete, further calls do nothing;
+        a new crawl (e.g. the next snapshot run) needs a new directory.
+
+        Returns:
+            CrawlStats: Final statistics of this run
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        journal = Journal(os.path.join(self.output_dir, JOURNAL_FILE))
+        for keyword in keywords:
+            journal.add(("search", keyword))
+        queue: Deque[Task] = deque(journal.pending())
+        if not queue:
+            # Finishing a snapshot run here would report every stored entity as removed
+            journal.close()
+            logger.warning(f"Crawl in {self.output_dir} is already complete; "
+                           f"use a new output directory to crawl again")
+            return self.stats
+        if journal.done:
+            logger.info(f"Resuming crawl: {len(journal.done)} tasks done, {len(queue)} pending")
+        outputs = {entity: open(os.path.join(self.output_dir, ENTITY_FILES[entity]), "a", encoding="utf-8")
+                   for entity in self.entities}
+        if self.snapshot is not None:
+            self.snapshot.begin()
+
+        started = last_report = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pddikti-crawl")
+        running: Dict[Future, Task] = {}
+        try:
+            while queue or running:
+                while queue and len(running) < self.max_workers * 2:
+                    task = queue.popleft()
+                    running[pool.submit(self._fetch, task)] = task
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    result = future.result()
+                    if result.ok:
+                        queue.extend(self._handle(task, result.data, journal, outputs))
+                        journal.complete(task)
+                        self.stats.done += 1
+                    else:
+                        logger.warning(f"Crawl task {task} failed: {result.error}")
+                        journal.fail(task, result.error)
+                        if is_permanent(result.error):
+                            journal.complete(task)
+                        self.stats.failed += 1
+                for f in outputs.values():
+                    f.flush()
+                if self.snapshot is not None:
+                    self.snapshot.commit()
+                journal.flush()
+
+                self.stats.pending = len(queue) + len(running)
+                self.stats.elapsed = time.perf_counter() - started
+                if self.stats.elapsed and time.perf_counter() - last_report >= self.progress_interval:
+                    last_report = time.perf_counter()
+                    self._report()
+        finally:
+            for future in running:
+                future.cancel()
+            pool.shutdown(wait=False)
+            for f in outputs.values():
+                f.close()
+            self.stats.pending = len(journal.pending())
+            self.stats.elapsed = time.perf_counter() - started
+            journal.close()
+        if self.snapshot is not None:
+            if self.stats.pending:
+                self.snapshot.commit()
+                logger.info("Crawl incomplete; removals are reported once it finishes")
+            else:
+                self._finish_snapshot()
+        self._report()
+        return self.stats
+
+    def _report(self) -> None:
+        logger.info(f"Crawl progress: {self.stats}")
+        if self.progress:
+            self.progress(self.stats)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line interface to run or resume a crawl.
+    """
+    from .api import api
+
+    parser = argparse.ArgumentParser(
+        prog="python -m pddiktipy.crawler",
+        description="Crawl PT -> prodi -> homebase into NDJSON files; rerun to resume."
+    )
+    parser.add_argument("output_dir", help="directory for NDJSON output and the journal")
+    parser.add_argument("keywords", nargs="*", help="search_pt keywords to start from")
+    parser.add_argument("--semester", required=True, help="academic semester, YYYYS")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--no-homebase", action="store_true", help="skip get_homebase_prodi")
+    parser.add_argument("--details", action="store_true", help="also fetch get_detail_pt/get_detail_prodi")
+    parser.add_argument("--snapshot", help="snapshot database; write only changes since the last crawl")
+    parser.add_argument("--progress-interval", type=float, default=10.0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    logging.getLogger("pddiktipy.api").setLevel(logging.CRITICAL)
+
+    snapshot = SnapshotStore(args.snapshot) if args.snapshot else None
+    with api(max_threads=args.workers) as client:
+        crawler = Crawler(client, args.output_dir, args.semester, max_workers=args.workers,
+                          homebase=not args.no_homebase, details=args.details, snapshot=snapshot,
+                          progress_interval=args.progress_interval)
+        try:
+            stats = crawler.run(args.keywords)
+        except KeyboardInterrupt:
+            print("Interrupted; run the same command again to resume")
+            return 130
+        finally:
+            if snapshot is not None:
+                snapshot.close()
+    print(f"Finished: {stats}; records {stats.records}")
+    if stats.changes is not None:
+        print(f"Changes: {stats.changes}")
+    return 0 if stats.failed == 0 else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
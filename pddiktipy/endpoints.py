@@ -0,0 +1,104 @@
+"""
+Helpers for classifying PDDIKTI endpoint URLs.
+
+Endpoints are grouped into families by the first path segment (``pencarian``,
+``detail``, ``pt``, ``prodi``, ``dosen``, ``visualisasi``, ...). Counter
+endpoints such as ``pt/count`` or ``dosen/count-active`` form their own
+``count`` family since they change rarely.
+
+For metrics and traces, paths are reduced to templates such as
+``pt/prodi/{id}/{tahun}`` so that every ID shares one label.
+"""
+from urllib.parse import quote, unquote, urlsplit
+
+
+def endpoint_path(endpoint: str, base_url: str = "") -> str:
+    """
+    Returns the API path of an endpoint URL without base URL or query string.
+
+    Args:
+        endpoint: Full endpoint URL
+        base_url: API root the endpoint was built from
+
+    Returns:
+        str: Path such as ``"pt/prodi/<id>/20241"``
+
+    Example:
+        >>> endpoint_path("https://host/pt/count", "https://host")
+        'pt/count'
+    """
+    if base_url and endpoint.startswith(base_url):
+        path = endpoint[len(base_url):]
+    else:
+        path = urlsplit(endpoint).path
+    return path.split("?", 1)[0].strip("/")
+
+
+def endpoint_family(path: str) -> str:
+    """
+    Returns the endpoint family of an API path.
+
+    Args:
+        path: API path as returned by ``endpoint_path``
+
+    Returns:
+        str: ``"count"`` for counter endpoints, otherwise the first path segment
+    """
+    segments = path.split("/")
+    if len(segments) == 2 and segments[1].startswith("count"):
+        return "count"
+    return segments[0]
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Replaces the parameter segments of an API path with placeholders.
+
+    The route is the first two segments (three for ``dosen/portofolio/*``);
+    the rest becomes ``{keyword}`` for ``pencarian/*``, and ``{id}``
+    followed by ``{tahun}`` for a second parameter otherwise.
+
+    Args:
+        path: API path as returned by ``endpoint_path``
+
+    Returns:
+        str: Template such as ``"pt/prodi/{id}/{tahun}"``
+
+    Example:
+        >>> endpoint_template("pt/prodi/abc-123/20241")
+        'pt/prodi/{id}/{tahun}'
+    """
+    segments = path.split("/")
+    depth = 3 if segments[:2] == ["dosen", "portofolio"] else 2
+    if len(segments) <= depth:
+        return path
+    if segments[0] == "pencarian":
+        # Keywords are not escaped and may themselves contain slashes
+        return "/".join(segments[:depth] + ["{keyword}"])
+    params = ["{id}"] + ["{tahun}"] * (len(segments) - depth - 1)
+    return "/".join(segments[:depth] + params)
+
+
+def normalize_endpoint(path: str) -> str:
+    """
+    Returns an API path with its search keyword normalized.
+
+    Keywords of ``pencarian/*`` paths are case-folded and their whitespace
+    collapsed, so searches differing only in case or spacing map to the same
+    path. Other paths are returned unchanged.
+
+    Args:
+        path: API path as returned by ``endpoint_path``
+
+    Returns:
+        str: Normalized path
+
+    Example:
+        >>> normalize_endpoint("pencarian/mhs/Ahmad%20%20Riski")
+        'pencarian/mhs/ahmad%20riski'
+    """
+    segments = path.split("/")
+    if segments[0] != "pencarian" or len(segments) <= 2:
+        return path
+    keyword = " ".join(unquote("/".join(segments[2:])).split()).casefold()
+    return "/".join(segments[:2] + [quote(keyword, safe="")])
@@ -34,3 +34,7 @@ class ValidationError(PDDIKTIError):
 class AuthenticationError(PDDIKTIError):
     """Raised when authentication fails."""
     pass
+
+class CircuitOpenError(PDDIKTIError):
+    """Raised when a circuit breaker rejects a call without contacting the API."""
+    pass
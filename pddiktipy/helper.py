@@ -2,18 +2,153 @@ import urllib.request as urllib
 import requests
 import base64
 import logging
+import threading
 import time
+from contextlib import contextmanager, nullcontext
 from requests.utils import requote_uri
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from typing import Optional, Union, Any
+from typing import Any, Dict, Iterator, Optional, Union
+from urllib.parse import urlsplit
+from .cache import BaseCache, CacheEntry, CachePolicy, MemoryCache, is_empty_result
+from .cassette import Cassette, CassetteAdapter
+from .circuit import CircuitBreaker, CircuitBreakers
+from .endpoints import endpoint_path, endpoint_template, normalize_endpoint
+from .images import CHUNK_SIZE, Destination, iter_base64, write_chunks
+from .jsondecode import JSONDecoder, get_decoder
+from .logostore import LogoRecord, LogoStore, logo_key
+from .metrics import MetricsRegistry, RequestSample
+from .ratelimit import RateLimiter
+from .result import capture_call, note_call, note_saved
+from .singleflight import SingleFlight
+from .tracing import Tracer
 from .exceptions import (
-    APIConnectionError, APITimeoutError, APIRateLimitError, 
-    APIResponseError, ValidationError
+    PDDIKTIError, APIConnectionError, APITimeoutError, APIRateLimitError, 
+    APIResponseError, CircuitOpenError, ValidationError
 )
 
+_NO_SPAN = nullcontext()
+
+
+class _LimitedRetry(Retry):
+    """Retry that leaves 429 (even with Retry-After) to the rate limiter."""
+    RETRY_AFTER_STATUS_CODES = frozenset({413, 503})
+
+
+def _merge_thread_stats(totals: Dict[str, dict], stats: dict) -> None:
+    """
+    Adds one thread's request counters to the totals of its thread name.
+    """
+    total = totals.get(stats["thread"])
+    if total is None:
+        totals[stats["thread"]] = dict(stats)
+        return
+    total["requests"] += stats["requests"]
+    total["errors"] += stats["errors"]
+    total["total_time"] += stats["total_time"]
+    total["max_time"] = max(total["max_time"], stats["max_time"])
+
+
 class helper:
-    def __init__(self):
+    IP_LOOKUP_URL = "https://api.ipify.org?format=json"
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0"
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 user_ip: Optional[str] = None,
+                 resolve_ip: bool = True,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 max_threads: Optional[int] = None,
+                 retries: int = 3,
+                 backoff_factor: float = 1.0,
+                 cache: Union[BaseCache, bool, None] = None,
+                 cache_policy: Optional[CachePolicy] = None,
+                 coalesce: bool = False,
+                 rate_limit: Union[RateLimiter, float, None] = None,
+                 circuit_breaker: Union[CircuitBreakers, bool, None] = None,
+                 metrics: Union[MetricsRegistry, bool, None] = None,
+                 tracer: Optional[Tracer] = None,
+                 cassette: Optional[Cassette] = None,
+                 json_decoder: Union[str, JSONDecoder, None] = "auto",
+                 logo_store: Optional[LogoStore] = None):
+        """
+        The helper is safe to share between threads: lazy session creation,
+        the IP cache and the header cache are guarded, and each thread's
+        request counters are kept separately (see ``thread_stats``).
+        
+        Args:
+            base_url: Optional API root overriding the default PDDIKTI endpoint,
+                e.g. a mirror or a local test server.
+            user_ip: Static value for the ``X-User-IP`` header. When given, the
+                public IP is never looked up.
+            resolve_ip: Look up the public IP in a background thread. When
+                False (and no ``user_ip``), or while replaying a cassette, the
+                built-in fallback IP is used.
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of connections kept per host
+            pool_block: Block when all pooled connections are busy instead of
+                opening a throwaway connection
+            max_threads: Shared-client mode for a pool of up to this many
+                threads; raises ``pool_maxsize`` to match and enables
+                ``pool_block`` so threads queue for a kept-alive connection
+            retries: Number of retries for connection errors and 429/5xx
+            backoff_factor: Exponential backoff factor between retries, in seconds
+            cache: Cache backend for JSON responses, keyed by endpoint URL.
+                ``True`` uses a default ``MemoryCache``; None disables caching.
+            cache_policy: Per-family TTLs; defaults to ``CachePolicy()``
+            coalesce: Let concurrent calls for the same endpoint URL share a
+                single upstream request and its parsed result
+            rate_limit: ``RateLimiter`` shared by all requests of this client,
+                or a number of requests per second for a default one. HTTP
+                429 is then retried through the limiter (honouring
+                ``Retry-After``) instead of by urllib3.
+            circuit_breaker: ``CircuitBreakers`` registry failing calls fast
+                per endpoint family once its error rate is too high.
+                ``True`` uses the default thresholds; None disables it.
+            metrics: ``MetricsRegistry`` recording count, latency, bytes,
+                retries and errors per endpoint template. ``True`` creates
+                one; None disables metrics.
+            tracer: ``Tracer`` receiving spans for each call and its phases
+                (see ``pddiktipy.tracing``); None disables tracing.
+            cassette: ``Cassette`` recording every HTTP exchange to a file,
+                or replaying recorded exchanges without network access
+                (see ``pddiktipy.cassette``)
+            json_decoder: JSON backend for response bodies: ``"auto"`` (the
+                fastest installed of orjson/simdjson, else the standard
+                library), a backend name, or a callable taking ``bytes``
+                (see ``pddiktipy.jsondecode``)
+            logo_store: ``LogoStore`` keeping downloaded logos on disk and
+                serving repeats from there (see ``pddiktipy.logostore``)
+        """
+        if max_threads is not None:
+            if max_threads < 1:
+                raise ValidationError("max_threads must be at least 1")
+            pool_maxsize = max(pool_maxsize, max_threads)
+            pool_block = True
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.cache: Optional[BaseCache] = MemoryCache() if cache is True else (cache or None)
+        self.cache_policy = cache_policy or CachePolicy()
+        self.singleflight = SingleFlight() if coalesce else None
+        self.rate_limiter = (rate_limit if isinstance(rate_limit, RateLimiter) or rate_limit is None
+                             else RateLimiter(rate=rate_limit))
+        self.circuit_breaker: Optional[CircuitBreakers] = (
+            CircuitBreakers() if circuit_breaker is True else (circuit_breaker or None))
+        self.metrics: Optional[MetricsRegistry] = (
+            MetricsRegistry() if metrics is True else (metrics or None))
+        self.tracer = tracer
+        self.cassette = cassette
+        self.json_decoder: JSONDecoder = get_decoder(json_decoder)
+        self.logo_store = logo_store
+        
+        self.base_url = base_url.rstrip("/") if base_url else None
         self.url = "aHR0cHM6Ly9hcGktcGRkaWt0aS5rZW1kaWt0aXNhaW50ZWsuZ28uaWQ="
         self.host = "YXBpLXBkZGlrdGkua2VtZGlrdGlzYWludGVrLmdvLmlk"
         self.origin = "aHR0cHM6Ly9wZGRpa3RpLmtlbWRpa3Rpc2FpbnRlay5nby5pZA=="
@@ -22,46 +157,140 @@ class helper:
         
         # Initialize session with retry strategy
         self._session = None
-        self._cached_ip = None
+        self._session_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread_stats = {}  # thread ident -> counters of the live thread holding it
+        self._retired_stats = {}  # thread name -> counters of finished threads
+        self._local = threading.local()
+        self._cached_ip = user_ip
         self._ip_cache_time = 0
         self._ip_cache_duration = 3600  # Cache IP for 1 hour
+        self._ip_lock = threading.Lock()
+        self._ip_refreshing = False
+        # A replayed cassette must not reach the network, not even for the IP
+        self._resolve_ip = resolve_ip and not user_ip and not (cassette is not None and cassette.replaying)
+        self._refreshes: Dict[str, Any] = {}  # endpoint -> background refresh in progress
+        self._refresh_lock = threading.Lock()
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
         
+        # Static headers and the API root are decoded once per client; only X-User-IP varies
+        self._base_headers = self._build_base_headers()
+        self._endpoint = self.base_url or self.decodes(self.url)
+        self._headers = None  # (ip, headers) swapped atomically
+        
+        if self._resolve_ip:
+            self.refresh_ip()
+        elif not self._cached_ip:
+            self._cached_ip = self.decodes(self.ip)
+        
     @property
     def session(self) -> requests.Session:
-        """Lazy initialization of requests session with retry strategy"""
-        if self._session is None:
-            self._session = requests.Session()
-            
-            # Retry strategy
-            retry_strategy = Retry(
-                total=3,
-                backoff_factor=1,
-                status_forcelist=[429, 500, 502, 503, 504],
-                allowed_methods=["HEAD", "GET", "OPTIONS"]
-            )
-            
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            self._session.mount("http://", adapter)
-            self._session.mount("https://", adapter)
-            
-        return self._session
+        """Lazy, thread-safe initialization of requests session with retry strategy"""
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+                session = self._session
+        return session
+
+    def _create_session(self) -> requests.Session:
+        """
+        Creates a session whose adapter uses the configured pool and retries.
+        """
+        session = requests.Session()
+        
+        # Retry strategy
+        retry_class = Retry if self.rate_limiter is None else _LimitedRetry
+        retry_strategy = retry_class(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=list(self.retry_statuses()),
+            allowed_methods=["HEAD", "GET", "OPTIONS"],
+            # Return the last response so its status code reaches the caller
+            raise_on_status=False
+        )
+        
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=retry_strategy
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if self.cassette is not None:
+            # Only API traffic is recorded; the public IP lookup stays out of the file
+            session.mount(f"{self.endpoint()}/", CassetteAdapter(self.cassette, adapter))
+        return session
+        
+    def retry_statuses(self) -> tuple:
+        """
+        Status codes retried by the transport; 429 is left to the rate limiter.
+        """
+        if self.rate_limiter is None:
+            return self.RETRY_STATUSES
+        return tuple(status for status in self.RETRY_STATUSES if status != 429)
+
+    def _get(self, url: str, headers: dict, timeout: int, stream: bool = False) -> requests.Response:
+        """
+        Sends a GET through the rate limiter, if one is configured.
         
+        A 429 slows the limiter down, pauses it for ``Retry-After`` and is
+        retried up to ``rate_limiter.max_retries`` times; the last 429
+        response is returned to the caller. The final status, the number of
+        requests sent (urllib3 retries included) and the body bytes are
+        reported to ``result.capture_call``. With ``stream`` the body is left
+        unread and its size is taken from ``Content-Length``.
+        """
+        limiter = self.rate_limiter
+        status, attempts, size, throttled = None, 0, 0, 0
+        try:
+            while True:
+                if limiter is not None:
+                    limiter.acquire()
+                try:
+                    response = self.session.get(url, headers=headers, timeout=timeout, stream=stream)
+                except requests.RequestException:
+                    attempts += self.retries + 1
+                    raise
+                status = response.status_code
+                size += int(response.headers.get('Content-Length') or 0) if stream else len(response.content)
+                retries = getattr(response.raw, 'retries', None)
+                attempts += 1 + (len(retries.history) if retries is not None else 0)
+                if limiter is None:
+                    return response
+                if response.status_code != 429:
+                    limiter.on_success()
+                    return response
+                pause = limiter.on_throttle(response.headers.get('Retry-After'))
+                if throttled >= limiter.max_retries:
+                    return response
+                response.close()
+                throttled += 1
+                self.logger.debug(f"Throttled, retrying in {pause:.1f}s ({throttled}/{limiter.max_retries}): {url}")
+        finally:
+            note_call(status, attempts, size)
+
     def get_ip(self) -> Optional[str]:
         """
         Retrieves the public IP address with caching and better error handling.
+        
+        This call blocks while the IP is looked up; request headers use
+        ``current_ip()`` instead, which never waits on the network.
         """
         current_time = time.time()
         
         # Return cached IP if still valid
         if (self._cached_ip and 
-            current_time - self._ip_cache_time < self._ip_cache_duration):
+            (not self._resolve_ip or
+             current_time - self._ip_cache_time < self._ip_cache_duration)):
             return self._cached_ip
             
         try:
-            response = requests.get("https://api.ipify.org?format=json", timeout=10)
+            response = self.session.get(self.IP_LOOKUP_URL, timeout=10)
             response.raise_for_status()
             ip = response.json().get("ip")
             
@@ -69,8 +298,9 @@ class helper:
                 raise APIResponseError("No IP returned from ipify service")
             
             # Cache the IP
-            self._cached_ip = ip
-            self._ip_cache_time = current_time
+            with self._ip_lock:
+                self._cached_ip = ip
+                self._ip_cache_time = current_time
             self.logger.debug(f"IP address retrieved and cached: {ip}")
             return ip
             
@@ -89,11 +319,47 @@ class helper:
             fallback_ip = self.decodes(self.ip)
             return self._cached_ip or fallback_ip
 
-    def get_headers(self) -> dict:
+    def refresh_ip(self) -> None:
         """
-        Returns a single header dictionary for requests.
+        Looks up the public IP in a background thread.
+        
+        At most one lookup runs at a time; further calls while it is in
+        flight are ignored.
         """
-        return {
+        with self._ip_lock:
+            if self._ip_refreshing:
+                return
+            self._ip_refreshing = True
+        
+        def worker() -> None:
+            try:
+                self.get_ip()
+            finally:
+                with self._ip_lock:
+                    self._ip_refreshing = False
+                    # Back off on failure instead of retrying on every request
+                    self._ip_cache_time = max(self._ip_cache_time,
+                                              time.time() - self._ip_cache_duration + 60)
+        
+        threading.Thread(target=worker, name="pddikti-ip-refresh", daemon=True).start()
+
+    def current_ip(self) -> str:
+        """
+        Returns the IP for the ``X-User-IP`` header without blocking.
+        
+        Falls back to the built-in IP until the first background lookup
+        completes, and schedules a refresh once the cached value expires.
+        """
+        if (self._resolve_ip and
+            time.time() - self._ip_cache_time >= self._ip_cache_duration):
+            self.refresh_ip()
+        return self._cached_ip or self.decodes(self.ip)
+
+    def _build_base_headers(self) -> dict:
+        """
+        Builds the static part of the request headers.
+        """
+        headers = {
             "Accept": "application/json, text/plain, */*",
             "Accept-Encoding": "gzip, deflate, br, zstd",
             "Accept-Language": "en-US,en;q=0.9,mt;q=0.8",
@@ -105,12 +371,123 @@ class helper:
             "Sec-Fetch-Dest": "empty",
             "Sec-Fetch-Mode": "cors",
             "Sec-Fetch-Site": "same-site",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0",
-            "X-User-IP": self.get_ip(),
+            "User-Agent": self.USER_AGENT,
             "sec-ch-ua": '"Microsoft Edge";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
             "sec-ch-ua-mobile": "?0",
             "sec-ch-ua-platform": '"Windows"'
         }
+        if self.base_url:
+            # Let the HTTP client derive Host from the configured base URL
+            del headers["Host"]
+        return headers
+
+    def get_headers(self) -> dict:
+        """
+        Returns a single header dictionary for requests.
+        
+        The dictionary is built once and reused until the resolved IP
+        changes, so callers must not mutate it.
+        """
+        ip = self.current_ip()
+        cached = self._headers
+        if cached is not None and cached[0] == ip:
+            return cached[1]
+        headers = dict(self._base_headers)
+        headers["X-User-IP"] = ip
+        self._headers = (ip, headers)
+        return headers
+
+    def _record_request(self, started: float, failed: bool = False) -> None:
+        """
+        Adds one request to the calling thread's counters.
+        
+        Args:
+            started: ``time.perf_counter()`` value taken before the request
+            failed: Whether the request raised an error
+        """
+        stats = getattr(self._local, "stats", None)
+        if stats is None:
+            stats = {"thread": threading.current_thread().name,
+                     "requests": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0}
+            self._local.stats = stats
+            ident = threading.get_ident()
+            with self._stats_lock:
+                # Idents are only unique among live threads; keep the counts of a finished one
+                previous = self._thread_stats.get(ident)
+                if previous is not None:
+                    _merge_thread_stats(self._retired_stats, previous)
+                self._thread_stats[ident] = stats
+        elapsed = time.perf_counter() - started
+        stats["requests"] += 1
+        stats["errors"] += failed
+        stats["total_time"] += elapsed
+        if elapsed > stats["max_time"]:
+            stats["max_time"] = elapsed
+
+    def thread_stats(self) -> dict:
+        """
+        Returns per-thread request counters.
+        
+        Threads sharing a name, such as the workers of successive executors,
+        are reported together.
+        
+        Returns:
+            dict: ``{thread_name: {"requests", "errors", "total_time",
+            "max_time", "avg_time"}}`` with times in seconds
+        """
+        snapshot: Dict[str, dict] = {}
+        with self._stats_lock:
+            for stats in list(self._retired_stats.values()) + list(self._thread_stats.values()):
+                _merge_thread_stats(snapshot, stats)
+        for stats in snapshot.values():
+            del stats["thread"]
+            stats["avg_time"] = stats["total_time"] / stats["requests"] if stats["requests"] else 0.0
+        return snapshot
+
+    def _raise_for_status(self, status_code: int, headers: Any, endpoint: str) -> None:
+        """
+        Maps HTTP error status codes to the library exceptions.
+        
+        Args:
+            status_code: HTTP status code of the response
+            headers: Response headers (case-insensitive mapping)
+            endpoint: The API endpoint URL, attached to the exception
+            
+        Raises:
+            APIRateLimitError: For HTTP 429
+            APIResponseError: For 401, 403, 404 and 5xx responses
+        """
+        if status_code == 429:
+            retry_after = headers.get('Retry-After', '60')
+            raise APIRateLimitError(
+                f"Rate limit exceeded. Retry after {retry_after} seconds",
+                status_code=429,
+                endpoint=endpoint
+            )
+        elif status_code == 401:
+            raise APIResponseError(
+                "Authentication failed",
+                status_code=401,
+                endpoint=endpoint
+            )
+        elif status_code == 403:
+            raise APIResponseError(
+                "Access forbidden",
+                status_code=403,
+                endpoint=endpoint
+            )
+        elif status_code == 404:
+            raise APIResponseError(
+                "Endpoint not found",
+                status_code=404,
+                endpoint=endpoint
+            )
+        elif 500 <= status_code < 600:
+            raise APIResponseError(
+                f"Server error: {status_code}",
+                status_code=status_code,
+                endpoint=endpoint
+            )
 
     def response(self, endpoint: str, timeout: int = 30) -> Optional[dict]:
         """
@@ -132,51 +509,369 @@ class helper:
         if not endpoint:
             raise ValidationError("Endpoint cannot be empty")
             
-        headers = self.get_headers()
+        if self.tracer is not None:
+            with self._request_span(endpoint) as attributes:
+                return self._response(endpoint, timeout, attributes)
+        return self._response(endpoint, timeout)
+
+    def _response(self, endpoint: str, timeout: int, attributes: Optional[dict] = None) -> Optional[dict]:
+        """
+        Serves ``response()`` from the cache or fetches the endpoint.
+        Expired entries are served according to the policy's
+        stale-while-revalidate and stale-if-error windows.
+        """
+        entry = self._cache_lookup(endpoint, timeout)
+        if attributes is not None:
+            attributes["pddikti.cache_hit"] = entry is not None
+        if entry is not None:
+            return self._cached_value(endpoint, entry)
+            
+        try:
+            return self._fetch_shared(endpoint, timeout)
+        except PDDIKTIError as e:
+            entry = self._stale_if_error(endpoint, e)
+            if entry is None:
+                raise
+            return entry.value
+
+    def _fetch_shared(self, endpoint: str, timeout: int) -> Optional[dict]:
+        """
+        Fetches an endpoint, sharing the request with concurrent callers when
+        coalescing is enabled.
+        """
+        if self.singleflight is not None:
+            return self.singleflight.do(endpoint, lambda: self._fetch(endpoint, timeout))
+        return self._fetch(endpoint, timeout)
+
+    def _refresh_in_background(self, endpoint: str, timeout: int) -> None:
+        """
+        Refreshes a stale cache entry in a background thread.
+        
+        At most one refresh per endpoint runs at a time; further calls while
+        it is in flight are ignored.
+        """
+        with self._refresh_lock:
+            if endpoint in self._refreshes:
+                return
+            thread = threading.Thread(target=self._refresh, args=(endpoint, timeout),
+                                      name="pddikti-cache-refresh", daemon=True)
+            self._refreshes[endpoint] = thread
+        thread.start()
+
+    def _refresh(self, endpoint: str, timeout: int) -> None:
+        try:
+            self._fetch_shared(endpoint, timeout)
+        except Exception as e:
+            # The stale entry keeps being served until its window ends
+            self.logger.warning(f"Background refresh of {endpoint} failed: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshes.pop(endpoint, None)
+
+    def wait_for_refreshes(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the background cache refreshes in progress to finish.
+        
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely
+            
+        Returns:
+            bool: True if no refresh is left running
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._refresh_lock:
+                threads = list(self._refreshes.values())
+            if not threads:
+                return True
+            for thread in threads:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                thread.join(remaining)
+
+    @contextmanager
+    def _request_span(self, endpoint: str) -> Iterator[dict]:
+        """
+        Traces one ``response()`` call with its endpoint and HTTP outcome.
+        """
+        template = endpoint_template(endpoint_path(endpoint, self.endpoint()))
+        with self.tracer.span("pddikti.request", {"pddikti.endpoint": template}) as attributes:
+            with capture_call() as info:
+                try:
+                    yield attributes
+                finally:
+                    attributes.update({
+                        "http.status_code": info["status_code"],
+                        "pddikti.response_bytes": info["size"],
+                        "pddikti.attempts": info["attempts"],
+                    })
+
+    def _span(self, name: str) -> Any:
+        """
+        Returns a tracer span for a request phase, or a no-op context.
+        """
+        return self.tracer.span(name) if self.tracer is not None else _NO_SPAN
+
+    def _fetch(self, endpoint: str, timeout: int) -> Optional[dict]:
+        """
+        Requests an endpoint, records thread stats and metrics, and caches the result.
+        An expired cache entry with validators is revalidated conditionally.
+        """
+        breaker = self._breaker_for(endpoint)
+        probe = breaker.before_call(endpoint) if breaker is not None else False
+        stale = self._cache_stale(endpoint)
+        started = time.perf_counter()
+        with capture_call() as info:
+            try:
+                entry = self._get_json(endpoint, timeout, stale)
+            except PDDIKTIError as e:
+                self._cache_not_found(endpoint, e)
+                self._record_request(started, failed=True)
+                self._observe(endpoint, started, info, e)
+                if breaker is not None:
+                    breaker.record(e, probe)
+                raise
+            except BaseException:
+                if breaker is not None:
+                    breaker.release(probe)
+                raise
+        self._record_request(started)
+        self._observe(endpoint, started, info)
+        if breaker is not None:
+            breaker.record(None, probe)
+        self._cache_set(endpoint, entry)
+        return entry.value
+
+    def _observe(self,
+                 endpoint: str,
+                 started: float,
+                 info: dict,
+                 error: Optional[BaseException] = None) -> None:
+        """
+        Records a finished request in the metrics registry, if enabled.
+        """
+        if self.metrics is None:
+            return
+        self.metrics.observe(RequestSample(
+            endpoint=endpoint_template(endpoint_path(endpoint, self.endpoint())),
+            latency=time.perf_counter() - started,
+            status_code=info["status_code"] or getattr(error, 'status_code', None),
+            size=info["size"],
+            retries=max(0, info["attempts"] - 1),
+            error_type=type(error).__name__ if error is not None else None,
+            saved_bytes=info["saved"],
+        ))
+
+    @contextmanager
+    def _observe_image(self, url: str) -> Iterator[None]:
+        """
+        Records an image request in the metrics registry, like ``_fetch``
+        does for API calls. Streamed images are measured until their status
+        is checked; ``logo_store`` hits count their size as saved bytes.
+        """
+        started = time.perf_counter()
+        with capture_call() as info:
+            try:
+                yield
+            except BaseException as e:
+                self._observe(url, started, info, e)
+                raise
+        self._observe(url, started, info)
+
+    def _breaker_for(self, endpoint: str) -> Optional[CircuitBreaker]:
+        """
+        Returns the circuit breaker guarding an endpoint, if enabled.
+        """
+        if self.circuit_breaker is None:
+            return None
+        return self.circuit_breaker.for_path(endpoint_path(endpoint, self.endpoint()))
+
+    def _cache_get(self, endpoint: str) -> Optional[CacheEntry]:
+        """
+        Returns the fresh cache entry for an endpoint, if caching is enabled.
+        """
+        if self.cache is None:
+            return None
+        entry = self.cache.get(endpoint)
+        if entry is not None:
+            self.logger.debug(f"Cache hit: {endpoint}")
+        return entry
+
+    def _cache_lookup(self, endpoint: str, timeout: int) -> Optional[CacheEntry]:
+        """
+        Returns the entry answering ``response()`` without waiting for a
+        request: a fresh entry, a cached negative result, or a stale entry
+        whose background refresh it schedules.
+        """
+        entry = self._cache_get(endpoint)
+        if entry is None:
+            entry = self._cache_get_negative(endpoint)
+        if entry is None:
+            entry = self._stale_while_revalidate(endpoint)
+            if entry is not None:
+                self._refresh_in_background(endpoint, timeout)
+        return entry
+
+    def _cached_value(self, endpoint: str, entry: CacheEntry) -> Optional[dict]:
+        """
+        Returns the value of a cache entry, re-raising a cached ``404``.
+        """
+        if entry.status != 200:
+            self._raise_for_status(entry.status, {}, endpoint)
+        return entry.value
+
+    def _negative_key(self, endpoint: str) -> str:
+        """
+        Cache key of an endpoint's negative result, see ``normalize_endpoint``.
+        The query string (e.g. ``?semester=``) is kept as is.
+        """
+        base = self.endpoint()
+        query = urlsplit(endpoint).query
+        return f"negative:{base}/{normalize_endpoint(endpoint_path(endpoint, base))}" + (f"?{query}" if query else "")
+
+    def _cache_get_negative(self, endpoint: str) -> Optional[CacheEntry]:
+        """
+        Returns the cached ``404`` or empty result of an endpoint, if any.
+        The lookup goes through ``get_stale`` so that a miss, already counted
+        by ``_cache_get``, is not counted twice in the cache statistics.
+        """
+        if self.cache is None or self.cache_policy.negative_ttl_for(endpoint_path(endpoint, self.endpoint())) <= 0:
+            return None
+        entry = self.cache.get_stale(self._negative_key(endpoint))
+        if entry is None or entry.expired:
+            return None
+        self.logger.debug(f"Negative cache hit: {endpoint}")
+        return entry
+
+    def _cache_negative(self, endpoint: str, entry: CacheEntry) -> None:
+        """
+        Stores a ``404`` or empty result for the policy's negative TTL.
+        """
+        ttl = self.cache_policy.negative_ttl_for(endpoint_path(endpoint, self.endpoint()))
+        if ttl > 0:
+            entry.expires_at = time.time() + ttl
+            self.cache.set(self._negative_key(endpoint), entry)
+
+    def _cache_not_found(self, endpoint: str, error: PDDIKTIError) -> None:
+        """
+        Caches a ``404`` answer as a negative result.
+        """
+        if self.cache is not None and error.status_code == 404:
+            self._cache_negative(endpoint, CacheEntry(None, 0.0, status=404))
+
+    def _cache_stale(self, endpoint: str) -> Optional[CacheEntry]:
+        """
+        Returns the expired cache entry of an endpoint if it can be
+        revalidated with a conditional request.
+        """
+        if self.cache is None:
+            return None
+        entry = self.cache.get_stale(endpoint)
+        return entry if entry is not None and entry.revalidatable else None
+
+    def _stale_within(self, endpoint: str, window: float) -> Optional[CacheEntry]:
+        """
+        Returns the cache entry of an endpoint if it expired less than
+        ``window`` seconds ago.
+        """
+        if self.cache is None or window <= 0:
+            return None
+        entry = self.cache.get_stale(endpoint)
+        if entry is None or time.time() - entry.expires_at >= window:
+            return None
+        return entry
+
+    def _stale_while_revalidate(self, endpoint: str) -> Optional[CacheEntry]:
+        """
+        Returns an expired entry that may be served while it is refreshed.
+        """
+        if self.cache is None:
+            return None
+        window = self.cache_policy.stale_while_revalidate_for(endpoint_path(endpoint, self.endpoint()))
+        entry = self._stale_within(endpoint, window)
+        if entry is not None:
+            self.logger.debug(f"Serving stale while revalidating: {endpoint}")
+        return entry
+
+    def _stale_if_error(self, endpoint: str, error: PDDIKTIError) -> Optional[CacheEntry]:
+        """
+        Returns an expired entry standing in for a failed request, if the
+        failure is upstream's (unreachable, timeout, throttling, circuit
+        open or 5xx) and the policy's stale-if-error window allows it.
+        """
+        if self.cache is None:
+            return None
+        upstream = isinstance(error, (APIConnectionError, APITimeoutError, APIRateLimitError, CircuitOpenError)) or (
+            isinstance(error, APIResponseError) and (error.status_code is None or error.status_code >= 500))
+        if not upstream:
+            return None
+        window = self.cache_policy.stale_if_error_for(endpoint_path(endpoint, self.endpoint()))
+        entry = self._stale_within(endpoint, window)
+        if entry is not None:
+            self.logger.warning(f"Serving stale response for {endpoint} after error: {error}")
+        return entry
+
+    def _cache_set(self, endpoint: str, entry: CacheEntry) -> None:
+        """
+        Stores a decoded response according to the cache policy; with
+        negative caching enabled, empty results are stored as negative ones.
+        """
+        if self.cache is None:
+            return
+        path = endpoint_path(endpoint, self.endpoint())
+        if is_empty_result(entry.value) and self.cache_policy.negative_ttl_for(path) > 0:
+            self._cache_negative(endpoint, entry)
+            return
+        ttl = self.cache_policy.ttl_for(path)
+        if ttl > 0:
+            entry.expires_at = time.time() + ttl
+            entry.stale_until = entry.expires_at + max(self.cache_policy.stale_while_revalidate_for(path),
+                                                       self.cache_policy.stale_if_error_for(path))
+            self.cache.set(endpoint, entry)
+
+    def _not_modified(self, endpoint: str, stale: CacheEntry, headers: Any) -> CacheEntry:
+        """
+        Handles a ``304`` answer to a conditional request: the stale entry
+        is reused and its body size counted as saved.
+        """
+        self.logger.debug(f"Not modified: {endpoint}")
+        note_saved(stale.size)
+        return stale.revalidated(headers)
+
+    def _get_json(self, endpoint: str, timeout: int, stale: Optional[CacheEntry] = None) -> CacheEntry:
+        """
+        Performs the HTTP exchange for ``response()`` and decodes the body.
+        With a ``stale`` entry the request is conditional, and a ``304``
+        returns that entry refreshed.
+
+        Returns:
+            CacheEntry: The decoded response with its validators; the caller
+            sets ``expires_at``
+        """
+        with self._span("pddikti.headers"):
+            headers = self.get_headers()
+            if stale is not None:
+                headers = dict(headers, **stale.conditional_headers())
         
         try:
             self.logger.debug(f"Making request to: {endpoint}")
-            response = self.session.get(endpoint, headers=headers, timeout=timeout)
+            with self._span("pddikti.http"):
+                response = self._get(endpoint, headers, timeout)
             
-            # Handle different HTTP status codes
-            if response.status_code == 429:
-                retry_after = response.headers.get('Retry-After', '60')
-                raise APIRateLimitError(
-                    f"Rate limit exceeded. Retry after {retry_after} seconds",
-                    status_code=429,
-                    endpoint=endpoint
-                )
-            elif response.status_code == 401:
-                raise APIResponseError(
-                    "Authentication failed",
-                    status_code=401,
-                    endpoint=endpoint
-                )
-            elif response.status_code == 403:
-                raise APIResponseError(
-                    "Access forbidden",
-                    status_code=403,
-                    endpoint=endpoint
-                )
-            elif response.status_code == 404:
-                raise APIResponseError(
-                    "Endpoint not found",
-                    status_code=404,
-                    endpoint=endpoint
-                )
-            elif 500 <= response.status_code < 600:
-                raise APIResponseError(
-                    f"Server error: {response.status_code}",
-                    status_code=response.status_code,
-                    endpoint=endpoint
-                )
+            if stale is not None and response.status_code == 304:
+                return self._not_modified(endpoint, stale, response.headers)
+            
+            self._raise_for_status(response.status_code, response.headers, endpoint)
             
             response.raise_for_status()
             
             try:
-                json_data = response.json()
+                with self._span("pddikti.decode"):
+                    json_data = self.json_decoder(response.content)
                 self.logger.debug(f"Successful response from: {endpoint}")
-                return json_data
+                return CacheEntry(json_data, 0.0, response.headers.get('ETag'),
+                                  response.headers.get('Last-Modified'), len(response.content))
             except ValueError as e:
                 raise APIResponseError(
                     f"Invalid JSON response: {str(e)}",
@@ -184,6 +879,8 @@ class helper:
                     endpoint=endpoint
                 )
                 
+        except PDDIKTIError:
+            raise
         except requests.Timeout:
             raise APITimeoutError(
                 f"Request timeout after {timeout} seconds",
@@ -236,20 +933,165 @@ class helper:
         """
         if not url:
             raise ValidationError("Image URL cannot be empty")
-            
+        with self._observe_image(url):
+            if self.logo_store is not None:
+                with self.logo_store.open(self._stored_logo(url, timeout)) as data:
+                    return self.base64_encode_image(data)
+
+            headers = self.get_headers()
+            started = time.perf_counter()
+            failed = True
+            try:
+                with self._image_errors(url, timeout):
+                    self.logger.debug(f"Fetching image from: {url}")
+                    response = self._get(url, headers, timeout)
+                    response.raise_for_status()
+                    self._check_image_type(response.headers)
+                    encoded = self.base64_encode_image(response.content)
+                failed = False
+                return encoded
+            finally:
+                self._record_request(started, failed)
+
+    def stream_image(self,
+                     url: str,
+                     dest: Optional[Destination] = None,
+                     encode_base64: bool = False,
+                     chunk_size: int = CHUNK_SIZE,
+                     timeout: int = 30) -> Union[Iterator[bytes], int]:
+        """
+        Fetches an image in chunks instead of buffering it whole.
+
+        The request is sent and its status checked before this returns, so
+        HTTP and connection errors are raised here; errors while reading the
+        body are raised from the iteration. An iterator that is not consumed
+        to the end should be closed to release its connection.
+
+        Args:
+            url (str): URL of the image.
+            dest: File path, binary file object or socket to write the image
+                to; None returns an iterator of chunks instead.
+            encode_base64 (bool): Produce base64 instead of raw bytes, encoded
+                chunk by chunk.
+            chunk_size (int): Bytes read per chunk.
+            timeout (int): Request timeout in seconds.
+
+        Returns:
+            Union[Iterator[bytes], int]: Chunk iterator, or the number of bytes
+            written to ``dest``.
+
+        Raises:
+            APIConnectionError: For connection issues
+            APITimeoutError: For timeout issues
+            ValidationError: For invalid input
+        """
+        if not url:
+            raise ValidationError("Image URL cannot be empty")
+        if chunk_size < 1:
+            raise ValidationError("chunk_size must be at least 1")
+
+        with self._observe_image(url):
+            if self.logo_store is not None:
+                chunks = self.logo_store.iter_chunks(self._stored_logo(url, timeout), chunk_size)
+            else:
+                chunks = self._open_image(url, chunk_size, timeout)
+        if encode_base64:
+            chunks = iter_base64(chunks)
+        if dest is None:
+            return chunks
+        return write_chunks(chunks, dest)
+
+    def _open_image(self, url: str, chunk_size: int, timeout: int) -> Iterator[bytes]:
+        """
+        Sends a streamed image request and checks its status; returns the
+        body as a chunk iterator.
+        """
         headers = self.get_headers()
+        started = time.perf_counter()
+        failed = True
         try:
-            self.logger.debug(f"Fetching image from: {url}")
-            response = self.session.get(url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-            
-            # Validate content type
-            content_type = response.headers.get('content-type', '')
-            if not content_type.startswith('image/'):
-                self.logger.warning(f"Unexpected content type: {content_type}")
-            
-            return self.base64_encode_image(response.content)
-            
+            with self._image_errors(url, timeout):
+                self.logger.debug(f"Streaming image from: {url}")
+                response = self._get(url, headers, timeout, stream=True)
+                try:
+                    response.raise_for_status()
+                except requests.HTTPError:
+                    response.close()
+                    raise
+                self._check_image_type(response.headers)
+            failed = False
+        finally:
+            self._record_request(started, failed)
+        return self._iter_image(response, url, chunk_size, timeout)
+
+    def _stored_logo(self, url: str, timeout: int) -> LogoRecord:
+        """
+        Returns the ``logo_store`` copy of an image, downloading it first, or
+        revalidating it with a conditional GET once it is past ``max_age``.
+        """
+        store = self.logo_store
+        key = logo_key(url)
+        record = store.get(key)
+        if record is not None and store.is_fresh(record):
+            store.count("hits")
+            note_saved(record.size)
+            return record
+
+        headers = self.get_headers()
+        if record is not None:
+            headers = dict(headers, **store.conditional_headers(record))
+        started = time.perf_counter()
+        failed = True
+        try:
+            with self._image_errors(url, timeout):
+                self.logger.debug(f"Fetching image into the logo store: {url}")
+                response = self._get(url, headers, timeout, stream=True)
+                try:
+                    if record is not None and response.status_code == 304:
+                        store.count("revalidated")
+                        note_saved(record.size)
+                        record = store.touch(record, response.headers)
+                    else:
+                        response.raise_for_status()
+                        self._check_image_type(response.headers)
+                        with store.writer() as writer:
+                            for chunk in response.iter_content(CHUNK_SIZE):
+                                writer.write(chunk)
+                            record = writer.commit(key, response.headers)
+                        store.count("downloads")
+                finally:
+                    response.close()
+            failed = False
+            return record
+        finally:
+            self._record_request(started, failed)
+
+    def _iter_image(self, response: requests.Response, url: str, chunk_size: int, timeout: int) -> Iterator[bytes]:
+        """
+        Yields the body of a streamed response, then releases its connection.
+        """
+        try:
+            with self._image_errors(url, timeout):
+                for chunk in response.iter_content(chunk_size):
+                    if chunk:
+                        yield chunk
+        finally:
+            response.close()
+
+    def _check_image_type(self, headers: Any) -> None:
+        content_type = headers.get('content-type', '')
+        if not content_type.startswith('image/'):
+            self.logger.warning(f"Unexpected content type: {content_type}")
+
+    @contextmanager
+    def _image_errors(self, url: str, timeout: int) -> Iterator[None]:
+        """
+        Converts ``requests`` errors of an image download into API exceptions.
+        """
+        try:
+            yield
+        except PDDIKTIError:
+            raise
         except requests.Timeout:
             raise APITimeoutError(
                 f"Image request timeout after {timeout} seconds",
@@ -309,9 +1151,10 @@ class helper:
         """
         Close the session to free resources.
         """
-        if self._session:
-            self._session.close()
-            self._session = None
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session:
+            session.close()
             self.logger.debug("Session closed successfully")
     
     def decodes(self, string: str) -> str:
@@ -322,9 +1165,10 @@ class helper:
 
     def endpoint(self) -> str:
         """
-        Decodes the URL stored in the class.
+        Returns the API root: ``base_url`` if set, else the built-in URL,
+        decoded once at construction.
         """
-        return self.decodes(self.url)
+        return self._endpoint
 
     def with_version(self, version: str) -> str:
         """
@@ -0,0 +1,108 @@
+"""
+Chunked handling of image downloads (``stream_logo_pt``/``stream_logo_prodi``).
+
+``get_logo_pt`` holds an image three times over: the response body, its
+base64 encoding and the decoded ``str``. The streaming methods instead pass
+the body on in chunks of ``chunk_size`` bytes, so memory stays bounded by
+the chunk size whatever the image size:
+
+- ``iter_base64`` encodes a stream of chunks incrementally; concatenated,
+  its output equals ``base64.b64encode`` of the whole body
+- ``write_chunks`` writes a stream to a file path, a binary file object
+  or a socket
+- ``aiter_base64`` and ``awrite_chunks`` are the asyncio counterparts,
+  also accepting an ``asyncio.StreamWriter``
+"""
+import base64
+import os
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Union
+
+CHUNK_SIZE = 64 * 1024
+
+Destination = Union[str, "os.PathLike[str]", Any]
+
+
+def _split(pending: bytes, chunk: bytes) -> "tuple":
+    """Returns ``(encodable, remainder)``; the encodable part is a multiple of 3 bytes."""
+    data = pending + chunk if pending else chunk
+    cut = len(data) - len(data) % 3
+    return data[:cut], data[cut:]
+
+
+def iter_base64(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Base64-encodes a stream of byte chunks.
+
+    Args:
+        chunks: Raw byte chunks
+
+    Yields:
+        bytes: ASCII base64 chunks; padding only appears in the last one
+    """
+    pending = b""
+    for chunk in chunks:
+        encodable, pending = _split(pending, chunk)
+        if encodable:
+            yield base64.b64encode(encodable)
+    if pending:
+        yield base64.b64encode(pending)
+
+
+async def aiter_base64(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Asyncio counterpart of ``iter_base64``."""
+    pending = b""
+    async for chunk in chunks:
+        encodable, pending = _split(pending, chunk)
+        if encodable:
+            yield base64.b64encode(encodable)
+    if pending:
+        yield base64.b64encode(pending)
+
+
+def _writer(dest: Any) -> Any:
+    """The method writing one chunk to ``dest``: ``write`` or, for sockets, ``sendall``."""
+    write = getattr(dest, "write", None) or getattr(dest, "sendall", None)
+    if write is None:
+        raise TypeError(f"Cannot write image chunks to {type(dest).__name__}")
+    return write
+
+
+def write_chunks(chunks: Iterable[bytes], dest: Destination) -> int:
+    """
+    Writes a stream of chunks to a destination.
+
+    Args:
+        chunks: Byte chunks
+        dest: File path (created or truncated), binary file object, or socket
+
+    Returns:
+        int: Number of bytes written
+    """
+    if isinstance(dest, (str, os.PathLike)):
+        with open(dest, "wb") as f:
+            return write_chunks(chunks, f)
+    write = _writer(dest)
+    written = 0
+    for chunk in chunks:
+        write(chunk)
+        written += len(chunk)
+    return written
+
+
+async def awrite_chunks(chunks: AsyncIterable[bytes], dest: Destination) -> int:
+    """
+    Asyncio counterpart of ``write_chunks``; awaits ``drain()`` after each
+    chunk when ``dest`` is an ``asyncio.StreamWriter``.
+    """
+    if isinstance(dest, (str, os.PathLike)):
+        with open(dest, "wb") as f:
+            return await awrite_chunks(chunks, f)
+    write = _writer(dest)
+    drain = getattr(dest, "drain", None)
+    written = 0
+    async for chunk in chunks:
+        write(chunk)
+        if drain is not None:
+            await drain()
+        written += len(chunk)
+    return written
@@ -0,0 +1,99 @@
+"""
+Pluggable JSON decoding of response bodies.
+
+Responses are decoded straight from the raw body bytes, skipping the
+charset detection and ``str`` copy of ``requests.Response.json()``. The
+backend is picked per client with ``api(json_decoder=...)``:
+
+- ``"auto"`` (default): the fastest installed library, ``orjson`` then
+  ``simdjson`` (pysimdjson), else the standard library
+- ``"orjson"``, ``"simdjson"`` or ``"json"``: that backend; the first two
+  need the library installed (``pip install pddiktipy[fast]`` for orjson)
+- any callable taking ``bytes`` and returning the decoded value
+
+The fast libraries are stricter than ``json`` (e.g. orjson rejects ``NaN``
+and ``Infinity``), so bodies they reject are decoded again with the
+standard library before the response is reported as invalid.
+
+Example:
+    >>> from pddiktipy import api
+    >>> client = api(json_decoder="orjson")
+"""
+import json
+from functools import wraps
+from typing import Any, Callable, Dict, Union
+
+from .exceptions import PDDIKTIError, ValidationError
+
+JSONDecoder = Callable[[bytes], Any]
+
+AUTO = "auto"
+_PREFERENCE = ("orjson", "simdjson", "json")
+_PACKAGES = {"orjson": "pddiktipy[fast]", "simdjson": "pysimdjson"}
+
+
+def _load_orjson() -> JSONDecoder:
+    import orjson
+    return orjson.loads
+
+
+def _load_simdjson() -> JSONDecoder:
+    import simdjson
+    return simdjson.loads
+
+
+_BACKENDS: Dict[str, Callable[[], JSONDecoder]] = {
+    "orjson": _load_orjson,
+    "simdjson": _load_simdjson,
+    "json": lambda: json.loads,
+}
+
+
+def available_decoders() -> Dict[str, JSONDecoder]:
+    """Installed backends by name, fastest first."""
+    decoders = {}
+    for name in _PREFERENCE:
+        try:
+            decoders[name] = _BACKENDS[name]()
+        except ImportError:
+            continue
+    return decoders
+
+
+def _with_fallback(loads: JSONDecoder) -> JSONDecoder:
+    @wraps(loads)
+    def decode(data: bytes) -> Any:
+        try:
+            return loads(data)
+        except ValueError:
+            return json.loads(data)
+    return decode
+
+
+def get_decoder(decoder: Union[str, JSONDecoder, None] = AUTO) -> JSONDecoder:
+    """
+    Resolves a ``json_decoder`` option into a function of ``bytes``.
+
+    Args:
+        decoder: Backend name, a callable, or None for ``"auto"``
+
+    Returns:
+        JSONDecoder: The decoding function
+
+    Raises:
+        ValidationError: If the backend name is unknown
+        PDDIKTIError: If the named backend is not installed
+    """
+    if callable(decoder):
+        return decoder
+    name = decoder or AUTO
+    if name == AUTO:
+        name = next(iter(available_decoders()))
+    if name not in _BACKENDS:
+        raise ValidationError(f"json_decoder must be one of {', '.join((AUTO,) + _PREFERENCE)} or a callable")
+    try:
+        loads = _BACKENDS[name]()
+    except ImportError:
+        raise PDDIKTIError(f"json_decoder '{name}' requires the {name} library. Install it with: pip install {_PACKAGES[name]}")
+    return loads if name == "json" else _with_fallback(loads)
+
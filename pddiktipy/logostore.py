@@ -0,0 +1,327 @@
+"""
+Content-addressed disk store for PT and prodi logos.
+
+Logos (``pt/logo/{id}``, ``prodi/logo-pt/{id}``) almost never change, so a
+client with ``api(logo_store=LogoStore(directory))`` keeps every downloaded
+logo on disk and serves repeats from there:
+
+- image files are named by the SHA-256 of their content
+  (``objects/ab/abcdef...``), so identical logos are stored once
+- a SQLite index (``index.db``, WAL mode) maps each logo path, i.e. each PT
+  ID, to its file, content type, ``ETag``/``Last-Modified`` and the time it
+  was last checked upstream
+- within ``max_age`` of that check a logo is served from disk without any
+  network access; afterwards it is revalidated with ``If-None-Match`` /
+  ``If-Modified-Since`` when upstream sent validators, and a ``304`` only
+  refreshes the index
+- ``get_logo_pt`` encodes straight from a memory map of the file, and
+  ``stream_logo_pt`` reads it in chunks
+
+Several threads and processes can share one directory.
+
+Example:
+    >>> from pddiktipy import api
+    >>> from pddiktipy.logostore import LogoStore
+    >>> client = api(logo_store=LogoStore("/var/cache/pddikti-logos"))
+    >>> client.get_logo_pt(pt_id)  # downloaded once, then served from disk
+"""
+import hashlib
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Union
+from urllib.parse import urlsplit
+
+from .exceptions import ValidationError
+from .images import CHUNK_SIZE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS logos (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logos_digest ON logos (digest);
+"""
+
+
+def logo_key(url: str) -> str:
+    """Index key of a logo URL: its path, e.g. ``/pt/logo/<pt_id>``."""
+    return urlsplit(url).path
+
+
+@dataclass
+class LogoRecord:
+    """Index entry of a stored logo.
+
+    Attributes:
+        key: Logo path, see ``logo_key``
+        digest: SHA-256 of the image, naming its file
+        size: Image size in bytes
+        content_type: ``Content-Type`` sent by upstream
+        etag: ``ETag`` sent by upstream, if any
+        last_modified: ``Last-Modified`` sent by upstream, if any
+        checked_at: When upstream last confirmed the image (epoch seconds)
+    """
+    key: str
+    digest: str
+    size: int
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    checked_at: float = 0.0
+
+
+class LogoWriter:
+    """
+    Receives a downloaded image chunk by chunk, hashing it into a temporary
+    file; ``commit`` moves it to its content-addressed name and indexes it.
+    """
+
+    def __init__(self, store: 'LogoStore'):
+        self.store = store
+        self._hash = hashlib.sha256()
+        self._size = 0
+        fd, self._tmp = tempfile.mkstemp(dir=store.objects, prefix=".tmp-")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self._size += len(chunk)
+
+    def commit(self, key: str, headers: Any) -> LogoRecord:
+        """
+        Stores the written image under ``key`` with the response's validators.
+        """
+        self._file.close()
+        digest = self._hash.hexdigest()
+        path = self.store.object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = LogoRecord(key, digest, self._size, headers.get("Content-Type"), headers.get("ETag"),
+                            headers.get("Last-Modified"), time.time())
+        # ``prune`` must not see the file before its index entry
+        with self.store._transaction():
+            os.replace(self._tmp, path)
+            self.store._save(record)
+        return record
+
+    def discard(self) -> None:
+        self._file.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self) -> 'LogoWriter':
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_val: Optional[BaseException], exc_tb: Optional[Any]) -> None:
+        self.discard()
+
+
+class LogoStore:
+    """
+    Directory of content-addressed logo files with a SQLite index.
+
+    Args:
+        directory: Store directory; created if missing
+        max_age: Seconds a logo is served without asking upstream; after
+            that it is revalidated. None never revalidates.
+        timeout: Seconds to wait for an index lock held by another process
+    """
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"], max_age: Optional[float] = 7 * 86400,
+                 timeout: float = 30.0):
+        if max_age is not None and max_age < 0:
+            raise ValidationError("max_age cannot be negative")
+        self.directory = os.fspath(directory)
+        self.objects = os.path.join(self.directory, "objects")
+        self.index_path = os.path.join(self.directory, "index.db")
+        self.max_age = max_age
+        self.timeout = timeout
+        os.makedirs(self.objects, exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns this thread's index connection, opening it on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.index_path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Holds the index write lock, which excludes other threads and
+        processes, for the duration of the block.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def object_path(self, digest: str) -> str:
+        """File holding the image with this SHA-256."""
+        return os.path.join(self.objects, digest[:2], digest)
+
+    def get(self, key: str) -> Optional[LogoRecord]:
+        """
+        Returns the index entry of a logo path whose file still exists.
+        """
+        row = self._connect().execute(
+            "SELECT key, digest, size, content_type, etag, last_modified, checked_at FROM logos WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None or not os.path.exists(self.object_path(row[1])):
+            return None
+        return LogoRecord(*row)
+
+    def is_fresh(self, record: LogoRecord) -> bool:
+        """Whether ``record`` may be served without asking upstream."""
+        return self.max_age is None or time.time() - record.checked_at < self.max_age
+
+    @staticmethod
+    def conditional_headers(record: LogoRecord) -> Dict[str, str]:
+        """``If-None-Match``/``If-Modified-Since`` headers revalidating ``record``."""
+        headers = {}
+        if record.etag:
+            headers["If-None-Match"] = record.etag
+        if record.last_modified:
+            headers["If-Modified-Since"] = record.last_modified
+        return headers
+
+    def writer(self) -> LogoWriter:
+        """Starts storing a downloaded image; see ``LogoWriter``."""
+        return LogoWriter(self)
+
+    def put(self, key: str, data: bytes, headers: Optional[Dict[str, str]] = None) -> LogoRecord:
+        """Stores a complete image under ``key``."""
+        with self.writer() as writer:
+            writer.write(data)
+            return writer.commit(key, headers or {})
+
+    def touch(self, record: LogoRecord, headers: Any) -> LogoRecord:
+        """
+        Marks ``record`` as confirmed by upstream (a ``304``), keeping any
+        new validators the response carried.
+        """
+        record.checked_at = time.time()
+        record.etag = headers.get("ETag") or record.etag
+        record.last_modified = headers.get("Last-Modified") or record.last_modified
+        self._save(record)
+        return record
+
+    def _save(self, record: LogoRecord) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO logos (key, digest, size, content_type, etag, last_modified, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (record.key, record.digest, record.size, record.content_type, record.etag,
+             record.last_modified, record.checked_at)
+        )
+
+    def count(self, outcome: str) -> None:
+        """Adds one to the ``hits``, ``revalidated`` or ``downloads`` counter."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    @contextmanager
+    def open(self, record: LogoRecord) -> Iterator[Union[mmap.mmap, bytes]]:
+        """
+        Yields a read-only memory map of a stored image (``b""`` if empty),
+        usable wherever bytes are accepted without copying the file.
+        """
+        with open(self.object_path(record.digest), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def iter_chunks(self, record: LogoRecord, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yields a stored image in chunks read from disk."""
+        with open(self.object_path(record.digest), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def remove(self, key: str) -> None:
+        """Drops a logo path from the index; ``prune`` deletes its file once unused."""
+        self._connect().execute("DELETE FROM logos WHERE key = ?", (key,))
+
+    def prune(self) -> int:
+        """
+        Deletes image files no index entry refers to, and temporary files
+        of downloads interrupted over an hour ago. Downloads committing
+        meanwhile wait for it to finish.
+
+        Returns:
+            int: Number of files removed
+        """
+        stale = time.time() - 3600
+        removed = 0
+        with self._transaction() as conn:
+            used = {row[0] for row in conn.execute("SELECT DISTINCT digest FROM logos")}
+            for folder, _, files in os.walk(self.objects):
+                for name in files:
+                    path = os.path.join(folder, name)
+                    if folder == self.objects:
+                        unused = name.startswith(".tmp-") and os.path.getmtime(path) < stale
+                    else:
+                        unused = name not in used
+                    if unused:
+                        os.remove(path)
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Empties the index; ``prune`` then deletes the files."""
+        self._connect().execute("DELETE FROM logos")
+
+    def stats(self) -> Dict[str, Any]:
+        count, files, total = self._connect().execute(
+            "SELECT COUNT(*), COUNT(DISTINCT digest), "
+            "COALESCE((SELECT SUM(size) FROM (SELECT DISTINCT digest, size FROM logos)), 0) FROM logos"
+        ).fetchone()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "downloads": self.downloads,
+                "logos": count,
+                "files": files,
+                "bytes": total,
+            }
+
+    def close(self) -> None:
+        """
+        Closes the calling thread's index connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,240 @@
+"""
+Per-endpoint request metrics with a Prometheus text exporter.
+
+A ``MetricsRegistry`` passed as ``api(metrics=...)`` records every request
+that reaches the network (cache hits are not requests) under its endpoint
+template, e.g. ``pt/prodi/{id}/{tahun}``: request count per status, latency
+histogram, response bytes, bytes saved by ``304 Not Modified`` answers to
+conditional requests, retries and errors per exception class.
+
+Example:
+    >>> from pddiktipy import api
+    >>> from pddiktipy.metrics import MetricsRegistry
+    >>> registry = MetricsRegistry()
+    >>> client = api(metrics=registry)
+    >>> client.get_detail_pt("...")
+    >>> print(registry.to_prometheus())
+    >>> registry.snapshot()["detail/pt/{id}"]["count"]
+    1
+
+Callbacks receive a ``RequestSample`` for every request, e.g. to forward
+measurements to StatsD or an existing Prometheus client registry.
+"""
+import bisect
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class RequestSample:
+    """Measurements of one request.
+
+    Attributes:
+        endpoint: Endpoint template, e.g. ``"detail/pt/{id}"``
+        latency: Seconds from sending until the body was decoded or failed
+        status_code: HTTP status of the last response; None without response
+        size: Response body bytes received, over all attempts
+        retries: Requests repeated after the first attempt
+        error_type: Exception class name if the request failed
+        saved_bytes: Body bytes not transferred because a conditional
+            request was answered with ``304 Not Modified`` or a stored logo
+            was still fresh
+    """
+    endpoint: str
+    latency: float
+    status_code: Optional[int] = None
+    size: int = 0
+    retries: int = 0
+    error_type: Optional[str] = None
+    saved_bytes: int = 0
+
+
+class _EndpointStats:
+    __slots__ = ("statuses", "errors", "buckets", "latency_sum", "latency_max", "bytes", "saved_bytes", "retries")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.buckets = [0] * (bucket_count + 1)  # last one is +Inf
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.bytes = 0
+        self.saved_bytes = 0
+        self.retries = 0
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process store of request metrics per endpoint template.
+
+    Args:
+        buckets: Upper bounds of the latency histogram buckets in seconds
+        callbacks: Functions called with each ``RequestSample``; exceptions
+            they raise are logged and ignored
+    """
+
+    def __init__(self,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 callbacks: Optional[Iterable[Callable[[RequestSample], Any]]] = None):
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValidationError("buckets must be a non-empty ascending sequence")
+        self.buckets = tuple(float(bound) for bound in buckets)
+        self.callbacks: List[Callable[[RequestSample], Any]] = list(callbacks or ())
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[RequestSample], Any]) -> None:
+        """Registers a function called with every ``RequestSample``."""
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[RequestSample], Any]) -> None:
+        """Unregisters a callback added before."""
+        self.callbacks.remove(callback)
+
+    def observe(self, sample: RequestSample) -> None:
+        """Records one request and passes it to the callbacks."""
+        index = bisect.bisect_left(self.buckets, sample.latency)
+        with self._lock:
+            stats = self._endpoints.get(sample.endpoint)
+            if stats is None:
+                stats = self._endpoints[sample.endpoint] = _EndpointStats(len(self.buckets))
+            stats.statuses[sample.status_code] += 1
+            if sample.error_type:
+                stats.errors[sample.error_type] += 1
+            stats.buckets[index] += 1
+            stats.latency_sum += sample.latency
+            stats.latency_max = max(stats.latency_max, sample.latency)
+            stats.bytes += sample.size
+            stats.saved_bytes += sample.saved_bytes
+            stats.retries += sample.retries
+        for callback in list(self.callbacks):
+            try:
+                callback(sample)
+            except Exception as e:
+                logger.warning(f"Metrics callback {callback!r} failed: {e}")
+
+    def _quantile(self, stats: _EndpointStats, count: int, q: float) -> float:
+        """Estimates a latency quantile by interpolating within its bucket."""
+        rank = q * count
+        seen = 0
+        lower = 0.0
+        for bound, bucket in zip(self.buckets + (stats.latency_max,), stats.buckets):
+            if bucket and seen + bucket >= rank:
+                upper = min(bound, stats.latency_max)
+                return lower + (upper - lower) * (rank - seen) / bucket
+            seen += bucket
+            lower = bound
+        return stats.latency_max
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the metrics of every endpoint template seen so far.
+
+        Returns:
+            dict: ``{template: {"count", "statuses", "errors", "latency_sum",
+            "latency_avg", "latency_p50", "latency_p99", "latency_max",
+            "bytes", "saved_bytes", "retries"}}``; percentiles are estimated from the
+            histogram buckets
+        """
+        with self._lock:
+            result = {}
+            for endpoint, stats in self._endpoints.items():
+                count = sum(stats.buckets)
+                result[endpoint] = {
+                    "count": count,
+                    "statuses": dict(stats.statuses),
+                    "errors": dict(stats.errors),
+                    "latency_sum": stats.latency_sum,
+                    "latency_avg": stats.latency_sum / count if count else 0.0,
+                    "latency_p50": self._quantile(stats, count, 0.5),
+                    "latency_p99": self._quantile(stats, count, 0.99),
+                    "latency_max": stats.latency_max,
+                    "bytes": stats.bytes,
+                    "saved_bytes": stats.saved_bytes,
+                    "retries": stats.retries,
+                }
+            return result
+
+    def to_prometheus(self, prefix: str = "pddikti") -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            str: ``{prefix}_requests_total``, ``{prefix}_request_errors_total``,
+            ``{prefix}_request_duration_seconds`` (histogram),
+            ``{prefix}_response_bytes_total``, ``{prefix}_saved_bytes_total``
+            and ``{prefix}_retries_total``, each labelled by ``endpoint``
+        """
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            return metric
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            metric = family("requests_total", "counter", "Requests sent, by endpoint template and status.")
+            for endpoint, stats in endpoints:
+                for status, count in sorted(stats.statuses.items(), key=lambda item: str(item[0])):
+                    code = "none" if status is None else status
+                    lines.append(f'{metric}{{endpoint="{_label(endpoint)}",status="{code}"}} {count}')
+
+            metric = family("request_errors_total", "counter", "Failed requests, by exception class.")
+            for endpoint, stats in endpoints:
+                for error, count in sorted(stats.errors.items()):
+                    lines.append(f'{metric}{{endpoint="{_label(endpoint)}",error="{_label(error)}"}} {count}')
+
+            metric = family("request_duration_seconds", "histogram", "Request latency in seconds.")
+            for endpoint, stats in endpoints:
+                label = _label(endpoint)
+                cumulative = 0
+                for bound, bucket in zip(self.buckets, stats.buckets):
+                    cumulative += bucket
+                    lines.append(f'{metric}_bucket{{endpoint="{label}",le="{_number(bound)}"}} {cumulative}')
+                cumulative += stats.buckets[-1]
+                lines.append(f'{metric}_bucket{{endpoint="{label}",le="+Inf"}} {cumulative}')
+                lines.append(f'{metric}_sum{{endpoint="{label}"}} {_number(stats.latency_sum)}')
+                lines.append(f'{metric}_count{{endpoint="{label}"}} {cumulative}')
+
+            metric = family("response_bytes_total", "counter", "Response body bytes received.")
+            for endpoint, stats in endpoints:
+                lines.append(f'{metric}{{endpoint="{_label(endpoint)}"}} {stats.bytes}')
+
+            metric = family("saved_bytes_total", "counter",
+                            "Response body bytes not transferred thanks to 304 Not Modified.")
+            for endpoint, stats in endpoints:
+                lines.append(f'{metric}{{endpoint="{_label(endpoint)}"}} {stats.saved_bytes}')
+
+            metric = family("retries_total", "counter", "Requests repeated after the first attempt.")
+            for endpoint, stats in endpoints:
+                lines.append(f'{metric}{{endpoint="{_label(endpoint)}"}} {stats.retries}')
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forgets all recorded metrics."""
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,298 @@
+"""
+Client-side token-bucket rate limiting with adaptive backoff on HTTP 429.
+
+A ``RateLimiter`` is shared by every call on a client (and by every thread
+using it). Each request takes one token; tokens refill at ``rate`` per
+second up to ``burst``. The rate adapts to the server:
+
+- on a 429 the rate is multiplied by ``decrease`` and all callers pause for
+  the ``Retry-After`` interval;
+- while the recent share of 429s stays below ``target_throttle_ratio``, the
+  rate grows by ``increase`` requests/second every second, up to ``max_rate``.
+
+``SQLiteRateLimiter`` keeps the bucket in a SQLite file so several
+processes on one host share a single allowance.
+
+Example:
+    >>> from pddiktipy import api
+    >>> from pddiktipy.ratelimit import RateLimiter
+    >>> limiter = RateLimiter(rate=20, max_rate=50)
+    >>> client = api(rate_limit=limiter, max_threads=32)
+    >>> limiter.metrics()["rate"]
+    20.0
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional
+
+from .exceptions import ValidationError
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a ``Retry-After`` header (delta-seconds or HTTP-date) into seconds.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if absent or unparsable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Thread-safe adaptive token bucket.
+
+    Args:
+        rate: Initial requests per second
+        burst: Bucket capacity; defaults to ``max(1, rate)``
+        min_rate: Lower bound for the adaptive rate
+        max_rate: Upper bound for the adaptive rate; defaults to ``rate``
+        adaptive: Adjust the rate on 429s and successes
+        decrease: Rate multiplier applied on every 429
+        increase: Requests/second added per second of low throttling
+        target_throttle_ratio: Share of 429s below which the rate may grow
+        default_retry_after: Pause in seconds when a 429 has no Retry-After
+        max_retries: Times a request is retried after a 429 before
+            ``APIRateLimitError`` is raised
+    """
+
+    def __init__(self,
+                 rate: float = 10.0,
+                 burst: Optional[float] = None,
+                 min_rate: float = 0.5,
+                 max_rate: Optional[float] = None,
+                 adaptive: bool = True,
+                 decrease: float = 0.5,
+                 increase: float = 1.0,
+                 target_throttle_ratio: float = 0.01,
+                 default_retry_after: float = 1.0,
+                 max_retries: int = 3):
+        if rate <= 0 or min_rate <= 0:
+            raise ValidationError("rate and min_rate must be positive")
+        if not 0 < decrease < 1:
+            raise ValidationError("decrease must be between 0 and 1")
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.adaptive = adaptive
+        self.decrease = decrease
+        self.increase = increase
+        self.target_throttle_ratio = target_throttle_ratio
+        self.default_retry_after = default_retry_after
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        # Bucket state; see _state()
+        self.rate = float(rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.pause_until = 0.0
+        self.last_increase = self.updated
+        self.throttle_ratio = 0.0
+
+        self.waiting = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        """Guards the bucket state; overridden to share it between processes."""
+        with self._lock:
+            yield
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Takes a token and returns how long the caller must wait before using it.
+
+        Reservations queue in arrival order: the token balance may go
+        negative, and each caller waits until its token has been refilled.
+        """
+        with self._state():
+            now = self._now()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = max(0.0, -self.tokens / self.rate, self.pause_until - now)
+        with self._lock:
+            self.acquired += 1
+            self.total_wait += delay
+        return delay
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request may be sent.
+
+        Returns:
+            float: Seconds waited
+        """
+        delay = self.reserve()
+        if delay > 0:
+            with self._lock:
+                self.waiting += 1
+            try:
+                time.sleep(delay)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        return delay
+
+    async def acquire_async(self) -> float:
+        """Awaitable counterpart of ``acquire`` for the asyncio client."""
+        delay = self.reserve()
+        if delay > 0:
+            with self._lock:
+                self.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        return delay
+
+    def on_success(self) -> None:
+        """Records a response that was not throttled."""
+        if not self.adaptive:
+            return
+        with self._state():
+            self.throttle_ratio *= 0.95
+            now = self._now()
+            if (self.throttle_ratio < self.target_throttle_ratio and
+                    now >= self.pause_until and now - self.last_increase >= 1.0):
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self.last_increase = now
+
+    def on_throttle(self, retry_after: Optional[str] = None) -> float:
+        """
+        Records a 429 response: slows down and pauses all callers.
+
+        Args:
+            retry_after: The response's ``Retry-After`` header value
+
+        Returns:
+            float: The pause in seconds
+        """
+        pause = parse_retry_after(retry_after)
+        if pause is None:
+            pause = self.default_retry_after
+        with self._state():
+            now = self._now()
+            self.pause_until = max(self.pause_until, now + pause)
+            if self.adaptive:
+                self.throttle_ratio = self.throttle_ratio * 0.95 + 0.05
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.last_increase = now
+        with self._lock:
+            self.throttled += 1
+        return pause
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns the limiter state.
+
+        Returns:
+            dict: ``rate`` (requests/second), ``tokens``, ``waiting`` (callers
+            currently queued in this process), ``acquired``, ``throttled``
+            (429s seen), ``throttle_ratio`` (recent share of 429s),
+            ``paused_for`` (seconds) and ``total_wait`` (seconds)
+        """
+        with self._state():
+            now = self._now()
+            state = {
+                "rate": self.rate,
+                "tokens": min(self.burst, self.tokens + (now - self.updated) * self.rate),
+                "throttle_ratio": self.throttle_ratio,
+                "paused_for": max(0.0, self.pause_until - now),
+            }
+        with self._lock:
+            state.update(waiting=self.waiting, acquired=self.acquired,
+                         throttled=self.throttled, total_wait=self.total_wait)
+        return state
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    ``RateLimiter`` whose bucket lives in a SQLite file shared by processes.
+
+    Every reservation runs in a short ``BEGIN IMMEDIATE`` transaction, so
+    all processes using the same ``path`` draw from one allowance. Counters
+    such as ``waiting`` and ``acquired`` remain per process. Wall-clock time
+    is used so the state is comparable across processes.
+
+    Args:
+        path: Database file; created if missing
+        name: Bucket name, to keep several limits in one file
+        **options: Forwarded to ``RateLimiter``
+    """
+
+    _COLUMNS = ("rate", "tokens", "updated", "pause_until", "last_increase", "throttle_ratio")
+
+    def __init__(self, path: str, name: str = "default", **options: Any):
+        super().__init__(**options)
+        self.path = path
+        self.name = name
+        self._local = threading.local()
+        self.updated = self.last_increase = self._now()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, rate REAL, tokens REAL, "
+                "updated REAL, pause_until REAL, last_increase REAL, throttle_ratio REAL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name,) + tuple(getattr(self, column) for column in self._COLUMNS)
+            )
+
+    def _now(self) -> float:
+        return time.time()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection, opening it on first use and again
+        in a forked child, which must not share the parent's handle.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    f"SELECT {', '.join(self._COLUMNS)} FROM buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                for column, value in zip(self._COLUMNS, row):
+                    setattr(self, column, value)
+                yield
+                conn.execute(
+                    f"UPDATE buckets SET {', '.join(c + ' = ?' for c in self._COLUMNS)} WHERE name = ?",
+                    tuple(getattr(self, column) for column in self._COLUMNS) + (self.name,)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
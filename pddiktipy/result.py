@@ -0,0 +1,104 @@
+"""
+Result objects for bulk and aggregated API calls.
+
+Unlike the regular API methods, which log errors and return None, bulk
+helpers return one ``Result`` per item carrying either the data or the
+exception that occurred. A client created with ``api(return_results=True)``
+returns a ``Result`` from every API method.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+from .circuit import is_failure
+from .exceptions import APIRateLimitError, CircuitOpenError
+
+# HTTP outcome of the API call running in the current thread or task; set
+# by ``capture_call`` and filled in by the helpers' request loops.
+_call_info: ContextVar[Optional[Dict[str, Any]]] = ContextVar("pddiktipy_call_info", default=None)
+
+
+@contextmanager
+def capture_call() -> Iterator[Dict[str, Any]]:
+    """
+    Collects ``status_code``, ``attempts``, ``size`` (body bytes) and
+    ``saved`` (body bytes not transferred, see ``note_saved``) of the
+    requests made inside. Captures nest: the totals are added to the
+    enclosing capture on exit.
+    """
+    parent = _call_info.get()
+    info: Dict[str, Any] = {"status_code": None, "attempts": 0, "size": 0, "saved": 0}
+    token = _call_info.set(info)
+    try:
+        yield info
+    finally:
+        _call_info.reset(token)
+        if parent is not None:
+            parent["attempts"] += info["attempts"]
+            parent["size"] += info["size"]
+            parent["saved"] += info["saved"]
+            if info["status_code"] is not None:
+                parent["status_code"] = info["status_code"]
+
+
+def note_call(status_code: Optional[int], attempts: int, size: int = 0) -> None:
+    """Records one HTTP exchange (including its retries) for ``capture_call``."""
+    info = _call_info.get()
+    if info is not None:
+        info["attempts"] += attempts
+        info["size"] += size
+        if status_code is not None:
+            info["status_code"] = status_code
+
+
+def note_saved(size: int) -> None:
+    """
+    Records body bytes served from the cache after a ``304 Not Modified``,
+    or from a ``LogoStore`` copy that was still fresh.
+    """
+    info = _call_info.get()
+    if info is not None:
+        info["saved"] += size
+
+
+@dataclass
+class Result:
+    """Outcome of a single API call.
+
+    Attributes:
+        key: The input the call was made for (e.g. a mahasiswa ID)
+        data: Decoded response, or None if the call failed
+        error: The exception raised by the call, if any
+        latency: Wall-clock duration of the call in seconds
+        status_code: HTTP status of the last response; None if no response
+            was received (connection failure, validation error, cache hit)
+        attempts: HTTP requests sent, including retries; 0 if the call was
+            served from the cache or failed before sending
+    """
+    key: Any = None
+    data: Any = None
+    error: Optional[Exception] = None
+    latency: float = 0.0
+    status_code: Optional[int] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        """True if the call completed without an error."""
+        return self.error is None
+
+    @property
+    def error_type(self) -> Optional[str]:
+        """Class name of the error, e.g. ``"APITimeoutError"``; None on success."""
+        return type(self.error).__name__ if self.error is not None else None
+
+    @property
+    def retryable(self) -> bool:
+        """
+        True if the call failed transiently and is worth retrying later.
+
+        Timeouts, connection errors, 5xx, rate limiting and open circuit
+        breakers are transient; 404, other 4xx and validation errors are not.
+        """
+        return is_failure(self.error) or isinstance(self.error, (APIRateLimitError, CircuitOpenError))
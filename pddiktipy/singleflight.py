@@ -0,0 +1,123 @@
+"""
+Request coalescing ("single-flight") for identical concurrent calls.
+
+While a call for a key is in flight, further callers for the same key wait
+for it and receive its result (or its exception) instead of issuing their
+own request.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Any = None
+
+
+class SingleFlight:
+    """
+    Thread-based single-flight group.
+
+    Example:
+        >>> group = SingleFlight()
+        >>> group.do("pt/count", fetch_pt_count)  # concurrent callers share one fetch
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Runs ``fn`` once for all concurrent callers with the same ``key``.
+
+        Args:
+            key: Deduplication key, e.g. the endpoint URL
+            fn: Zero-argument callable performing the work
+
+        Returns:
+            The result of ``fn``, shared by every caller
+
+        Raises:
+            Exception: Whatever ``fn`` raised, re-raised in every caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the number of upstream calls made (``leaders``), callers that
+        were served by another caller's request (``coalesced``) and keys
+        currently in flight.
+        """
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight group for coroutines running on one event loop.
+
+    The shared work runs in its own task, so cancelling any caller (the one
+    that started it included) leaves the others waiting for its result.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits ``fn()`` once for all concurrent callers with the same ``key``.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.leaders += 1
+            task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._calls)}
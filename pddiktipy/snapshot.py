@@ -0,0 +1,198 @@
+"""
+Content-hash snapshots of crawled entities for incremental processing.
+
+A ``SnapshotStore`` remembers a hash of every record seen per entity type
+and ID. Observing a record during a run reports whether it was added,
+changed or is unchanged since the previous run; finishing a complete run
+reports the IDs that were not seen again as removed. Downstream loaders can
+then process the deltas instead of full dumps.
+
+Example:
+    >>> store = SnapshotStore("snapshots.db")
+    >>> with api() as client:
+    ...     for change in store.diff("pt", client.search_pt("universitas"), id_field="id"):
+    ...         print(change.kind, change.id)
+
+The crawler uses a store directly: ``Crawler(..., snapshot=store)`` writes
+only added and changed records and lists removals in ``removed.ndjson``.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .exceptions import ValidationError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS entities (
+    entity TEXT NOT NULL,
+    id TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    first_run INTEGER NOT NULL,
+    changed_run INTEGER NOT NULL,
+    seen_run INTEGER NOT NULL,
+    PRIMARY KEY (entity, id)
+);
+CREATE INDEX IF NOT EXISTS entities_seen_run ON entities (entity, seen_run);
+"""
+
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+
+def content_hash(record: Any) -> str:
+    """Stable hash of a JSON-serializable record (key order insensitive)."""
+    data = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class Change:
+    """A difference between the current and the previous run.
+
+    Attributes:
+        kind: ``"added"``, ``"changed"`` or ``"removed"``
+        entity: Entity type, e.g. ``"pt"``
+        id: Entity ID
+        record: The current record; None for removals
+    """
+    kind: str
+    entity: str
+    id: str
+    record: Any = None
+
+
+class SnapshotStore:
+    """
+    SQLite store of content hashes per entity from previous runs.
+
+    A run is started with ``begin()``; an unfinished run from an interrupted
+    process is continued instead of starting a new one, so resumed crawls
+    keep their observations. Only ``finish()`` reports removals, so call it
+    only after a complete crawl.
+
+    Args:
+        path: Database file; created if missing
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+        self.run: Optional[int] = None
+
+    def begin(self) -> int:
+        """Starts a run, or continues the last unfinished one; returns its ID."""
+        row = self._conn.execute(
+            "SELECT run FROM runs WHERE finished_at IS NULL ORDER BY run DESC LIMIT 1"
+        ).fetchone()
+        if row:
+            self.run = row[0]
+        else:
+            self.run = self._conn.execute(
+                "INSERT INTO runs (started_at) VALUES (?)", (time.time(),)
+            ).lastrowid
+            self._conn.commit()
+        return self.run
+
+    def observe(self, entity: str, id: str, record: Any) -> Optional[str]:
+        """
+        Records that ``record`` was seen in the current run.
+
+        Returns:
+            Optional[str]: ``"added"``, ``"changed"``, or None if unchanged
+        """
+        if self.run is None:
+            raise ValidationError("SnapshotStore.begin() must be called before observe()")
+        digest = content_hash(record)
+        row = self._conn.execute(
+            "SELECT hash FROM entities WHERE entity = ? AND id = ?", (entity, id)
+        ).fetchone()
+        if row is None:
+            self._conn.execute(
+                "INSERT INTO entities VALUES (?, ?, ?, ?, ?, ?)",
+                (entity, id, digest, self.run, self.run, self.run)
+            )
+            return ADDED
+        if row[0] != digest:
+            self._conn.execute(
+                "UPDATE entities SET hash = ?, changed_run = ?, seen_run = ? WHERE entity = ? AND id = ?",
+                (digest, self.run, self.run, entity, id)
+            )
+            return CHANGED
+        self._conn.execute(
+            "UPDATE entities SET seen_run = ? WHERE entity = ? AND id = ?", (self.run, entity, id)
+        )
+        return None
+
+    def commit(self) -> None:
+        """Persists the observations made so far."""
+        self._conn.commit()
+
+    def finish(self, entities: Optional[Iterable[str]] = None) -> List[Change]:
+        """
+        Ends the current run and returns the entities not seen in it.
+
+        Removed entities are deleted from the store.
+
+        Args:
+            entities: Entity types to check for removals; None checks all
+        """
+        if self.run is None:
+            raise ValidationError("SnapshotStore.begin() must be called before finish()")
+        query = "SELECT entity, id FROM entities WHERE seen_run < ?"
+        params: List[Any] = [self.run]
+        if entities is not None:
+            entities = list(entities)
+            query += f" AND entity IN ({','.join('?' * len(entities))})"
+            params += entities
+        removed = [Change(REMOVED, entity, id) for entity, id in self._conn.execute(query, params)]
+        self._conn.executemany(
+            "DELETE FROM entities WHERE entity = ? AND id = ?", [(c.entity, c.id) for c in removed]
+        )
+        self._conn.execute("UPDATE runs SET finished_at = ? WHERE run = ?", (time.time(), self.run))
+        self._conn.commit()
+        self.run = None
+        return removed
+
+    def diff(self, entity: str, records: Iterable[Dict[str, Any]], id_field: str = "id") -> Iterator[Change]:
+        """
+        Compares a complete set of one entity type against the last run.
+
+        Runs ``begin``/``observe``/``finish`` over ``records`` and yields every
+        added, changed and removed record. Do not mix with a crawl run that
+        is still in progress on the same store.
+
+        Args:
+            entity: Entity type
+            records: Every current record of that type
+            id_field: Record field holding the entity ID
+        """
+        self.begin()
+        for record in records or ():
+            kind = self.observe(entity, str(record[id_field]), record)
+            if kind:
+                yield Change(kind, entity, str(record[id_field]), record)
+        yield from self.finish([entity])
+
+    def stats(self) -> Dict[str, int]:
+        """Number of stored entities per entity type."""
+        return dict(self._conn.execute("SELECT entity, COUNT(*) FROM entities GROUP BY entity"))
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> 'SnapshotStore':
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_val: Optional[BaseException], exc_tb: Optional[Any]) -> None:
+        self.close()
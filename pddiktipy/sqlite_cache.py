@@ -0,0 +1,341 @@
+"""
+Persistent SQLite cache backend shared across processes.
+
+Responses are stored as zlib-compressed JSON in a single SQLite database in
+WAL mode, so several processes on one host (e.g. gunicorn workers) can read
+and write the same cache concurrently and keep it across restarts.
+
+Example:
+    >>> from pddiktipy import api
+    >>> from pddiktipy.sqlite_cache import SQLiteCache
+    >>> client = api(cache=SQLiteCache("/var/cache/pddikti.db", max_bytes=512 * 2**20))
+
+The cache can be inspected and pruned from the command line:
+
+    python -m pddiktipy.sqlite_cache /var/cache/pddikti.db stats
+    python -m pddiktipy.sqlite_cache /var/cache/pddikti.db prune
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .cache import BaseCache, CacheEntry
+from .exceptions import ValidationError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    body_size INTEGER NOT NULL DEFAULT 0,
+    stale_until REAL NOT NULL DEFAULT 0,
+    status INTEGER NOT NULL DEFAULT 200
+);
+CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+# Columns added after the first release, for databases created before them
+_ADDED_COLUMNS = {
+    "etag": "TEXT",
+    "last_modified": "TEXT",
+    "body_size": "INTEGER NOT NULL DEFAULT 0",
+    "stale_until": "REAL NOT NULL DEFAULT 0",
+    "status": "INTEGER NOT NULL DEFAULT 200",
+}
+
+
+class SQLiteCache(BaseCache):
+    """
+    Disk-backed cache backend using SQLite in WAL mode.
+
+    Each thread (and each process after a fork) uses its own connection.
+    Hit and miss counters are per process; size information comes from disk.
+
+    Args:
+        path: Database file; created if missing
+        max_bytes: Upper bound for the stored (compressed) bodies. Expired and
+            then least recently used entries are evicted past this size.
+            None disables size-based eviction.
+        compress_level: zlib compression level (0-9)
+        timeout: Seconds to wait for a lock held by another process
+        evict_every: Check the size bound after this many writes
+    """
+
+    # Only rewrite accessed_at when it is older than this, to keep hits read-only
+    TOUCH_RESOLUTION = 60.0
+
+    def __init__(self,
+                 path: str,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024,
+                 compress_level: int = 6,
+                 timeout: float = 30.0,
+                 evict_every: int = 64):
+        if max_bytes is not None and max_bytes < 1:
+            raise ValidationError("max_bytes must be positive")
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.timeout = timeout
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+            for name, definition in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE responses ADD COLUMN {name} {definition}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection, opening it on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _encode(self, value: Any) -> bytes:
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(data, self.compress_level)
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        return json.loads(zlib.decompress(blob))
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, expires_at, etag, last_modified, body_size, stale_until, status, accessed_at "
+            "FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or row[1] <= now:
+            with self._lock:
+                self.misses += 1
+            return None
+        if now - row[7] > self.TOUCH_RESOLUTION:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self.hits += 1
+        return CacheEntry(self._decode(row[0]), *row[1:7])
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        row = self._connect().execute(
+            "SELECT value, expires_at, etag, last_modified, body_size, stale_until, status "
+            "FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return CacheEntry(self._decode(row[0]), *row[1:]) if row is not None else None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        blob = self._encode(entry.value)
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, value, size, stored_at, expires_at, accessed_at, etag, last_modified, body_size, stale_until, "
+            "status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, blob, len(blob), now, entry.expires_at, now, entry.etag, entry.last_modified, entry.size,
+             entry.stale_until, entry.status)
+        )
+        with self._lock:
+            self._writes += 1
+            check = self.max_bytes is not None and self._writes % self.evict_every == 0
+        if check:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM responses")
+
+    def prune(self, keep_revalidatable: bool = False) -> int:
+        """
+        Removes expired entries, except those still within their
+        stale-serving window (``CacheEntry.stale_until``).
+
+        Args:
+            keep_revalidatable: Keep expired entries with an ``ETag`` or
+                ``Last-Modified``, which conditional requests can still refresh
+
+        Returns:
+            int: Number of entries removed
+        """
+        query = "DELETE FROM responses WHERE expires_at <= ? AND stale_until <= ?"
+        if keep_revalidatable:
+            query += " AND etag IS NULL AND last_modified IS NULL"
+        now = time.time()
+        cursor = self._connect().execute(query, (now, now))
+        return cursor.rowcount
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Prunes expired entries (keeping revalidatable ones), then evicts
+        least recently used entries until the stored size is within
+        ``max_bytes``.
+
+        Args:
+            max_bytes: Size bound; defaults to the configured ``max_bytes``
+
+        Returns:
+            int: Number of entries removed
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        removed = self.prune(keep_revalidatable=True)
+        if limit is None:
+            return removed
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            excess = total - limit
+            victims: List[Tuple[str]] = []
+            if excess > 0:
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+                    victims.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self.evictions += len(victims)
+        return removed + len(victims)
+
+    def vacuum(self) -> None:
+        """
+        Checkpoints the WAL and rebuilds the database file to reclaim space.
+        """
+        conn = self._connect()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields metadata for every stored entry, most recently used first.
+        """
+        rows = self._connect().execute(
+            "SELECT key, size, stored_at, expires_at, accessed_at FROM responses ORDER BY accessed_at DESC"
+        )
+        for key, size, stored_at, expires_at, accessed_at in rows:
+            yield {"key": key, "size": size, "stored_at": stored_at,
+                   "expires_at": expires_at, "accessed_at": accessed_at}
+
+    def stats(self) -> Dict[str, Any]:
+        count, total, expired = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(expires_at <= ?), 0) FROM responses",
+            (time.time(),)
+        ).fetchone()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": count,
+                "expired": expired,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+                "file_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            }
+
+    def close(self) -> None:
+        """
+        Closes the calling thread's connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line interface to inspect and prune a SQLite cache file.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m pddiktipy.sqlite_cache",
+        description="Inspect and prune a pddiktipy SQLite response cache."
+    )
+    parser.add_argument("path", help="cache database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="show entry count and sizes")
+    listing = commands.add_parser("list", help="list entries, most recently used first")
+    listing.add_argument("--limit", type=int, default=50)
+    show = commands.add_parser("get", help="print the cached JSON for a key")
+    show.add_argument("key")
+    commands.add_parser("prune", help="remove expired entries")
+    evict = commands.add_parser("evict", help="prune, then evict LRU entries down to a size")
+    evict.add_argument("--max-bytes", type=int, required=True)
+    commands.add_parser("vacuum", help="reclaim disk space")
+    commands.add_parser("clear", help="remove every entry")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"No cache at {args.path}", file=sys.stderr)
+        return 1
+    cache = SQLiteCache(args.path, max_bytes=None)
+
+    if args.command == "stats":
+        stats = cache.stats()
+        for name in ("size", "expired", "bytes", "file_bytes"):
+            print(f"{name:<10} {stats[name]}")
+    elif args.command == "list":
+        now = time.time()
+        for i, entry in enumerate(cache.entries()):
+            if i >= args.limit:
+                break
+            state = "expired" if entry["expires_at"] <= now else "fresh"
+            print(f"{_format_time(entry['accessed_at'])}  {entry['size']:>8}  {state:<7}  {entry['key']}")
+    elif args.command == "get":
+        row = cache._connect().execute(
+            "SELECT value FROM responses WHERE key = ?", (args.key,)
+        ).fetchone()
+        if row is None:
+            print(f"No entry for {args.key}", file=sys.stderr)
+            return 1
+        print(json.dumps(cache._decode(row[0]), ensure_ascii=False, indent=2))
+    elif args.command == "prune":
+        print(f"Removed {cache.prune()} expired entries")
+    elif args.command == "evict":
+        print(f"Removed {cache.evict(args.max_bytes)} entries")
+    elif args.command == "vacuum":
+        cache.vacuum()
+        print(f"Vacuumed {args.path} ({cache.stats()['file_bytes']} bytes)")
+    elif args.command == "clear":
+        cache.clear()
+        print("Cache cleared")
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Tracing hooks around API calls.
+
+A tracer passed as ``api(tracer=...)`` receives start/end events for one
+span per API method call and nested spans for its phases:
+
+- ``pddikti.<method>``: the public method, e.g. ``pddikti.get_detail_pt``
+  (attribute ``pddikti.method``)
+- ``pddikti.validate``: input validation
+- ``pddikti.request``: ``helper.response()`` for one endpoint, with
+  ``pddikti.endpoint`` (template), ``pddikti.cache_hit``,
+  ``http.status_code``, ``pddikti.response_bytes`` and ``pddikti.attempts``
+  (requests sent including retries)
+- ``pddikti.headers``, ``pddikti.http`` and ``pddikti.decode``: header
+  building, the HTTP exchange with its retries, and JSON decoding
+
+Without a tracer (the default) none of this code runs. ``Tracer`` itself is
+a no-op base class; subclass it to forward events elsewhere, or use
+``OpenTelemetryTracer`` to emit OpenTelemetry spans.
+
+Example:
+    >>> from pddiktipy import api
+    >>> from pddiktipy.tracing import OpenTelemetryTracer
+    >>> client = api(tracer=OpenTelemetryTracer())
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from .exceptions import PDDIKTIError
+
+
+class Tracer:
+    """
+    Base class of tracing hooks; every hook does nothing.
+
+    Subclasses override ``start_span`` and ``end_span``. Both are called in
+    the thread or asyncio task that runs the call, so context-local state
+    (e.g. the current parent span) can be kept in a ``ContextVar``.
+    """
+
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> Any:
+        """
+        Called when a span starts.
+
+        Args:
+            name: Span name, e.g. ``"pddikti.request"``
+            attributes: Attributes known at the start
+
+        Returns:
+            Any: A handle passed back to ``end_span``
+        """
+        return None
+
+    def end_span(self, span: Any, attributes: Dict[str, Any], error: Optional[BaseException]) -> None:
+        """
+        Called when a span ends.
+
+        Args:
+            span: The handle returned by ``start_span``
+            attributes: All attributes, including those added during the span;
+                values may be None if unknown
+            error: The exception that ended the span, if any
+        """
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Wraps a block in a span; yields the attribute dict to add to.
+        """
+        attributes = dict(attributes or {})
+        handle = self.start_span(name, attributes)
+        error = None
+        try:
+            yield attributes
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.end_span(handle, attributes, error)
+
+
+@dataclass
+class SpanRecord:
+    """A finished span kept by ``RecordingTracer``.
+
+    Attributes:
+        name: Span name
+        attributes: Final span attributes
+        start: ``time.perf_counter()`` at the start
+        end: ``time.perf_counter()`` at the end
+        error: The exception that ended the span, if any
+        parent: Name of the enclosing span, if any
+    """
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start: float = 0.0
+    end: float = 0.0
+    error: Optional[BaseException] = None
+    parent: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Span duration in seconds."""
+        return self.end - self.start
+
+
+class RecordingTracer(Tracer):
+    """
+    Tracer keeping finished spans in memory, for debugging and tests.
+
+    Example:
+        >>> tracer = RecordingTracer()
+        >>> api(tracer=tracer).get_detail_pt("...")
+        >>> [(s.name, round(s.duration, 3)) for s in tracer.spans]
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[SpanRecord] = []
+        self._current: ContextVar[Optional[SpanRecord]] = ContextVar("pddiktipy_span", default=None)
+
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> Any:
+        parent = self._current.get()
+        record = SpanRecord(name, start=time.perf_counter(), parent=parent.name if parent else None)
+        return record, self._current.set(record)
+
+    def end_span(self, span: Any, attributes: Dict[str, Any], error: Optional[BaseException]) -> None:
+        record, token = span
+        record.end = time.perf_counter()
+        record.attributes = dict(attributes)
+        record.error = error
+        self._current.reset(token)
+        self.spans.append(record)
+
+    def clear(self) -> None:
+        """Forgets the recorded spans."""
+        self.spans.clear()
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Emits OpenTelemetry spans, nested under the caller's current span.
+
+    Requires the optional ``opentelemetry-api`` package
+    (``pip install pddiktipy[otel]``); configure an SDK tracer provider and
+    exporter as usual.
+
+    Args:
+        tracer: An OpenTelemetry ``Tracer``; defaults to
+            ``trace.get_tracer("pddiktipy")``
+    """
+
+    def __init__(self, tracer: Any = None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise PDDIKTIError(
+                "OpenTelemetryTracer requires opentelemetry-api. Install it with: pip install pddiktipy[otel]"
+            )
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("pddiktipy")
+
+    @staticmethod
+    def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+        # OpenTelemetry rejects None attribute values
+        return {key: value for key, value in attributes.items() if value is not None}
+
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> Any:
+        span = self._tracer.start_span(name, attributes=self._attributes(attributes))
+        scope = self._trace.use_span(span, end_on_exit=False)
+        scope.__enter__()
+        return span, scope
+
+    def end_span(self, span: Any, attributes: Dict[str, Any], error: Optional[BaseException]) -> None:
+        otel_span, scope = span
+        otel_span.set_attributes(self._attributes(attributes))
+        if error is not None:
+            otel_span.record_exception(error)
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+        scope.__exit__(None, None, None)
+        otel_span.end()
@@ -54,6 +54,17 @@ setup(
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+        "otel": ["opentelemetry-api>=1.0"],
+        "fast": ["orjson>=3.0"],
+    },
+    entry_points={
+        "console_scripts": [
+            "pddikti-cache=pddiktipy.sqlite_cache:main",
+            "pddikti-crawl=pddiktipy.crawler:main",
+        ],
+    },
     keywords=[
         "pddikti", 
         "api", 
@@ -7,6 +7,29 @@ Test modules:
 - test_data.py: Test data constants and configuration
 - test_pddikti_api_methods.py: Main API method testing suite  
 - conftest.py: Pytest configuration and shared fixtures
+- stub_server.py: Local PDDIKTI stub server for offline tests
+- test_aio.py: Offline tests for the asyncio client
+- test_helper.py: Offline tests for the HTTP helper
+- test_cache.py: Offline tests for response caching
+- test_sqlite_cache.py: Offline tests for the persistent SQLite cache
+- test_singleflight.py: Offline tests for request coalescing
+- test_bulk.py: Offline tests for bulk fan-out
+- test_aggregate.py: Offline tests for composite profile fetches
+- test_crawler.py: Offline tests for the resumable catalogue crawler
+- test_snapshot.py: Offline tests for snapshot diffing between crawls
+- test_ratelimit.py: Offline tests for the client-side rate limiter
+- test_circuit.py: Offline tests for per-family circuit breakers
+- test_result.py: Offline tests for structured result mode
+- test_metrics.py: Offline tests for per-endpoint request metrics
+- test_tracing.py: Offline tests for tracing hooks
+- test_benchmarks.py: Offline smoke tests for the benchmark stub and runners
+- test_cassette.py: Offline tests for cassette record/replay
+- test_jsondecode.py: Offline tests for pluggable JSON decoding
+- test_images.py: Offline tests for streaming image downloads
+- test_logostore.py: Offline tests for the content-addressed logo store
+- test_conditional.py: Offline tests for conditional revalidation of cached responses
+- test_stale.py: Offline tests for stale-while-revalidate and stale-if-error cache serving
+- test_negative.py: Offline tests for negative-result caching (404s and empty results)
 
 Testing approach:
 - Uses real PDDIKTI database IDs for authentic API testing
@@ -0,0 +1,103 @@
+"""
+Local HTTP stub of the PDDIKTI API for offline tests.
+
+Routes map a request path (including query string) to a ``(status, body,
+headers)`` tuple; bodies that are not ``bytes`` are JSON-encoded. Every
+request is counted per path so tests can assert how often the network was hit.
+
+The benchmark stub (``benchmarks/stub_server.py``) extends this server by
+overriding ``respond``.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Must be set before bind/listen; the default backlog of 5 drops connects
+    # from concurrent tests, and benchmarks open hundreds of connections at once
+    request_queue_size = 1024
+
+
+class StubServer:
+    """
+    Threaded stub server usable as a context manager.
+
+    Args:
+        routes: Request path to ``(status, body, headers)``, or to a callable
+            taking the request handler and returning one
+        delay: Seconds to wait before every response
+        host: Interface to bind
+        port: Port; 0 picks a free one
+        record: Keep ``(path, headers)`` of every request in ``requests``
+    """
+
+    def __init__(self, routes=None, delay=0.0, host="127.0.0.1", port=0, record=True):
+        self.routes = dict(routes or {})
+        self.delay = delay
+        self.host = host
+        self.port = port
+        self.record = record
+        self.hits = Counter()
+        self.requests = []
+        self._server = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, handler):
+        """Returns ``(status, body, headers)`` for a request."""
+        route = self.routes.get(handler.path)
+        if callable(route):
+            route = route(handler)
+        return route or (404, {"message": "not found"}, {})
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                stub.hits[self.path] += 1
+                if stub.record:
+                    stub.requests.append((self.path, dict(self.headers)))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                status, body, headers = stub.respond(self)
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode("utf-8")
+                    headers = dict({"Content-Type": "application/json"}, **headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._server = _Server((self.host, self.port), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
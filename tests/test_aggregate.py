@@ -0,0 +1,214 @@
+"""
+Offline tests for composite multi-endpoint fetches (get_pt_profile,
+get_dosen_full, get_prodi_profile).
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.aggregate import DOSEN_SECTIONS, PRODI_SECTIONS, PT_SECTIONS, Profile
+from pddiktipy.exceptions import APIResponseError, APITimeoutError, ValidationError
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+PT_PATHS = {
+    "detail": "detail/pt", "rasio": "pt/rasio", "mahasiswa": "pt/mahasiswa",
+    "waktu_studi": "pt/waktu-studi", "name_histories": "pt/name-histories",
+    "cost_range": "pt/cost-range", "graduation_rate": "pt/graduation-rate",
+    "jumlah_prodi": "pt/jumlah-prodi", "jumlah_mahasiswa": "pt/jumlah-mahasiswa",
+    "jumlah_dosen": "pt/jumlah-dosen",
+}
+DOSEN_PATHS = {
+    "profile": "dosen/profile", "penelitian": "dosen/portofolio/penelitian",
+    "pengabdian": "dosen/portofolio/pengabdian", "karya": "dosen/portofolio/karya",
+    "paten": "dosen/portofolio/paten", "study_history": "dosen/study-history",
+    "teaching_history": "dosen/teaching-history",
+}
+DOSEN_IDS = [f"dosen-{i:06d}" for i in range(6)]
+PRODI_ID = "prodi-0123456789"
+PRODI_PATHS = {
+    "detail": "prodi/detail", "desc": "prodi/desc", "name_histories": "prodi/name-histories",
+    "num_students_lecturers": "prodi/num-students-lecturers", "cost_range": "prodi/cost-range",
+    "daya_tampung": "prodi/daya-tampung", "rasio_dosen_mahasiswa": "prodi/rasio-dosen-mahasiswa",
+    "graduation_rate": "prodi/graduation-rate",
+}
+DELAY = 0.1
+
+
+def slow(status, body, headers=None):
+    def route(handler):
+        time.sleep(DELAY)
+        return status, body, headers or {}
+    return route
+
+
+def pt_routes():
+    routes = {f"/{path}/{PT_ID}": slow(200, {"section": name}) for name, path in PT_PATHS.items()}
+    routes[f"/pt/logo/{PT_ID}"] = slow(200, b"\x89PNG", {"Content-Type": "image/png"})
+    routes[f"/pt/rasio/{PT_ID}"] = slow(500, {"message": "boom"})
+    return routes
+
+
+def dosen_routes():
+    routes = {f"/{path}/{dosen_id}": slow(200, [{"section": name, "id": dosen_id}])
+              for dosen_id in DOSEN_IDS for name, path in DOSEN_PATHS.items()}
+    del routes[f"/dosen/portofolio/paten/{DOSEN_IDS[1]}"]  # answered with 404
+    return routes
+
+
+def prodi_routes(slow_section=None):
+    routes = {f"/{path}/{PRODI_ID}": slow(200, {"section": name}) for name, path in PRODI_PATHS.items()}
+    routes[f"/dosen/homebase/{PRODI_ID}?semester=20241"] = slow(200, {"section": "homebase"})
+    routes[f"/dosen/penghitung-ratio/{PRODI_ID}?semester=20241"] = slow(200, {"section": "penghitung_ratio"})
+    if slow_section:
+        def stuck(handler):
+            time.sleep(DELAY * 10)
+            return 200, {"section": slow_section}, {}
+        routes[f"/{PRODI_PATHS[slow_section]}/{PRODI_ID}"] = stuck
+    return routes
+
+
+class TestPTProfile(unittest.TestCase):
+    """get_pt_profile issues every section concurrently and reports each one."""
+
+    def test_all_sections_concurrently_with_partial_failure(self):
+        with StubServer(pt_routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, max_threads=11) as client:
+                profile = client.get_pt_profile(PT_ID)
+
+        self.assertIsInstance(profile, Profile)
+        self.assertEqual(list(profile.sections), list(PT_SECTIONS))
+        self.assertFalse(profile.ok)
+        self.assertTrue(profile.partial)
+        self.assertEqual(list(profile.errors), ["rasio"])
+        self.assertIsInstance(profile.errors["rasio"], APIResponseError)
+        self.assertEqual(profile["detail"], {"section": "detail"})
+        self.assertIsNone(profile["rasio"])
+        self.assertEqual(profile.data["logo"], "iVBORw==")
+        # Eleven 100 ms calls finish in roughly one round-trip, not eleven
+        self.assertLess(profile.latency, DELAY * 5)
+        self.assertTrue(all(r.latency >= DELAY for r in profile.sections.values()))
+
+    def test_include_selects_sections(self):
+        with StubServer(pt_routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                profile = client.get_pt_profile(PT_ID, include=["logo", "detail"])
+                with self.assertRaises(ValidationError):
+                    client.get_pt_profile(PT_ID, include=["detail", "nope"])
+        self.assertEqual(list(profile.sections), ["logo", "detail"])
+        self.assertTrue(profile.ok)
+        self.assertEqual(sum(server.hits.values()), 2)
+
+    def test_async_profile(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer(pt_routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                    return await client.get_pt_profile(PT_ID)
+            profile = asyncio.run(main())
+        self.assertEqual(list(profile.errors), ["rasio"])
+        self.assertEqual(profile.data["logo"], "iVBORw==")
+        self.assertLess(profile.latency, DELAY * 5)
+
+
+class TestDosenFull(unittest.TestCase):
+    """get_dosen_full and its batch form."""
+
+    def test_full_portfolio_with_timings(self):
+        with StubServer(dosen_routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                dosen = client.get_dosen_full(DOSEN_IDS[0])
+        self.assertTrue(dosen.ok)
+        self.assertEqual(list(dosen.sections), list(DOSEN_SECTIONS))
+        self.assertEqual(dosen["karya"], [{"section": "karya", "id": DOSEN_IDS[0]}])
+        self.assertEqual(set(dosen.timings), set(DOSEN_SECTIONS))
+        self.assertTrue(all(t >= DELAY for t in dosen.timings.values()))
+        self.assertLess(dosen.latency, DELAY * 4)
+
+    def test_many_lecturers(self):
+        with StubServer(dosen_routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, max_threads=21) as client:
+                started = time.perf_counter()
+                profiles = list(client.get_dosen_full_many(DOSEN_IDS, max_workers=3, ordered=True))
+                elapsed = time.perf_counter() - started
+                with self.assertRaises(ValidationError):
+                    client.get_dosen_full_many(DOSEN_IDS, include=["nope"])
+        self.assertEqual([p.key for p in profiles], DOSEN_IDS)
+        self.assertEqual([p.ok for p in profiles], [True, False] + [True] * 4)
+        self.assertEqual(profiles[1].errors["paten"].status_code, 404)
+        # 42 requests of 100 ms, 21 at a time
+        self.assertLess(elapsed, DELAY * 2 * 4)
+
+    def test_async_many(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer(dosen_routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                    single = await client.get_dosen_full(DOSEN_IDS[0], include=["profile"])
+                    many = [p async for p in client.get_dosen_full_many(DOSEN_IDS, max_workers=6)]
+                    return single, many
+            single, many = asyncio.run(main())
+        self.assertEqual(list(single.sections), ["profile"])
+        self.assertCountEqual([p.key for p in many], DOSEN_IDS)
+        self.assertEqual(sum(not p.ok for p in many), 1)
+
+
+class TestProdiProfile(unittest.TestCase):
+    """get_prodi_profile with semester sections and a deadline."""
+
+    def test_semester_sections(self):
+        with StubServer(prodi_routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                without = client.get_prodi_profile(PRODI_ID)
+                full = client.get_prodi_profile(PRODI_ID, semester=20241)
+                with self.assertRaises(ValidationError):
+                    client.get_prodi_profile(PRODI_ID, include=["homebase"])
+        self.assertEqual(list(without.sections), list(PRODI_PATHS))
+        self.assertTrue(without.ok)
+        self.assertEqual(list(full.sections), list(PRODI_SECTIONS))
+        self.assertTrue(full.ok)
+        self.assertEqual(full["penghitung_ratio"], {"section": "penghitung_ratio"})
+
+    def test_deadline_returns_without_slow_section(self):
+        with StubServer(prodi_routes(slow_section="desc")) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                started = time.perf_counter()
+                profile = client.get_prodi_profile(PRODI_ID, deadline=DELAY * 3)
+                elapsed = time.perf_counter() - started
+        self.assertLess(elapsed, DELAY * 6)
+        self.assertEqual(list(profile.errors), ["desc"])
+        self.assertIsInstance(profile.errors["desc"], APITimeoutError)
+        self.assertEqual(len(profile.data), len(PRODI_PATHS) - 1)
+
+    def test_async_deadline(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer(prodi_routes(slow_section="detail")) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                    return await client.get_prodi_profile(PRODI_ID, semester="20241", deadline=DELAY * 3)
+            started = time.perf_counter()
+            profile = asyncio.run(main())
+            elapsed = time.perf_counter() - started
+        self.assertLess(elapsed, DELAY * 6)
+        self.assertEqual(list(profile.errors), ["detail"])
+        self.assertEqual(len(profile.data), len(PRODI_SECTIONS) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+"""
+Offline tests for the asyncio client (pddiktipy.aio).
+
+Runs AsyncApi against a local stub server and checks that it shares
+validation, endpoints and error semantics with the synchronous client.
+"""
+
+import asyncio
+import base64
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from tests.stub_server import StubServer
+
+try:
+    from pddiktipy.aio import AsyncApi
+    import aiohttp  # noqa: F401
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+PT_ID = "6m7kg4twGiZAdNiUDMC9Q6KaGqUBqNU9_fLWD8DaSxMF-cIjwu8A7K6lWYKzaJXGBDQHsQ=="
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp not installed")
+class TestAsyncApi(unittest.TestCase):
+    """AsyncApi mirrors api over an aiohttp connection pool."""
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_every_api_method_is_mirrored(self):
+        """Each handle_errors-decorated api method has a coroutine counterpart."""
+        for name, func in vars(api).items():
+            if hasattr(func, '__wrapped__'):
+                self.assertTrue(asyncio.iscoroutinefunction(getattr(AsyncApi, name)), name)
+
+    def test_search_and_detail(self):
+        """Concurrent calls return the decoded JSON of each endpoint."""
+        routes = {
+            "/pencarian/pt/Unika": (200, [{"id": PT_ID, "nama": "Unika"}], {}),
+            f"/pt/prodi/{PT_ID}/20241": (200, [{"nama_prodi": "Sistem Informasi"}], {}),
+        }
+        with StubServer(routes) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1") as client:
+                    return await asyncio.gather(
+                        client.search_pt("Unika"),
+                        client.get_prodi_pt(PT_ID, 20241),
+                    )
+            pts, prodi = self.run_async(main())
+        self.assertEqual(pts[0]["nama"], "Unika")
+        self.assertEqual(prodi[0]["nama_prodi"], "Sistem Informasi")
+
+    def test_validation_and_errors_return_none(self):
+        """Invalid input and HTTP errors yield None without touching the network twice."""
+        with StubServer() as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, retries=0, user_ip="127.0.0.1") as client:
+                    invalid = await client.search_mahasiswa("")
+                    bad_semester = await client.get_prodi_pt(PT_ID, "2024")
+                    missing = await client.get_detail_pt(PT_ID)
+                    return invalid, bad_semester, missing
+            self.assertEqual(self.run_async(main()), (None, None, None))
+            self.assertEqual(sum(server.hits.values()), 1)
+
+    def test_retries_server_errors(self):
+        """5xx responses are retried before succeeding."""
+        calls = []
+
+        def flaky(handler):
+            calls.append(1)
+            return (503, {}, {}) if len(calls) < 2 else (200, {"ok": True}, {})
+
+        with StubServer({"/pt/count": flaky}) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, backoff_factor=0, user_ip="127.0.0.1") as client:
+                    return await client.get_pt_count()
+            self.assertEqual(self.run_async(main()), {"ok": True})
+        self.assertEqual(len(calls), 2)
+
+    def test_logo_is_base64(self):
+        """Logos are fetched and base64-encoded."""
+        png = b"\x89PNG\r\n\x1a\nfake"
+        routes = {f"/pt/logo/{PT_ID}": (200, png, {"Content-Type": "image/png"})}
+        with StubServer(routes) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1") as client:
+                    return await client.get_logo_pt(PT_ID)
+            self.assertEqual(base64.b64decode(self.run_async(main())), png)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+"""
+Offline smoke tests for the benchmark stub server and runners.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+BENCHMARKS = os.path.join(os.path.dirname(__file__), '..', 'benchmarks')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BENCHMARKS)
+
+from pddiktipy import api
+from fixtures import PT_ID, WORKLOAD
+from stub_server import StubServer
+
+
+class TestBenchmarkStub(unittest.TestCase):
+    """Fixture coverage and error injection of the benchmark stub."""
+
+    def test_every_api_method_has_a_fixture(self):
+        public = {name for name, member in vars(api).items()
+                  if hasattr(member, '__wrapped__') and not name.startswith('_')}
+        self.assertEqual(public, {method for method, _ in WORKLOAD})
+
+        with StubServer() as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", return_results=True) as client:
+                for method, args in WORKLOAD:
+                    result = getattr(client, method)(*args)
+                    self.assertTrue(result.ok, f"{method}: {result.error}")
+                    self.assertIsNotNone(result.data, method)
+                    self.assertEqual(result.attempts, 1, method)
+
+    def test_error_injection(self):
+        with StubServer(error_rate=0.5, error_status=502, seed=1) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, return_results=True) as client:
+                results = [client.get_detail_pt(PT_ID) for _ in range(40)]
+        failed = [r for r in results if not r.ok]
+        self.assertEqual(len(failed), server.errors)
+        self.assertTrue(0 < len(failed) < 40)
+        self.assertTrue(all(r.status_code == 502 for r in failed))
+
+    def test_fixtures_from_cassette(self):
+        from fixtures import load_fixtures
+        from pddiktipy.cassette import Cassette
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traffic.ndjson")
+            with StubServer(fixtures={"detail/pt/{id}": {"id": "recorded"}}) as server:
+                with Cassette(path, mode="record") as cassette:
+                    with api(base_url=server.base_url, user_ip="127.0.0.1", cassette=cassette) as client:
+                        client.get_detail_pt(PT_ID)
+                        client.get_pt_count()  # not in the custom fixtures: generic stub body
+            fixtures = load_fixtures(path)
+        self.assertEqual(fixtures["detail/pt/{id}"], {"id": "recorded"})
+        self.assertEqual(fixtures["pt/count"]["nama"], "Stub")
+
+    def test_runner_report(self):
+        spec = importlib.util.spec_from_file_location("bench_run", os.path.join(BENCHMARKS, "run.py"))
+        bench_run = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench_run)
+        report = bench_run.run(calls=20, latency=0.0, workers=4, scenarios=("single", "threaded"))
+        self.assertEqual(set(report["scenarios"]), {"single", "threaded"})
+        stats = report["scenarios"]["single"]
+        self.assertEqual((stats["calls"], stats["errors"]), (20, 0))
+        self.assertGreater(stats["throughput"], 0)
+        self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+        self.assertIn("peak_memory_kb", stats)
+        self.assertEqual(report["meta"]["calls"], 20)
+
+    def test_json_decode_report(self):
+        spec = importlib.util.spec_from_file_location("bench_json", os.path.join(BENCHMARKS, "json_decode.py"))
+        bench_json = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench_json)
+        report = bench_json.run(repeat=2, top=3)
+        self.assertEqual(report["meta"]["decoders"][0], "response.json")
+        self.assertIn("json", report["meta"]["decoders"])
+        self.assertEqual(len(report["payloads"]), 3)
+        sizes = [row["bytes"] for row in report["payloads"].values()]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertGreater(report["all"]["json"], 0)
+
+    def test_logo_memory_report(self):
+        spec = importlib.util.spec_from_file_location("bench_logo", os.path.join(BENCHMARKS, "logo_memory.py"))
+        bench_logo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench_logo)
+        report = bench_logo.run(sizes_kb=(512,), chunk_size=16 * 1024)
+        stats = report["sizes"][str(512 * 1024)]
+        self.assertEqual(set(stats), set(bench_logo.MODES))
+        # Streaming stays well below the logo size; the classic method holds several copies
+        self.assertLess(stats["stream_raw"]["peak_bytes"], stats["get_logo_pt"]["peak_bytes"] / 4)
+        self.assertGreater(stats["get_logo_pt"]["per_logo_byte"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,89 @@
+"""
+Offline tests for bulk fan-out (get_detail_mhs_many and friends).
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.exceptions import APIResponseError, ValidationError
+from tests.stub_server import StubServer
+
+IDS = [f"mahasiswa-{i:04d}" for i in range(30)]
+
+
+class ConcurrencyProbe:
+    """Stub route recording the peak number of concurrent requests."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, handler):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return 200, {"id": handler.path.rsplit("/", 1)[-1]}, {}
+
+
+class TestBulk(unittest.TestCase):
+    """Bounded concurrent fan-out with per-item results."""
+
+    def make_routes(self, probe):
+        routes = {f"/detail/mhs/{i}": probe for i in IDS}
+        del routes[f"/detail/mhs/{IDS[3]}"]  # answered with 404
+        return routes
+
+    def test_ordered_results_with_per_item_errors(self):
+        probe = ConcurrencyProbe()
+        with StubServer(self.make_routes(probe)) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, max_threads=4) as client:
+                results = list(client.get_detail_mhs_many(IDS + ["short"], max_workers=4, ordered=True))
+
+        self.assertEqual([r.key for r in results], IDS + ["short"])
+        self.assertEqual(results[0].data, {"id": IDS[0]})
+        self.assertIsInstance(results[3].error, APIResponseError)
+        self.assertEqual(results[3].error.status_code, 404)
+        self.assertIsInstance(results[-1].error, ValidationError)
+        self.assertEqual(sum(r.ok for r in results), len(IDS) - 1)
+        self.assertLessEqual(probe.peak, 4)
+        self.assertGreater(probe.peak, 1)
+
+    def test_unordered_yields_every_id(self):
+        probe = ConcurrencyProbe()
+        with StubServer(self.make_routes(probe)) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                results = list(client.get_detail_mhs_many(iter(IDS), max_workers=8))
+        self.assertCountEqual([r.key for r in results], IDS)
+        self.assertTrue(all(r.latency > 0 for r in results))
+
+    def test_async_fan_out(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        probe = ConcurrencyProbe()
+        with StubServer(self.make_routes(probe)) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                    return [r async for r in client.get_detail_mhs_many(IDS, max_workers=5, ordered=True)]
+            results = asyncio.run(main())
+        self.assertEqual([r.key for r in results], IDS)
+        self.assertFalse(results[3].ok)
+        self.assertLessEqual(probe.peak, 5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
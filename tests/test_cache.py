@@ -0,0 +1,93 @@
+"""
+Offline tests for response caching (pddiktipy.cache).
+"""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.cache import CacheEntry, CachePolicy, MemoryCache
+from pddiktipy.endpoints import endpoint_family, endpoint_path
+from tests.stub_server import StubServer
+
+PT_ID = "6m7kg4twGiZAdNiUDMC9Q6KaGqUBqNU9_fLWD8DaSxMF-cIjwu8A7K6lWYKzaJXGBDQHsQ=="
+
+
+class TestMemoryCache(unittest.TestCase):
+    """LRU + TTL behaviour of the in-memory backend."""
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first."""
+        cache = MemoryCache(maxsize=2)
+        far = time.time() + 60
+        cache.set("a", CacheEntry(1, far))
+        cache.set("b", CacheEntry(2, far))
+        cache.get("a")
+        cache.set("c", CacheEntry(3, far))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a").value, 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_expiry_counts_as_miss(self):
+        """Expired entries are dropped and reported as misses."""
+        cache = MemoryCache()
+        cache.set("a", CacheEntry(1, time.time() - 1))
+        self.assertIsNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"], stats["size"]), (0, 1, 1, 0))
+
+
+class TestCachePolicy(unittest.TestCase):
+    """TTL selection per endpoint family."""
+
+    def test_families(self):
+        self.assertEqual(endpoint_path("http://h/api/pt/count?x=1", "http://h/api"), "pt/count")
+        self.assertEqual(endpoint_family("dosen/count-active"), "count")
+        self.assertEqual(endpoint_family("pt/prodi/abc/20241"), "pt")
+        self.assertEqual(endpoint_family("visualisasi/pt-provinsi"), "visualisasi")
+
+    def test_overrides(self):
+        policy = CachePolicy(ttls={"pencarian": 0}, default_ttl=42)
+        self.assertEqual(policy.ttl_for("pencarian/mhs/ilham"), 0)
+        self.assertEqual(policy.ttl_for("news/list"), 42)
+
+
+class TestClientCache(unittest.TestCase):
+    """The cache sits in front of helper.response()."""
+
+    routes = {
+        "/visualisasi/pt-provinsi": (200, [{"provinsi": "Jawa Tengah"}], {}),
+        f"/detail/pt/{PT_ID}": (200, {"nama_pt": "Unika"}, {}),
+        "/pencarian/pt/Unika": (200, [{"id": PT_ID}], {}),
+    }
+
+    def test_repeated_calls_hit_network_once(self):
+        with StubServer(self.routes) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", cache=True) as client:
+                for _ in range(3):
+                    self.assertEqual(client.get_data_pt_provinsi()[0]["provinsi"], "Jawa Tengah")
+                    self.assertEqual(client.get_detail_pt(PT_ID)["nama_pt"], "Unika")
+                stats = client.H.cache.stats()
+        self.assertEqual(server.hits["/visualisasi/pt-provinsi"], 1)
+        self.assertEqual(server.hits[f"/detail/pt/{PT_ID}"], 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (4, 2))
+
+    def test_disabled_family_and_errors_are_not_cached(self):
+        policy = CachePolicy(ttls={"pencarian": 0})
+        with StubServer(self.routes) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                     cache=MemoryCache(), cache_policy=policy) as client:
+                client.search_pt("Unika")
+                client.search_pt("Unika")
+                client.get_detail_prodi(PT_ID)
+                client.get_detail_prodi(PT_ID)
+        self.assertEqual(server.hits["/pencarian/pt/Unika"], 2)
+        self.assertEqual(server.hits[f"/prodi/detail/{PT_ID}"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
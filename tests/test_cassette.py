@@ -0,0 +1,129 @@
+"""
+Offline tests for cassette record/replay.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.cassette import Cassette
+from pddiktipy.exceptions import APIConnectionError
+from pddiktipy.helper import helper
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+MISSING_ID = "pt-missing-0123456789"
+SEMESTER = "20241"
+OFFLINE = "http://127.0.0.1:9"
+
+
+def routes():
+    return {
+        f"/detail/pt/{PT_ID}": (200, {"id": PT_ID}, {"X-Trace": "abc"}),
+        f"/pt/prodi/{PT_ID}/{SEMESTER}": (200, [{"id": "prodi-1"}] * 50, {}),
+    }
+
+
+class TestCassette(unittest.TestCase):
+    """Recording real exchanges and replaying them without network."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "traffic.ndjson")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, delay=0.0):
+        with StubServer(routes(), delay=delay) as server:
+            with Cassette(self.path, mode="record") as cassette:
+                with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cassette=cassette) as client:
+                    self.assertEqual(client.get_detail_pt(PT_ID), {"id": PT_ID})
+                    self.assertIsNone(client.get_detail_pt(MISSING_ID))
+                    self.assertEqual(len(client.get_prodi_pt(PT_ID, SEMESTER)), 50)
+            # connection failures are recorded too
+            with Cassette(self.path, mode="record") as cassette:
+                with api(base_url=OFFLINE, user_ip="127.0.0.1", retries=0, cassette=cassette) as client:
+                    self.assertIsNone(client.get_pt_count())
+        return server
+
+    def test_records_only_api_paths(self):
+        ip_routes = {"/?format=json": (200, {"ip": "203.0.113.7"}, {})}
+        with StubServer(routes()) as server, StubServer(ip_routes) as ipify:
+            with Cassette(self.path, mode="record") as cassette, \
+                    mock.patch.object(helper, "IP_LOOKUP_URL", f"{ipify.base_url}/?format=json"):
+                with api(base_url=server.base_url, retries=0, cassette=cassette) as client:
+                    self.assertEqual(client.H.get_ip(), "203.0.113.7")
+                    client.get_detail_pt(PT_ID)
+            self.assertGreaterEqual(ipify.hits["/?format=json"], 1)
+        with Cassette(self.path) as cassette:
+            self.assertEqual([entry.key for entry in cassette.entries()], [f"/detail/pt/{PT_ID}"])
+
+    def test_replay_without_network(self):
+        self.record()
+        with Cassette(self.path, timing=0) as cassette:
+            self.assertEqual(len(cassette), 4)
+            with api(base_url=OFFLINE, user_ip="127.0.0.1", retries=0, cassette=cassette,
+                     return_results=True) as client:
+                ok = client.get_detail_pt(PT_ID)
+                self.assertEqual((ok.data, ok.status_code), ({"id": PT_ID}, 200))
+                missing = client.get_detail_pt(MISSING_ID)
+                self.assertEqual(missing.status_code, 404)
+                self.assertEqual(len(client.get_prodi_pt(PT_ID, SEMESTER).data), 50)
+                self.assertEqual(client.get_pt_count().error_type, "APIConnectionError")
+                unknown = client.get_rasio_pt(PT_ID)
+                self.assertIsInstance(unknown.error, APIConnectionError)
+                self.assertIn("cassette", str(unknown.error))
+                # Replay starts over once the recorded responses run out
+                self.assertEqual(client.get_detail_pt(PT_ID).data, {"id": PT_ID})
+
+    def test_replay_skips_ip_lookup(self):
+        self.record()
+        ip_routes = {"/?format=json": (200, {"ip": "203.0.113.7"}, {})}
+        with StubServer(ip_routes) as ipify:
+            with Cassette(self.path, timing=0) as cassette, \
+                    mock.patch.object(helper, "IP_LOOKUP_URL", f"{ipify.base_url}/?format=json"):
+                with api(base_url=OFFLINE, retries=0, cassette=cassette) as client:
+                    self.assertEqual(client.get_detail_pt(PT_ID), {"id": PT_ID})
+                    self.assertEqual(client.H.get_ip(), client.H.decodes(client.H.ip))
+            self.assertEqual(ipify.hits["/?format=json"], 0)
+
+    def test_scaled_timing(self):
+        self.record(delay=0.1)
+        for timing, low, high in ((1.0, 0.09, 1.0), (0.0, 0.0, 0.05)):
+            with Cassette(self.path, timing=timing) as cassette:
+                with api(base_url=OFFLINE, user_ip="127.0.0.1", cassette=cassette) as client:
+                    start = time.perf_counter()
+                    client.get_detail_pt(PT_ID)
+                    elapsed = time.perf_counter() - start
+            self.assertTrue(low <= elapsed < high, (timing, elapsed))
+
+    def test_async_record_and_replay(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        async def fetch(base_url, cassette):
+            async with AsyncApi(base_url=base_url, user_ip="127.0.0.1", retries=0, cassette=cassette) as client:
+                return await asyncio.gather(client.get_detail_pt(PT_ID), client.get_prodi_pt(PT_ID, SEMESTER))
+
+        with StubServer(routes()) as server:
+            with Cassette(self.path, mode="record") as cassette:
+                recorded = asyncio.run(fetch(server.base_url, cassette))
+        with Cassette(self.path, timing=0) as cassette:
+            replayed = asyncio.run(fetch(OFFLINE, cassette))
+        self.assertEqual(recorded, replayed)
+        self.assertEqual(replayed[0], {"id": PT_ID})
+        self.assertEqual(server.hits[f"/detail/pt/{PT_ID}"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,109 @@
+"""
+Offline tests for per-family circuit breakers.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api, CircuitOpenError
+from pddiktipy.circuit import CircuitBreaker, CircuitBreakers
+from pddiktipy.exceptions import APIResponseError, APITimeoutError
+from tests.stub_server import StubServer
+
+DOSEN_ID = "dosen-0123456789"
+PT_ID = "pt-0123456789"
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """State transitions of a single breaker."""
+
+    def test_opens_on_error_rate_and_recovers_through_probe(self):
+        breaker = CircuitBreaker("dosen", failure_rate=0.5, min_requests=4, open_timeout=0.1)
+        for error in (None, APITimeoutError("t"), None, APITimeoutError("t")):
+            probe = breaker.before_call()
+            breaker.record(error, probe)
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        self.assertEqual(breaker.snapshot()["rejected"], 1)
+
+        time.sleep(0.12)
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.before_call())
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()  # only one probe at a time
+        breaker.record(APIResponseError("boom", status_code=502), probe=True)
+        self.assertEqual(breaker.state, "open")
+
+        time.sleep(0.12)
+        probe = breaker.before_call()
+        breaker.record(None, probe)
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.snapshot()["opened"], 2)
+
+    def test_client_errors_do_not_count(self):
+        breaker = CircuitBreaker("pt", min_requests=2)
+        for _ in range(5):
+            breaker.record(APIResponseError("missing", status_code=404), breaker.before_call())
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.snapshot()["failures"], 0)
+
+
+class TestClientCircuitBreaker(unittest.TestCase):
+    """Fail fast per endpoint family on a shared client."""
+
+    def routes(self):
+        return {
+            f"/dosen/profile/{DOSEN_ID}": (503, {"message": "down"}, {}),
+            f"/detail/pt/{PT_ID}": (200, {"id": PT_ID}, {}),
+        }
+
+    def test_fails_fast_per_family(self):
+        breakers = CircuitBreakers(min_requests=3, open_timeout=0.2, overrides={"detail": {"min_requests": 50}})
+        with StubServer(self.routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, circuit_breaker=breakers) as client:
+                for _ in range(3):
+                    self.assertIsNone(client.get_dosen_profile(DOSEN_ID))
+                result = client._call_result("get_dosen_profile", DOSEN_ID, DOSEN_ID)
+                self.assertIsInstance(result.error, CircuitOpenError)
+                self.assertEqual(server.hits[f"/dosen/profile/{DOSEN_ID}"], 3)
+                # Other families are unaffected
+                self.assertEqual(client.get_detail_pt(PT_ID), {"id": PT_ID})
+
+                states = breakers.states()
+                self.assertEqual(states["dosen"]["state"], "open")
+                self.assertEqual(states["detail"]["state"], "closed")
+                self.assertTrue(breakers.is_open("dosen"))
+
+                # Upstream recovers; the half-open probe closes the circuit
+                server.routes[f"/dosen/profile/{DOSEN_ID}"] = (200, {"id": DOSEN_ID}, {})
+                time.sleep(0.25)
+                self.assertEqual(client.get_dosen_profile(DOSEN_ID), {"id": DOSEN_ID})
+                self.assertEqual(breakers.states()["dosen"]["state"], "closed")
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer(self.routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                                    circuit_breaker=CircuitBreakers(min_requests=2)) as client:
+                    for _ in range(4):
+                        await client.get_dosen_profile(DOSEN_ID)
+                    return client.H.circuit_breaker.states()["dosen"]
+            state = asyncio.run(main())
+        self.assertEqual(state["state"], "open")
+        self.assertEqual(state["rejected"], 2)
+        self.assertEqual(server.hits[f"/dosen/profile/{DOSEN_ID}"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,159 @@
+"""
+Offline tests for conditional revalidation of cached responses.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.cache import CacheEntry, CachePolicy, MemoryCache
+from pddiktipy.metrics import MetricsRegistry
+from pddiktipy.sqlite_cache import SQLiteCache
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+PLAIN_ID = "pt-plain-0123456789"
+DETAIL = {"id": PT_ID, "nama_pt": "Universitas Contoh"}
+ETAG = '"detail-v1"'
+LAST_MODIFIED = "Mon, 05 Aug 2024 00:00:00 GMT"
+TTL = 0.05
+
+
+def detail_route(handler):
+    if handler.headers.get("If-None-Match") == ETAG:
+        return 304, b"", {"ETag": ETAG}
+    return 200, DETAIL, {"ETag": ETAG, "Last-Modified": LAST_MODIFIED}
+
+
+def routes():
+    return {
+        f"/detail/pt/{PT_ID}": detail_route,
+        f"/detail/pt/{PLAIN_ID}": (200, DETAIL, {}),
+    }
+
+
+def policy():
+    return CachePolicy(ttls={"detail": TTL})
+
+
+class CountingDecoder:
+    """JSON decoder counting its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, data):
+        import json
+        self.calls += 1
+        return json.loads(data)
+
+
+class TestConditionalGet(unittest.TestCase):
+    """304 answers refresh cache entries without a body."""
+
+    def test_revalidates_expired_entry(self):
+        cache, metrics, decoder = MemoryCache(), MetricsRegistry(), CountingDecoder()
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=cache,
+                     cache_policy=policy(), metrics=metrics, json_decoder=decoder) as client:
+                first = client.get_detail_pt(PT_ID)
+                time.sleep(TTL * 2)
+                second = client.get_detail_pt(PT_ID)
+                third = client.get_detail_pt(PT_ID)
+            sent = [headers for path, headers in server.requests]
+
+        self.assertEqual(first, DETAIL)
+        self.assertEqual((second, third), (DETAIL, DETAIL))
+        self.assertEqual(len(sent), 2)
+        self.assertNotIn("If-None-Match", sent[0])
+        self.assertEqual(sent[1].get("If-None-Match"), ETAG)
+        self.assertEqual(sent[1].get("If-Modified-Since"), LAST_MODIFIED)
+        # The body is decoded once; the 304 only refreshed the entry
+        self.assertEqual(decoder.calls, 1)
+        stats = metrics.snapshot()["detail/pt/{id}"]
+        self.assertEqual(stats["statuses"], {200: 1, 304: 1})
+        self.assertEqual(stats["saved_bytes"], stats["bytes"])
+        self.assertGreater(stats["saved_bytes"], 0)
+        self.assertIn('pddikti_saved_bytes_total{endpoint="detail/pt/{id}"}', metrics.to_prometheus())
+
+    def test_entries_without_validators_refetch(self):
+        cache = MemoryCache()
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=cache,
+                     cache_policy=policy()) as client:
+                client.get_detail_pt(PLAIN_ID)
+                time.sleep(TTL * 2)
+                self.assertEqual(client.get_detail_pt(PLAIN_ID), DETAIL)
+            sent = [headers for path, headers in server.requests]
+
+        self.assertEqual(len(sent), 2)
+        self.assertNotIn("If-None-Match", sent[1])
+        self.assertNotIn("If-Modified-Since", sent[1])
+        self.assertEqual(cache.stats()["size"], 1)
+
+    def test_sqlite_keeps_validators(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            with StubServer(routes()) as server:
+                with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                         cache=SQLiteCache(path), cache_policy=policy()) as client:
+                    client.get_detail_pt(PT_ID)
+                time.sleep(TTL * 2)
+                # A new client over the same database revalidates the stored entry
+                cache = SQLiteCache(path)
+                self.assertEqual(cache.evict(), 0)
+                with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                         cache=cache, cache_policy=policy()) as client:
+                    self.assertEqual(client.get_detail_pt(PT_ID), DETAIL)
+                sent = [headers for path, headers in server.requests]
+                entry = cache.get_stale(f"{server.base_url}/detail/pt/{PT_ID}")
+            self.assertEqual(sent[1].get("If-None-Match"), ETAG)
+            self.assertEqual((entry.etag, entry.last_modified), (ETAG, LAST_MODIFIED))
+
+    def test_sqlite_migrates_old_schema(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            conn = sqlite3.connect(path)
+            conn.executescript(
+                "CREATE TABLE responses (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL);"
+            )
+            conn.close()
+            cache = SQLiteCache(path)
+            cache.set("key", CacheEntry({"a": 1}, time.time() + 60, etag=ETAG, size=7))
+            entry = cache.get("key")
+            self.assertEqual((entry.value, entry.etag, entry.size), ({"a": 1}, ETAG, 7))
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        metrics = MetricsRegistry()
+        with StubServer(routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                                    cache=MemoryCache(), cache_policy=policy(), metrics=metrics) as client:
+                    first = await client.get_detail_pt(PT_ID)
+                    await asyncio.sleep(TTL * 2)
+                    return first, await client.get_detail_pt(PT_ID)
+            first, second = asyncio.run(main())
+            sent = [headers for path, headers in server.requests]
+
+        self.assertEqual((first, second), (DETAIL, DETAIL))
+        self.assertEqual(sent[1].get("If-None-Match"), ETAG)
+        stats = metrics.snapshot()["detail/pt/{id}"]
+        self.assertEqual(stats["statuses"], {200: 1, 304: 1})
+        self.assertGreater(stats["saved_bytes"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
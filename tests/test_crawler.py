@@ -0,0 +1,114 @@
+"""
+Offline tests for the resumable catalogue crawler.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.crawler import Crawler, Journal
+from tests.stub_server import StubServer
+
+SEMESTER = "20241"
+PTS = {"pt-aaaaaaaaaa": ["prodi-a1-xxxxxxxx", "prodi-a2-xxxxxxxx"],
+       "pt-bbbbbbbbbb": ["prodi-b1-xxxxxxxx", "prodi-b2-xxxxxxxx"],
+       "pt-cccccccccc": ["prodi-c1-xxxxxxxx"]}
+
+
+def catalogue_routes():
+    routes = {
+        "/pencarian/pt/universitas": (200, [{"id": "pt-aaaaaaaaaa", "nama": "A"},
+                                            {"id": "pt-bbbbbbbbbb", "nama": "B"}], {}),
+        "/pencarian/pt/institut": (200, [{"id": "pt-bbbbbbbbbb", "nama": "B"},
+                                         {"id": "pt-cccccccccc", "nama": "C"}], {}),
+    }
+    for pt_id, prodi_ids in PTS.items():
+        routes[f"/pt/prodi/{pt_id}/{SEMESTER}"] = (
+            200, [{"id_sms": p, "nama_prodi": p} for p in prodi_ids], {})
+        for prodi_id in prodi_ids:
+            routes[f"/dosen/homebase/{prodi_id}?semester={SEMESTER}"] = (
+                200, [{"nama": f"dosen {i} {prodi_id}"} for i in range(2)], {})
+    # Permanent failure: no homebase data for this prodi
+    del routes[f"/dosen/homebase/prodi-c1-xxxxxxxx?semester={SEMESTER}"]
+    return routes
+
+
+def read_ndjson(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestCrawler(unittest.TestCase):
+    """Crawl PT -> prodi -> homebase with checkpoints."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def crawl(self, server, keywords, **options):
+        with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+            return Crawler(client, self.dir, SEMESTER, max_workers=4, **options).run(keywords)
+
+    def test_full_crawl(self):
+        reports = []
+        with StubServer(catalogue_routes()) as server:
+            stats = self.crawl(server, ["universitas", "institut"], progress=reports.append)
+
+        pts = read_ndjson(os.path.join(self.dir, "pt.ndjson"))
+        prodis = read_ndjson(os.path.join(self.dir, "prodi.ndjson"))
+        homebase = read_ndjson(os.path.join(self.dir, "homebase.ndjson"))
+        self.assertCountEqual([p["id"] for p in pts], list(PTS))
+        self.assertEqual(len(prodis), 5)
+        self.assertTrue(all(p["pt_id"] in PTS for p in prodis))
+        self.assertEqual(len(homebase), 8)
+        self.assertEqual(stats.records, {"pt": 3, "prodi": 5, "homebase": 8})
+        # 2 searches + 3 PT + 5 prodi tasks, one of which 404s
+        self.assertEqual(stats.done, 9)
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(stats.pending, 0)
+        self.assertEqual(server.hits["/pt/prodi/pt-bbbbbbbbbb/20241"], 1)
+        self.assertIs(reports[-1], stats)
+
+    def test_resume_after_failure(self):
+        routes = catalogue_routes()
+        broken = f"/pt/prodi/pt-bbbbbbbbbb/{SEMESTER}"
+        good = routes[broken]
+        routes[broken] = (503, {"message": "unavailable"}, {})
+        with StubServer(routes) as server:
+            first = self.crawl(server, ["universitas", "institut"])
+            self.assertEqual(first.pending, 1)
+            journal = Journal(os.path.join(self.dir, "journal.ndjson"))
+            self.assertEqual(journal.pending(), [("pt", "pt-bbbbbbbbbb")])
+            journal.close()
+
+            server.routes[broken] = good
+            server.hits.clear()
+            second = self.crawl(server, ["universitas", "institut"])
+
+        self.assertEqual(second.pending, 0)
+        # Only the pending PT and its prodi were fetched again
+        self.assertEqual(sorted(server.hits), sorted([
+            broken,
+            f"/dosen/homebase/prodi-b1-xxxxxxxx?semester={SEMESTER}",
+            f"/dosen/homebase/prodi-b2-xxxxxxxx?semester={SEMESTER}",
+        ]))
+        prodis = read_ndjson(os.path.join(self.dir, "prodi.ndjson"))
+        self.assertEqual(len(prodis), 5)
+
+    def test_without_homebase(self):
+        with StubServer(catalogue_routes()) as server:
+            stats = self.crawl(server, ["universitas"], homebase=False)
+        self.assertEqual(stats.records, {"pt": 2, "prodi": 4})
+        self.assertFalse(any(path.startswith("/dosen/") for path in server.hits))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,158 @@
+"""
+Offline tests for the HTTP helper (pddiktipy.helper).
+
+Covers header construction and the background public-IP lookup; no request
+leaves the machine.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.helper import helper
+from tests.stub_server import StubServer
+
+
+def slow_ipify(delay, ip="203.0.113.7"):
+    """session.get replacement that answers like ipify after ``delay`` seconds."""
+    def get(url, **kwargs):
+        time.sleep(delay)
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"ip": ip}
+        return response
+    return get
+
+
+class TestHeaders(unittest.TestCase):
+    """X-User-IP resolution stays off the request path."""
+
+    def test_static_ip_never_looks_up(self):
+        """A configured user_ip is used as-is without any network call."""
+        with mock.patch.object(helper, "session") as session:
+            h = helper(user_ip="198.51.100.1")
+            self.assertEqual(h.get_headers()["X-User-IP"], "198.51.100.1")
+            self.assertEqual(h.get_ip(), "198.51.100.1")
+            session.get.assert_not_called()
+
+    def test_cold_cache_does_not_block(self):
+        """The first headers use the fallback IP while the lookup runs in the background."""
+        with mock.patch.object(helper, "session") as session:
+            session.get.side_effect = slow_ipify(0.3)
+            start = time.perf_counter()
+            h = helper()
+            headers = h.get_headers()
+            self.assertLess(time.perf_counter() - start, 0.1)
+            self.assertEqual(headers["X-User-IP"], h.decodes(h.ip))
+
+            deadline = time.time() + 2
+            while h.get_headers()["X-User-IP"] != "203.0.113.7" and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(h.get_headers()["X-User-IP"], "203.0.113.7")
+            self.assertEqual(session.get.call_count, 1)
+
+    def test_expired_ip_refreshes_once_in_background(self):
+        """Concurrent callers on an expired cache trigger a single lookup."""
+        with mock.patch.object(helper, "session") as session:
+            session.get.side_effect = slow_ipify(0.2, ip="203.0.113.8")
+            h = helper(resolve_ip=False)
+            h._resolve_ip, h._cached_ip, h._ip_cache_time = True, "203.0.113.7", 0
+
+            threads = [threading.Thread(target=h.get_headers) for _ in range(16)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(h.get_headers()["X-User-IP"], "203.0.113.7")
+            time.sleep(0.4)
+            self.assertEqual(h.get_headers()["X-User-IP"], "203.0.113.8")
+            self.assertEqual(session.get.call_count, 1)
+
+    def test_header_dict_is_built_once(self):
+        """The same dict is reused until the IP changes."""
+        h = helper(user_ip="198.51.100.1")
+        self.assertIs(h.get_headers(), h.get_headers())
+        self.assertEqual(h.get_headers()["Host"], h.decodes(h.host))
+
+    def test_endpoint_is_decoded_once(self):
+        """endpoint() returns the API root decoded at construction."""
+        h = helper(user_ip="198.51.100.1")
+        with mock.patch.object(h, "decodes", wraps=h.decodes) as decodes:
+            for _ in range(3):
+                self.assertEqual(h.endpoint(), helper.decodes(h, h.url))
+            self.assertEqual(decodes.call_count, 0)
+
+    def test_base_url_drops_host_header(self):
+        """A custom base_url lets the HTTP client derive Host itself."""
+        h = helper(base_url="http://127.0.0.1:8000/", user_ip="198.51.100.1")
+        self.assertEqual(h.endpoint(), "http://127.0.0.1:8000")
+        self.assertNotIn("Host", h.get_headers())
+
+
+class TestSharedClient(unittest.TestCase):
+    """One client instance shared by a thread pool."""
+
+    def test_session_is_created_once_under_contention(self):
+        """Racing threads all get the same lazily created session."""
+        h = helper(user_ip="198.51.100.1")
+        barrier = threading.Barrier(32)
+        sessions = []
+
+        def grab():
+            barrier.wait()
+            sessions.append(h.session)
+
+        threads = [threading.Thread(target=grab) for _ in range(32)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(s) for s in sessions}), 1)
+
+    def test_pool_configuration(self):
+        """max_threads sizes the pool and blocks instead of churning connections."""
+        h = helper(user_ip="198.51.100.1", pool_connections=4, max_threads=64)
+        adapter = h.session.get_adapter("https://example.org")
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 64)
+        self.assertTrue(adapter._pool_block)
+
+    def test_per_thread_stats(self):
+        """Every worker thread gets its own request counters."""
+        with StubServer({"/pt/count": (200, {"count": 1}, {})}, delay=0.01) as server:
+            client = api(base_url=server.base_url, user_ip="198.51.100.1", max_threads=16)
+            threads = [threading.Thread(target=lambda: [client.get_pt_count() for _ in range(5)],
+                                        name=f"worker-{i}") for i in range(16)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            client.close()
+
+        stats = client.H.thread_stats()
+        self.assertEqual(len(stats), 16)
+        self.assertTrue(all(s["requests"] == 5 and s["errors"] == 0 for s in stats.values()))
+        self.assertGreater(stats["worker-0"]["avg_time"], 0)
+
+    def test_thread_stats_survive_reused_names(self):
+        """Workers of successive executors share a name without losing counts."""
+        with StubServer({"/pt/count": (200, {"count": 1}, {})}) as server:
+            client = api(base_url=server.base_url, user_ip="198.51.100.1")
+            for _ in range(3):
+                with ThreadPoolExecutor(1, thread_name_prefix="pool") as pool:
+                    list(pool.map(lambda _: client.get_pt_count(), range(4)))
+            client.close()
+
+        stats = client.H.thread_stats()
+        self.assertEqual(stats["pool_0"]["requests"], 12)
+        self.assertEqual(stats["pool_0"]["errors"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
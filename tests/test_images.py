@@ -0,0 +1,133 @@
+"""
+Offline tests for streaming image downloads.
+"""
+
+import asyncio
+import base64
+import importlib.util
+import io
+import os
+import socket
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.images import aiter_base64, iter_base64, write_chunks
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+MISSING_ID = "pt-missing-0123456789"
+LOGO = bytes(range(256)) * 1000 + b"tail"
+
+
+def routes():
+    return {
+        f"/pt/logo/{PT_ID}": (200, LOGO, {"Content-Type": "image/png"}),
+        f"/prodi/logo-pt/{PT_ID}": (200, LOGO, {"Content-Type": "image/png"}),
+    }
+
+
+class TestChunkedBase64(unittest.TestCase):
+    """Incremental base64 matches one-shot encoding."""
+
+    def test_matches_b64encode(self):
+        for sizes in ([1, 1, 1, 1], [2, 5, 7], [3, 3], [4096, 1, 2], []):
+            data = os.urandom(sum(sizes))
+            chunks, offset = [], 0
+            for size in sizes:
+                chunks.append(data[offset:offset + size])
+                offset += size
+            encoded = list(iter_base64(chunks))
+            self.assertEqual(b"".join(encoded), base64.b64encode(data), sizes)
+            self.assertTrue(all(b"=" not in chunk for chunk in encoded[:-1]))
+
+    def test_async_matches_b64encode(self):
+        async def chunks():
+            for chunk in (b"ab", b"cde", b"f", b"gh"):
+                yield chunk
+
+        async def main():
+            return b"".join([chunk async for chunk in aiter_base64(chunks())])
+
+        self.assertEqual(asyncio.run(main()), base64.b64encode(b"abcdefgh"))
+
+    def test_write_chunks_destinations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "logo.png")
+            self.assertEqual(write_chunks([b"ab", b"c"], path), 3)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"abc")
+        buffer = io.BytesIO()
+        write_chunks(iter([b"x", b"yz"]), buffer)
+        self.assertEqual(buffer.getvalue(), b"xyz")
+        left, right = socket.socketpair()
+        with left, right:
+            write_chunks([b"sock", b"et"], left)
+            self.assertEqual(right.recv(16), b"socket")
+        with self.assertRaises(TypeError):
+            write_chunks([b"x"], object())
+
+
+class TestStreamLogo(unittest.TestCase):
+    """``stream_logo_pt``/``stream_logo_prodi`` on the sync and async clients."""
+
+    def test_sync_modes(self):
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                chunks = list(client.stream_logo_pt(PT_ID, chunk_size=10000))
+                encoded = b"".join(client.stream_logo_prodi(PT_ID, encode_base64=True))
+                buffer = io.BytesIO()
+                written = client.stream_logo_pt(PT_ID, buffer)
+                classic = client.get_logo_pt(PT_ID)
+                missing = client.stream_logo_pt(MISSING_ID)
+                result = api(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                             return_results=True).stream_logo_pt(MISSING_ID)
+
+        self.assertEqual(b"".join(chunks), LOGO)
+        self.assertTrue(all(len(chunk) <= 10000 for chunk in chunks))
+        self.assertEqual(encoded.decode("ascii"), classic)
+        self.assertEqual((written, buffer.getvalue()), (len(LOGO), LOGO))
+        self.assertIsNone(missing)
+        self.assertEqual(result.error_type, "APIResponseError")
+        self.assertEqual(result.status_code, 404)
+
+    def test_connection_released_for_reuse(self):
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, pool_maxsize=1,
+                     pool_block=True) as client:
+                for _ in range(3):
+                    chunks = client.stream_logo_pt(PT_ID)
+                    next(chunks)
+                    chunks.close()
+                self.assertEqual(client.get_logo_pt(PT_ID), base64.b64encode(LOGO).decode("ascii"))
+
+    def test_async_modes(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer(routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                    chunks = await client.stream_logo_pt(PT_ID, chunk_size=10000)
+                    raw = [chunk async for chunk in chunks]
+                    encoded = b"".join([chunk async for chunk in
+                                        await client.stream_logo_prodi(PT_ID, encode_base64=True)])
+                    buffer = io.BytesIO()
+                    written = await client.stream_logo_pt(PT_ID, buffer)
+                    missing = await client.stream_logo_pt(MISSING_ID)
+                    return raw, encoded, written, buffer.getvalue(), missing
+            raw, encoded, written, body, missing = asyncio.run(main())
+
+        self.assertEqual(b"".join(raw), LOGO)
+        self.assertTrue(all(len(chunk) <= 10000 for chunk in raw))
+        self.assertEqual(encoded, base64.b64encode(LOGO))
+        self.assertEqual((written, body), (len(LOGO), LOGO))
+        self.assertIsNone(missing)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
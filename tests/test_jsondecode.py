@@ -0,0 +1,105 @@
+"""
+Offline tests for pluggable JSON decoding.
+"""
+
+import asyncio
+import importlib.util
+import json
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.exceptions import PDDIKTIError, ValidationError
+from pddiktipy.jsondecode import available_decoders, get_decoder
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+BROKEN_ID = "pt-broken-0123456789"
+
+
+def routes():
+    return {
+        f"/detail/pt/{PT_ID}": (200, {"id": PT_ID, "nama": "Universitas Katolik Soegijapranata"}, {}),
+        f"/detail/pt/{BROKEN_ID}": (200, b"{not json", {"Content-Type": "application/json"}),
+    }
+
+
+class TestGetDecoder(unittest.TestCase):
+    """Resolution of the ``json_decoder`` option."""
+
+    def test_backends_agree(self):
+        body = json.dumps({"nama": "Universitas Gadjah Mada", "jumlah": [1, 2.5, None, True]}).encode("utf-8")
+        for name in list(available_decoders()) + ["auto"]:
+            self.assertEqual(get_decoder(name)(body), json.loads(body), name)
+
+    def test_auto_prefers_installed_fast_backend(self):
+        fastest = next(iter(available_decoders()))
+        self.assertEqual(get_decoder().__module__, get_decoder(fastest).__module__)
+
+    def test_fast_backend_falls_back_to_stdlib(self):
+        decode = get_decoder()
+        self.assertTrue(math.isnan(decode(b'{"rasio": NaN}')["rasio"]))
+        self.assertEqual(decode(b'{"rasio": Infinity}')["rasio"], float("inf"))
+        with self.assertRaises(ValueError):
+            decode(b"{not json")
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValidationError):
+            get_decoder("yaml")
+        custom = lambda data: data  # noqa: E731
+        self.assertIs(get_decoder(custom), custom)
+        for name in ("orjson", "simdjson"):
+            if name not in available_decoders():
+                with self.assertRaises(PDDIKTIError):
+                    get_decoder(name)
+
+
+class TestClientDecoding(unittest.TestCase):
+    """Clients decode raw body bytes with the configured backend."""
+
+    def test_sync_client(self):
+        seen = []
+
+        def decode(data):
+            seen.append(data)
+            return json.loads(data)
+
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, json_decoder=decode) as client:
+                self.assertEqual(client.get_detail_pt(PT_ID)["id"], PT_ID)
+                self.assertIsNone(client.get_detail_pt(BROKEN_ID))
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, json_decoder="json",
+                     return_results=True) as client:
+                result = client.get_detail_pt(BROKEN_ID)
+        self.assertIsInstance(seen[0], bytes)
+        self.assertEqual(len(seen), 2)
+        self.assertEqual(result.error_type, "APIResponseError")
+        self.assertIn("Invalid JSON", str(result.error))
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        seen = []
+
+        def decode(data):
+            seen.append(data)
+            return json.loads(data)
+
+        with StubServer(routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                                    json_decoder=decode) as client:
+                    return await client.get_detail_pt(PT_ID)
+            data = asyncio.run(main())
+        self.assertEqual(data["id"], PT_ID)
+        self.assertIsInstance(seen[0], bytes)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+"""
+Offline tests for the content-addressed logo store.
+"""
+
+import asyncio
+import base64
+import hashlib
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.logostore import LogoStore
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+PLAIN_ID = "pt-plain-0123456789"
+LOGO = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 100
+ETAG = '"logo-v1"'
+LAST_MODIFIED = "Mon, 05 Aug 2024 00:00:00 GMT"
+
+
+def logo_route(handler):
+    if handler.headers.get("If-None-Match") == ETAG:
+        return 304, b"", {"ETag": ETAG}
+    return 200, LOGO, {"Content-Type": "image/png", "ETag": ETAG, "Last-Modified": LAST_MODIFIED}
+
+
+def routes():
+    return {
+        f"/pt/logo/{PT_ID}": logo_route,
+        f"/prodi/logo-pt/{PT_ID}": logo_route,
+        f"/pt/logo/{PLAIN_ID}": (200, LOGO, {"Content-Type": "image/png"}),
+    }
+
+
+class TestLogoStore(unittest.TestCase):
+    """Disk hits, conditional revalidation and content addressing."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_repeats_served_from_disk(self):
+        store = LogoStore(self.tmp.name)
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, logo_store=store) as client:
+                first = client.get_logo_pt(PT_ID)
+                second = client.get_logo_pt(PT_ID)
+                streamed = b"".join(client.stream_logo_pt(PT_ID, chunk_size=1000))
+                client.get_logo_prodi(PT_ID)
+            hits = server.hits[f"/pt/logo/{PT_ID}"]
+
+        self.assertEqual(first, base64.b64encode(LOGO).decode("ascii"))
+        self.assertEqual((second, streamed), (first, LOGO))
+        self.assertEqual(hits, 1)
+        stats = store.stats()
+        self.assertEqual((stats["downloads"], stats["hits"]), (2, 2))
+        # PT and prodi logo share one content-addressed file
+        self.assertEqual((stats["logos"], stats["files"], stats["bytes"]), (2, 1, len(LOGO)))
+        digest = hashlib.sha256(LOGO).hexdigest()
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "objects", digest[:2], digest)))
+
+    def test_conditional_revalidation(self):
+        store = LogoStore(self.tmp.name, max_age=0)
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, logo_store=store) as client:
+                self.assertIsNotNone(client.get_logo_pt(PT_ID))
+                self.assertEqual(client.get_logo_pt(PT_ID), base64.b64encode(LOGO).decode("ascii"))
+                client.get_logo_pt(PLAIN_ID)
+                client.get_logo_pt(PLAIN_ID)
+            sent = [headers for path, headers in server.requests]
+
+        self.assertEqual(sent[1].get("If-None-Match"), ETAG)
+        self.assertEqual(sent[1].get("If-Modified-Since"), LAST_MODIFIED)
+        self.assertNotIn("If-None-Match", sent[3])
+        stats = store.stats()
+        self.assertEqual((stats["revalidated"], stats["downloads"]), (1, 3))
+
+    def test_prune(self):
+        store = LogoStore(self.tmp.name)
+        record = store.put("/pt/logo/a", b"one", {"Content-Type": "image/png"})
+        store.put("/pt/logo/b", b"two")
+        with store.open(record) as data:
+            self.assertEqual(bytes(data), b"one")
+        store.remove("/pt/logo/a")
+        self.assertIsNone(store.get("/pt/logo/a"))
+        self.assertEqual(store.prune(), 1)
+        self.assertEqual(store.stats()["files"], 1)
+        self.assertEqual(b"".join(store.iter_chunks(store.get("/pt/logo/b"))), b"two")
+
+    def test_prune_waits_for_commit(self):
+        store = LogoStore(self.tmp.name)
+        save = store._save
+        pruned = []
+        pruning = threading.Thread(target=lambda: pruned.append(store.prune()))
+
+        def save_while_pruning(record):
+            # prune starts after the file is in place but before its index entry
+            pruning.start()
+            pruning.join(0.2)
+            save(record)
+
+        with mock.patch.object(store, "_save", save_while_pruning):
+            record = store.put("/pt/logo/a", b"one")
+        pruning.join()
+        self.assertEqual(pruned, [0])
+        self.assertEqual(store.get("/pt/logo/a"), record)
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        store = LogoStore(self.tmp.name, max_age=0)
+        with StubServer(routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                                    logo_store=store) as client:
+                    first = await client.get_logo_pt(PT_ID)
+                    chunks = await client.stream_logo_pt(PT_ID, chunk_size=1000)
+                    return first, b"".join([chunk async for chunk in chunks])
+            first, streamed = asyncio.run(main())
+
+        self.assertEqual(first, base64.b64encode(LOGO).decode("ascii"))
+        self.assertEqual(streamed, LOGO)
+        stats = store.stats()
+        self.assertEqual((stats["downloads"], stats["revalidated"]), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,153 @@
+"""
+Offline tests for per-endpoint request metrics.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.endpoints import endpoint_template
+from pddiktipy.logostore import LogoStore
+from pddiktipy.metrics import MetricsRegistry, RequestSample
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+MISSING_ID = "pt-missing-0123456789"
+SEMESTER = "20241"
+LOGO = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+
+
+def routes():
+    return {
+        f"/detail/pt/{PT_ID}": (200, {"id": PT_ID}, {}),
+        f"/pt/prodi/{PT_ID}/{SEMESTER}": (200, [{"id": "prodi-1"}], {}),
+        f"/pt/rasio/{PT_ID}": (503, {"message": "down"}, {}),
+        f"/pt/logo/{PT_ID}": (200, LOGO, {"Content-Type": "image/png"}),
+        f"/prodi/logo-pt/{PT_ID}": (200, LOGO, {"Content-Type": "image/png"}),
+    }
+
+
+class TestEndpointTemplate(unittest.TestCase):
+    """Reduction of API paths to metric labels."""
+
+    def test_templates(self):
+        cases = {
+            f"pt/prodi/{PT_ID}/{SEMESTER}": "pt/prodi/{id}/{tahun}",
+            "pencarian/mhs/john%20doe": "pencarian/mhs/{keyword}",
+            "pencarian/all/a/b": "pencarian/all/{keyword}",
+            "dosen/portofolio/karya/abc": "dosen/portofolio/karya/{id}",
+            "dosen/homebase/abc": "dosen/homebase/{id}",
+            "pt/count": "pt/count",
+            "visualisasi/pt-bentuk": "visualisasi/pt-bentuk",
+        }
+        for path, template in cases.items():
+            self.assertEqual(endpoint_template(path), template, path)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Aggregation and Prometheus export."""
+
+    def test_histogram_and_export(self):
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        for latency in (0.05, 0.5, 2.0):
+            registry.observe(RequestSample("detail/pt/{id}", latency, 200, size=10))
+        registry.observe(RequestSample("detail/pt/{id}", 0.2, None, retries=2, error_type="APITimeoutError"))
+
+        stats = registry.snapshot()["detail/pt/{id}"]
+        self.assertEqual(stats["count"], 4)
+        self.assertEqual(stats["statuses"], {200: 3, None: 1})
+        self.assertEqual(stats["errors"], {"APITimeoutError": 1})
+        self.assertEqual((stats["bytes"], stats["retries"], stats["latency_max"]), (30, 2, 2.0))
+        self.assertTrue(0.1 <= stats["latency_p50"] <= 1.0)
+
+        text = registry.to_prometheus()
+        self.assertIn('pddikti_requests_total{endpoint="detail/pt/{id}",status="200"} 3', text)
+        self.assertIn('pddikti_requests_total{endpoint="detail/pt/{id}",status="none"} 1', text)
+        self.assertIn('pddikti_request_errors_total{endpoint="detail/pt/{id}",error="APITimeoutError"} 1', text)
+        self.assertIn('pddikti_request_duration_seconds_bucket{endpoint="detail/pt/{id}",le="0.1"} 1', text)
+        self.assertIn('pddikti_request_duration_seconds_bucket{endpoint="detail/pt/{id}",le="1.0"} 3', text)
+        self.assertIn('pddikti_request_duration_seconds_bucket{endpoint="detail/pt/{id}",le="+Inf"} 4', text)
+        self.assertIn('pddikti_request_duration_seconds_count{endpoint="detail/pt/{id}"} 4', text)
+        self.assertIn('pddikti_response_bytes_total{endpoint="detail/pt/{id}"} 30', text)
+        self.assertIn("# TYPE pddikti_request_duration_seconds histogram", text)
+
+    def test_callbacks(self):
+        seen = []
+
+        def broken(sample):
+            raise RuntimeError("exporter down")
+
+        registry = MetricsRegistry(callbacks=[broken, seen.append])
+        registry.observe(RequestSample("pt/count", 0.1, 200))
+        self.assertEqual([sample.endpoint for sample in seen], ["pt/count"])
+
+
+class TestClientMetrics(unittest.TestCase):
+    """Requests made by the clients are recorded per template."""
+
+    def test_sync_client(self):
+        seen = []
+        registry = MetricsRegistry(callbacks=[seen.append])
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=1, backoff_factor=0,
+                     cache=True, metrics=registry) as client:
+                client.get_detail_pt(PT_ID)
+                client.get_detail_pt(PT_ID)  # cache hit, not a request
+                client.get_detail_pt(MISSING_ID)
+                client.get_prodi_pt(PT_ID, SEMESTER)
+                client.get_rasio_pt(PT_ID)
+
+        stats = registry.snapshot()
+        self.assertEqual(stats["detail/pt/{id}"]["count"], 2)
+        self.assertEqual(stats["detail/pt/{id}"]["statuses"], {200: 1, 404: 1})
+        self.assertEqual(stats["detail/pt/{id}"]["errors"], {"APIResponseError": 1})
+        self.assertGreater(stats["pt/prodi/{id}/{tahun}"]["bytes"], 0)
+        self.assertEqual(stats["pt/rasio/{id}"]["retries"], 1)
+        self.assertEqual(len(seen), 4)
+
+    def test_sync_client_images(self):
+        registry = MetricsRegistry()
+        with tempfile.TemporaryDirectory() as tmp:
+            with StubServer(routes()) as server:
+                with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, metrics=registry) as client:
+                    client.get_logo_pt(PT_ID)
+                    b"".join(client.stream_logo_prodi(PT_ID))
+                with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, metrics=registry,
+                         logo_store=LogoStore(tmp)) as client:
+                    client.get_logo_pt(PT_ID)
+                    client.get_logo_pt(PT_ID)  # served from the logo store
+
+        stats = registry.snapshot()
+        self.assertEqual(stats["pt/logo/{id}"]["count"], 3)
+        self.assertEqual(stats["pt/logo/{id}"]["statuses"], {200: 2, None: 1})
+        self.assertEqual(stats["pt/logo/{id}"]["saved_bytes"], len(LOGO))
+        self.assertEqual(stats["prodi/logo-pt/{id}"]["statuses"], {200: 1})
+        self.assertEqual(stats["prodi/logo-pt/{id}"]["bytes"], len(LOGO))
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer(routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=1,
+                                    backoff_factor=0, metrics=True) as client:
+                    await asyncio.gather(client.get_detail_pt(PT_ID), client.get_rasio_pt(PT_ID),
+                                         client.get_logo_pt(PT_ID))
+                    return client.H.metrics.snapshot()
+            stats = asyncio.run(main())
+        self.assertEqual((stats["pt/logo/{id}"]["statuses"], stats["pt/logo/{id}"]["bytes"]), ({200: 1}, len(LOGO)))
+        self.assertEqual(stats["detail/pt/{id}"]["statuses"], {200: 1})
+        self.assertEqual(stats["detail/pt/{id}"]["bytes"], len('{"id": "pt-0123456789"}'))
+        self.assertEqual((stats["pt/rasio/{id}"]["retries"], stats["pt/rasio/{id}"]["statuses"]), (1, {503: 1}))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
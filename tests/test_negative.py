@@ -0,0 +1,158 @@
+"""
+Offline tests for negative-result caching (404s and empty results).
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.cache import CacheEntry, CachePolicy, MemoryCache, is_empty_result
+from pddiktipy.endpoints import normalize_endpoint
+from pddiktipy.sqlite_cache import SQLiteCache
+from tests.stub_server import StubServer
+
+MHS_ID = "mhs-0123456789"
+BAD_ID = "mhs-bad-0123456789"
+KEYWORD = "Ahmad"
+PRODI_ID = "prodi-0123456789"
+
+
+def routes():
+    return {
+        f"/detail/mhs/{MHS_ID}": (200, {"id": MHS_ID, "nama": "AHMAD"}, {}),
+        f"/pencarian/mhs/{KEYWORD}": (200, [{"id": MHS_ID, "nama": "AHMAD"}], {}),
+        "/pencarian/mhs/Ahmda": (200, [], {}),
+        "/pencarian/mhs/ahmda": (200, [], {}),
+        "/pencarian/all/Ahmda": (200, {"mahasiswa": [], "dosen": [], "pt": [], "prodi": []}, {}),
+        f"/dosen/homebase/{PRODI_ID}?semester=20231": (200, [], {}),
+        f"/dosen/homebase/{PRODI_ID}?semester=20241": (200, [{"nama_dosen": "BUDI"}], {}),
+    }
+
+
+class TestHelpers(unittest.TestCase):
+    """Empty-result detection and keyword normalization."""
+
+    def test_is_empty_result(self):
+        for value in (None, [], {}, {"mahasiswa": [], "dosen": []}):
+            self.assertTrue(is_empty_result(value), value)
+        for value in ([{}], {"id": "x"}, {"mahasiswa": [{"id": "x"}], "dosen": []}, 0, ""):
+            self.assertFalse(is_empty_result(value), value)
+
+    def test_normalize_endpoint(self):
+        self.assertEqual(normalize_endpoint("pencarian/mhs/%20Ahmad%20%20Riski"), "pencarian/mhs/ahmad%20riski")
+        self.assertEqual(normalize_endpoint("pencarian/mhs/AHMAD RISKI"), "pencarian/mhs/ahmad%20riski")
+        self.assertEqual(normalize_endpoint(f"detail/mhs/{BAD_ID.upper()}"), f"detail/mhs/{BAD_ID.upper()}")
+
+
+class TestNegativeCaching(unittest.TestCase):
+    """404s and empty results are cached with their own TTL."""
+
+    def test_not_found_and_empty_results_cached(self):
+        policy = CachePolicy(ttls={"pencarian": 0, "detail": 0}, negative_ttl=60)
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=MemoryCache(),
+                     cache_policy=policy) as client:
+                for _ in range(3):
+                    self.assertIsNone(client.get_detail_mhs(BAD_ID))
+                    self.assertEqual(client.search_mahasiswa("Ahmda"), [])
+                    self.assertEqual(client.search_all("Ahmda")["mahasiswa"], [])
+                    self.assertEqual(client.get_detail_mhs(MHS_ID)["nama"], "AHMAD")
+                    self.assertEqual(len(client.search_mahasiswa(KEYWORD)), 1)
+                # A differently cased misspelling shares the negative entry
+                self.assertEqual(client.search_mahasiswa("  AHMDA "), [])
+                result = api(base_url=server.base_url, user_ip="127.0.0.1", retries=0,
+                             cache=client.H.cache, cache_policy=policy,
+                             return_results=True).get_detail_mhs(BAD_ID)
+            hits = server.hits
+
+        self.assertEqual(hits[f"/detail/mhs/{BAD_ID}"], 1)
+        self.assertEqual(hits["/pencarian/mhs/Ahmda"], 1)
+        self.assertEqual(hits["/pencarian/all/Ahmda"], 1)
+        self.assertNotIn("/pencarian/mhs/%20%20AHMDA%20", hits)
+        # Positive caching is disabled for these families
+        self.assertEqual(hits[f"/detail/mhs/{MHS_ID}"], 3)
+        self.assertEqual(hits[f"/pencarian/mhs/{KEYWORD}"], 3)
+        self.assertEqual((result.status_code, result.error_type), (404, "APIResponseError"))
+
+    def test_negative_ttl_expires_and_is_tunable(self):
+        policy = CachePolicy(negative_ttl={"detail": 0.05})
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=MemoryCache(),
+                     cache_policy=policy) as client:
+                client.get_detail_mhs(BAD_ID)
+                client.get_detail_mhs(BAD_ID)
+                time.sleep(0.1)
+                client.get_detail_mhs(BAD_ID)
+                # pencarian has no negative TTL: empty results use the positive TTL
+                client.search_mahasiswa("Ahmda")
+                client.search_mahasiswa("ahmda")
+                client.search_mahasiswa("Ahmda")
+            hits = server.hits
+
+        self.assertEqual(hits[f"/detail/mhs/{BAD_ID}"], 2)
+        self.assertEqual((hits["/pencarian/mhs/Ahmda"], hits["/pencarian/mhs/ahmda"]), (1, 1))
+
+    def test_query_string_is_part_of_the_key(self):
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=MemoryCache(),
+                     cache_policy=CachePolicy(ttls={"dosen": 0}, negative_ttl=60)) as client:
+                self.assertEqual(client.get_homebase_prodi(PRODI_ID, 20231), [])
+                self.assertEqual(client.get_homebase_prodi(PRODI_ID, 20241), [{"nama_dosen": "BUDI"}])
+                self.assertEqual(client.get_homebase_prodi(PRODI_ID, 20231), [])
+            hits = server.hits
+
+        self.assertEqual(hits[f"/dosen/homebase/{PRODI_ID}?semester=20231"], 1)
+        self.assertEqual(hits[f"/dosen/homebase/{PRODI_ID}?semester=20241"], 1)
+
+    def test_miss_counted_once(self):
+        cache = MemoryCache()
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=cache,
+                     cache_policy=CachePolicy(negative_ttl=60)) as client:
+                client.get_detail_mhs(MHS_ID)
+                self.assertEqual((cache.hits, cache.misses), (0, 1))
+                client.get_detail_mhs(MHS_ID)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_disabled_by_default(self):
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=MemoryCache()) as client:
+                client.get_detail_mhs(BAD_ID)
+                client.get_detail_mhs(BAD_ID)
+            self.assertEqual(server.hits[f"/detail/mhs/{BAD_ID}"], 2)
+
+    def test_sqlite_keeps_status(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SQLiteCache(os.path.join(tmp, "cache.db"))
+            cache.set("negative:x", CacheEntry(None, time.time() + 60, status=404))
+            self.assertEqual(cache.get("negative:x").status, 404)
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer(routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=MemoryCache(),
+                                    cache_policy=CachePolicy(negative_ttl=60)) as client:
+                    missing = [await client.get_detail_mhs(BAD_ID) for _ in range(3)]
+                    empty = [await client.search_mahasiswa(keyword) for keyword in ("Ahmda", "ahmda")]
+                    return missing, empty
+            missing, empty = asyncio.run(main())
+            hits = server.hits
+
+        self.assertEqual((missing, empty), ([None] * 3, [[], []]))
+        self.assertEqual(hits[f"/detail/mhs/{BAD_ID}"], 1)
+        self.assertEqual(hits["/pencarian/mhs/Ahmda"] + hits["/pencarian/mhs/ahmda"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
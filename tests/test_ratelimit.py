@@ -0,0 +1,176 @@
+"""
+Offline tests for the client-side rate limiter.
+"""
+
+import asyncio
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from email.utils import formatdate
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.ratelimit import RateLimiter, SQLiteRateLimiter, parse_retry_after
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+
+
+def _reserve_in_child(limiter):
+    """Takes tokens in a forked child; exits 1 if it reused the parent's connection."""
+    inherited = limiter._local.conn
+    for _ in range(5):
+        limiter.reserve()
+    sys.exit(0 if limiter._local.conn is not inherited else 1)
+
+
+class Throttling:
+    """Stub route answering 429 for the first ``times`` requests."""
+
+    def __init__(self, times, retry_after="0"):
+        self.times = times
+        self.retry_after = retry_after
+
+    def __call__(self, handler):
+        if self.times:
+            self.times -= 1
+            return 429, {"message": "slow down"}, {"Retry-After": self.retry_after}
+        return 200, {"id": PT_ID}, {}
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Token bucket pacing and adaptation."""
+
+    def test_paces_requests(self):
+        limiter = RateLimiter(rate=50, burst=1, adaptive=False)
+        started = time.perf_counter()
+        for _ in range(11):
+            limiter.acquire()
+        elapsed = time.perf_counter() - started
+        self.assertGreaterEqual(elapsed, 0.18)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(limiter.metrics()["acquired"], 11)
+
+    def test_throttle_slows_down_and_pauses(self):
+        limiter = RateLimiter(rate=8, max_rate=10, min_rate=1)
+        self.assertEqual(limiter.on_throttle("2"), 2.0)
+        metrics = limiter.metrics()
+        self.assertEqual(metrics["rate"], 4.0)
+        self.assertGreater(metrics["paused_for"], 1.5)
+        self.assertEqual(metrics["throttled"], 1)
+        self.assertGreaterEqual(limiter.reserve(), 1.5)
+
+        # Recovers additively once the pause is over and 429s are rare
+        limiter.pause_until = 0.0
+        limiter.throttle_ratio = 0.0
+        limiter.last_increase -= 1.0
+        limiter.on_success()
+        self.assertEqual(limiter.metrics()["rate"], 5.0)
+        for _ in range(10):
+            limiter.last_increase -= 1.0
+            limiter.on_success()
+        self.assertEqual(limiter.metrics()["rate"], 10.0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 30, usegmt=True)), 30, delta=2)
+
+    def test_queue_depth(self):
+        limiter = RateLimiter(rate=10, burst=1, adaptive=False)
+        limiter.acquire()
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        self.assertEqual(limiter.metrics()["waiting"], 3)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(limiter.metrics()["waiting"], 0)
+
+    def test_sqlite_limiter_is_shared(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "limits.db")
+            first = SQLiteRateLimiter(path, rate=20, burst=1, adaptive=False)
+            second = SQLiteRateLimiter(path, rate=20, burst=1, adaptive=False)
+            self.assertEqual(first.reserve(), 0.0)
+            # The token taken by ``first`` is gone for ``second`` too
+            self.assertAlmostEqual(second.reserve(), 0.05, delta=0.02)
+            second.on_throttle("1")
+            self.assertGreater(first.metrics()["paused_for"], 0.5)
+        finally:
+            shutil.rmtree(directory)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_sqlite_limiter_reconnects_after_fork(self):
+        directory = tempfile.mkdtemp()
+        try:
+            limiter = SQLiteRateLimiter(os.path.join(directory, "limits.db"), rate=1000, burst=100,
+                                        adaptive=False)
+            limiter.reserve()
+            procs = [multiprocessing.get_context("fork").Process(target=_reserve_in_child, args=(limiter,))
+                     for _ in range(3)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
+            self.assertEqual([p.exitcode for p in procs], [0, 0, 0])
+            # The parent keeps using its own connection
+            self.assertGreaterEqual(limiter.reserve(), 0.0)
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestClientRateLimit(unittest.TestCase):
+    """429 handling through the limiter instead of urllib3."""
+
+    def test_retries_429_through_limiter(self):
+        limiter = RateLimiter(rate=100, max_rate=100)
+        with StubServer({f"/detail/pt/{PT_ID}": Throttling(2)}) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", rate_limit=limiter) as client:
+                self.assertNotIn(429, client.H.retry_statuses())
+                self.assertEqual(client.get_detail_pt(PT_ID), {"id": PT_ID})
+        self.assertEqual(server.hits[f"/detail/pt/{PT_ID}"], 3)
+        metrics = limiter.metrics()
+        self.assertEqual(metrics["throttled"], 2)
+        self.assertEqual(metrics["rate"], 25.0)
+
+    def test_gives_up_after_max_retries(self):
+        limiter = RateLimiter(rate=100, max_retries=1)
+        with StubServer({f"/detail/pt/{PT_ID}": Throttling(10)}) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", rate_limit=limiter) as client:
+                result = client._call_result("get_detail_pt", PT_ID, PT_ID)
+        self.assertEqual(result.error.status_code, 429)
+        self.assertEqual(server.hits[f"/detail/pt/{PT_ID}"], 2)
+
+    def test_rate_as_number(self):
+        with api(user_ip="127.0.0.1", rate_limit=5) as client:
+            self.assertEqual(client.H.rate_limiter.metrics()["rate"], 5.0)
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        limiter = RateLimiter(rate=100)
+        with StubServer({f"/detail/pt/{PT_ID}": Throttling(1)}) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1",
+                                    retries=0, rate_limit=limiter) as client:
+                    return await client.get_detail_pt(PT_ID)
+            self.assertEqual(asyncio.run(main()), {"id": PT_ID})
+        self.assertEqual(server.hits[f"/detail/pt/{PT_ID}"], 2)
+        self.assertEqual(limiter.metrics()["throttled"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,94 @@
+"""
+Offline tests for structured results (``api(return_results=True)``).
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.exceptions import APIRateLimitError, APIResponseError, APITimeoutError, CircuitOpenError
+from pddiktipy.result import Result
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+MISSING_ID = "pt-missing-0123456789"
+FLAKY_ID = "pt-flaky-0123456789"
+
+
+def routes():
+    return {
+        f"/detail/pt/{PT_ID}": (200, {"id": PT_ID}, {}),
+        f"/detail/pt/{FLAKY_ID}": (503, {"message": "down"}, {}),
+    }
+
+
+class TestResult(unittest.TestCase):
+    """Error classification on ``Result``."""
+
+    def test_retryable(self):
+        self.assertFalse(Result(data=1).retryable)
+        self.assertIsNone(Result(data=1).error_type)
+        for error in (APITimeoutError("t"), APIRateLimitError("r", status_code=429),
+                      APIResponseError("s", status_code=502), CircuitOpenError("c")):
+            self.assertTrue(Result(error=error).retryable, error)
+        not_found = Result(error=APIResponseError("missing", status_code=404))
+        self.assertFalse(not_found.retryable)
+        self.assertEqual(not_found.error_type, "APIResponseError")
+
+
+class TestReturnResults(unittest.TestCase):
+    """Every API method returns a ``Result`` on an opted-in client."""
+
+    def test_sync_client(self):
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=2, backoff_factor=0,
+                     return_results=True, cache=True) as client:
+                result = client.get_detail_pt(PT_ID)
+                self.assertTrue(result.ok)
+                self.assertEqual((result.key, result.data), (PT_ID, {"id": PT_ID}))
+                self.assertEqual((result.status_code, result.attempts), (200, 1))
+                self.assertGreater(result.latency, 0)
+
+                cached = client.get_detail_pt(PT_ID)
+                self.assertEqual((cached.data, cached.attempts), ({"id": PT_ID}, 0))
+
+                missing = client.get_detail_pt(MISSING_ID)
+                self.assertEqual((missing.error_type, missing.status_code), ("APIResponseError", 404))
+                self.assertFalse(missing.retryable)
+
+                flaky = client.get_detail_pt(FLAKY_ID)
+                self.assertEqual((flaky.attempts, flaky.status_code), (3, 503))
+                self.assertTrue(flaky.retryable)
+                self.assertEqual(server.hits[f"/detail/pt/{FLAKY_ID}"], 3)
+
+                invalid = client.get_detail_pt("")
+                self.assertEqual((invalid.error_type, invalid.attempts), ("ValidationError", 0))
+
+        with api(base_url="http://127.0.0.1:9", user_ip="127.0.0.1") as plain:
+            self.assertIsNone(plain.get_detail_pt(""))
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer(routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=1,
+                                    backoff_factor=0, return_results=True) as client:
+                    return await asyncio.gather(client.get_detail_pt(PT_ID),
+                                                client.get_detail_pt(MISSING_ID),
+                                                client.get_detail_pt(FLAKY_ID))
+            ok, missing, flaky = asyncio.run(main())
+        self.assertEqual((ok.data, ok.status_code, ok.attempts), ({"id": PT_ID}, 200, 1))
+        self.assertEqual((missing.status_code, missing.retryable), (404, False))
+        self.assertEqual((flaky.status_code, flaky.attempts, flaky.retryable), (503, 2, True))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,119 @@
+"""
+Offline tests for request coalescing (pddiktipy.singleflight).
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.singleflight import AsyncSingleFlight, SingleFlight
+from tests.stub_server import StubServer
+
+PT_ID = "6m7kg4twGiZAdNiUDMC9Q6KaGqUBqNU9_fLWD8DaSxMF-cIjwu8A7K6lWYKzaJXGBDQHsQ=="
+
+
+def run_threads(target, count):
+    barrier = threading.Barrier(count)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(target())
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Concurrent identical calls share one upstream request."""
+
+    def test_group_shares_result_and_error(self):
+        group = SingleFlight()
+        gate = threading.Event()
+
+        def slow():
+            gate.wait(1)
+            raise KeyError("boom")
+
+        errors = []
+
+        def call():
+            try:
+                group.do("k", slow)
+            except KeyError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for t in threads:
+            t.start()
+        while group.stats()["coalesced"] < 4:
+            time.sleep(0.001)
+        gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(errors), 5)
+        self.assertEqual(group.stats(), {"leaders": 1, "coalesced": 4, "in_flight": 0})
+
+    def test_async_group_survives_cancelled_leader(self):
+        group = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return {"count": 1}
+
+        async def main():
+            leader = asyncio.ensure_future(group.do("k", slow))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(group.do("k", slow))
+            await asyncio.sleep(0)
+            leader.cancel()
+            result = await follower
+            return leader.cancelled(), result
+
+        self.assertEqual(asyncio.run(main()), (True, {"count": 1}))
+        self.assertEqual(group.stats(), {"leaders": 1, "coalesced": 1, "in_flight": 0})
+
+    def test_client_coalesces_identical_calls(self):
+        routes = {
+            f"/detail/pt/{PT_ID}": (200, {"nama_pt": "Unika"}, {}),
+            f"/pt/prodi/{PT_ID}/20241": (200, [{"nama_prodi": "Sistem Informasi"}], {}),
+        }
+        with StubServer(routes, delay=0.2) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", max_threads=40, coalesce=True) as client:
+                details = run_threads(lambda: client.get_detail_pt(PT_ID), 20)
+                prodi = run_threads(lambda: client.get_prodi_pt(PT_ID, 20241), 20)
+                stats = client.H.singleflight.stats()
+        self.assertTrue(all(d == {"nama_pt": "Unika"} for d in details))
+        self.assertTrue(all(p[0]["nama_prodi"] == "Sistem Informasi" for p in prodi))
+        self.assertEqual(server.hits[f"/detail/pt/{PT_ID}"], 1)
+        self.assertEqual(server.hits[f"/pt/prodi/{PT_ID}/20241"], 1)
+        self.assertEqual(stats["coalesced"], 38)
+
+    def test_async_client_coalesces(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        with StubServer({"/pt/count": (200, {"count": 1}, {})}, delay=0.1) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", coalesce=True) as client:
+                    self.assertIsInstance(client.H.singleflight, AsyncSingleFlight)
+                    return await asyncio.gather(*[client.get_pt_count() for _ in range(25)])
+            results = asyncio.run(main())
+        self.assertEqual(results, [{"count": 1}] * 25)
+        self.assertEqual(server.hits["/pt/count"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,117 @@
+"""
+Offline tests for snapshot diffing between crawls.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.crawler import Crawler
+from pddiktipy.snapshot import SnapshotStore, content_hash
+from tests.stub_server import StubServer
+from tests.test_crawler import SEMESTER, catalogue_routes, read_ndjson
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Hashes per entity ID and added/changed/removed detection."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = SnapshotStore(os.path.join(self.dir, "snapshots.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir)
+
+    def test_content_hash_ignores_key_order(self):
+        self.assertEqual(content_hash({"a": 1, "b": [1, 2]}), content_hash({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(content_hash({"a": 1}), content_hash({"a": 2}))
+
+    def test_diff_between_runs(self):
+        first = [{"id": "1", "nama": "A"}, {"id": "2", "nama": "B"}, {"id": "3", "nama": "C"}]
+        self.assertEqual([c.kind for c in self.store.diff("pt", first)], ["added"] * 3)
+        self.assertEqual(list(self.store.diff("pt", first)), [])
+
+        second = [{"id": "1", "nama": "A"}, {"id": "2", "nama": "B2"}, {"id": "4", "nama": "D"}]
+        changes = {(c.kind, c.id) for c in self.store.diff("pt", second)}
+        self.assertEqual(changes, {("changed", "2"), ("added", "4"), ("removed", "3")})
+        self.assertEqual(self.store.stats(), {"pt": 3})
+
+    def test_unfinished_run_is_resumed(self):
+        run = self.store.begin()
+        self.store.observe("pt", "1", {"v": 1})
+        self.store.commit()
+        self.store.close()
+
+        self.store = SnapshotStore(os.path.join(self.dir, "snapshots.db"))
+        self.assertEqual(self.store.begin(), run)
+        self.assertIsNone(self.store.observe("pt", "1", {"v": 1}))
+        self.assertEqual(self.store.finish(), [])
+        self.assertNotEqual(self.store.begin(), run)
+
+
+class TestCrawlerSnapshot(unittest.TestCase):
+    """A second crawl writes only the delta."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def crawl(self, routes, name, store):
+        output = os.path.join(self.dir, name)
+        with StubServer(routes) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0) as client:
+                crawler = Crawler(client, output, SEMESTER, max_workers=4, details=True, snapshot=store)
+                return output, crawler.run(["universitas", "institut"])
+
+    def test_weekly_delta(self):
+        routes = catalogue_routes()
+        routes.update({f"/detail/pt/{pt_id}": (200, {"id": pt_id, "akreditasi": "A"}, {})
+                       for pt_id in ("pt-aaaaaaaaaa", "pt-bbbbbbbbbb", "pt-cccccccccc")})
+        routes.update({f"/prodi/detail/{prodi_id}": (200, {"id_sms": prodi_id}, {})
+                       for prodi_id in ("prodi-a1-xxxxxxxx", "prodi-a2-xxxxxxxx", "prodi-b1-xxxxxxxx",
+                                        "prodi-b2-xxxxxxxx", "prodi-c1-xxxxxxxx")})
+        with SnapshotStore(os.path.join(self.dir, "snapshots.db")) as store:
+            _, first = self.crawl(routes, "week1", store)
+            self.assertEqual(first.changes["unchanged"], 0)
+
+            routes["/detail/pt/pt-aaaaaaaaaa"] = (200, {"id": "pt-aaaaaaaaaa", "akreditasi": "Unggul"}, {})
+            routes[f"/pt/prodi/pt-bbbbbbbbbb/{SEMESTER}"] = (
+                200, [{"id_sms": "prodi-b1-xxxxxxxx", "nama_prodi": "prodi-b1-xxxxxxxx"}], {})
+            output, second = self.crawl(routes, "week2", store)
+
+        self.assertEqual(read_ndjson(os.path.join(output, "pt_detail.ndjson")),
+                         [{"id": "pt-aaaaaaaaaa", "akreditasi": "Unggul"}])
+        self.assertEqual(os.path.getsize(os.path.join(output, "pt.ndjson")), 0)
+        self.assertEqual(os.path.getsize(os.path.join(output, "prodi.ndjson")), 0)
+        removed = read_ndjson(os.path.join(output, "removed.ndjson"))
+        self.assertCountEqual(removed, [{"entity": "prodi", "id": "prodi-b2-xxxxxxxx"},
+                                        {"entity": "homebase", "id": "prodi-b2-xxxxxxxx"},
+                                        {"entity": "prodi_detail", "id": "prodi-b2-xxxxxxxx"}])
+        self.assertEqual(second.changes["changed"], 1)
+        self.assertEqual(second.changes["added"], 0)
+        self.assertEqual(second.changes["removed"], 3)
+        with open(os.path.join(output, "journal.ndjson"), encoding="utf-8") as f:
+            self.assertTrue(all(json.loads(line) for line in f))
+
+    def test_rerun_on_complete_directory_keeps_snapshot(self):
+        with SnapshotStore(os.path.join(self.dir, "snapshots.db")) as store:
+            _, first = self.crawl(catalogue_routes(), "week1", store)
+            before = store.stats()
+            _, second = self.crawl(catalogue_routes(), "week1", store)
+            self.assertEqual(store.stats(), before)
+        self.assertGreater(first.changes["added"], 0)
+        self.assertEqual(second.changes["removed"], 0)
+        self.assertEqual(second.done, 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
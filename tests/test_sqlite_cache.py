@@ -0,0 +1,95 @@
+"""
+Offline tests for the persistent SQLite cache (pddiktipy.sqlite_cache).
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.cache import CacheEntry
+from pddiktipy.sqlite_cache import SQLiteCache, main
+from tests.stub_server import StubServer
+
+
+def _writer(path, start, count):
+    cache = SQLiteCache(path)
+    for i in range(start, start + count):
+        cache.set(f"key-{i}", CacheEntry({"i": i}, time.time() + 60))
+
+
+class TestSQLiteCache(unittest.TestCase):
+    """Shared, compressed, expiring storage."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_expiry(self):
+        cache = SQLiteCache(self.path)
+        cache.set("fresh", CacheEntry({"nama": "Unika Soegijapranata"}, time.time() + 60))
+        cache.set("stale", CacheEntry([1, 2, 3], time.time() - 1))
+        self.assertEqual(cache.get("fresh").value, {"nama": "Unika Soegijapranata"})
+        self.assertIsNone(cache.get("stale"))
+        self.assertEqual(cache.prune(), 1)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+
+    def test_shared_between_processes(self):
+        """Concurrent writer processes all land in the same database."""
+        SQLiteCache(self.path)
+        procs = [multiprocessing.Process(target=_writer, args=(self.path, n * 50, 50)) for n in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        self.assertTrue(all(p.exitcode == 0 for p in procs))
+        cache = SQLiteCache(self.path)
+        self.assertEqual(cache.stats()["size"], 200)
+        self.assertEqual(cache.get("key-199").value, {"i": 199})
+
+    def test_evicts_least_recently_used_past_max_bytes(self):
+        cache = SQLiteCache(self.path, max_bytes=None)
+        payload = {"data": os.urandom(512).hex()}
+        for i in range(10):
+            cache.set(f"k{i}", CacheEntry(payload, time.time() + 60))
+        entry_size = next(cache.entries())["size"]
+        removed = cache.evict(max_bytes=entry_size * 4)
+        self.assertEqual(removed, 6)
+        self.assertEqual([e["key"] for e in cache.entries()][-1], "k6")
+
+    def test_client_survives_restart(self):
+        """A new client on the same file is served from disk."""
+        routes = {"/pt/count": (200, {"count": 4523}, {})}
+        with StubServer(routes) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", cache=SQLiteCache(self.path)) as client:
+                client.get_pt_count()
+            with api(base_url=server.base_url, user_ip="127.0.0.1", cache=SQLiteCache(self.path)) as client:
+                self.assertEqual(client.get_pt_count(), {"count": 4523})
+        self.assertEqual(server.hits["/pt/count"], 1)
+
+    def test_cli(self):
+        cache = SQLiteCache(self.path)
+        cache.set("http://x/pt/count", CacheEntry({"count": 1}, time.time() - 1))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(main([self.path, "list"]), 0)
+            self.assertEqual(main([self.path, "prune"]), 0)
+            self.assertEqual(main([self.path, "stats"]), 0)
+        text = out.getvalue()
+        self.assertIn("expired  http://x/pt/count", text)
+        self.assertIn("Removed 1 expired entries", text)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,166 @@
+"""
+Offline tests for stale-while-revalidate and stale-if-error cache serving.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.cache import CacheEntry, CachePolicy, MemoryCache
+from pddiktipy.sqlite_cache import SQLiteCache
+from tests.stub_server import StubServer
+
+TTL = 0.05
+SLOW = 0.5
+
+
+class Versioned:
+    """Route answering ``{"version": n}`` with n counting requests; later ones are slow."""
+
+    def __init__(self):
+        self.version = 0
+
+    def __call__(self, handler):
+        self.version += 1
+        if self.version > 1:
+            time.sleep(SLOW)
+        return 200, {"version": self.version}, {}
+
+
+class Failing:
+    """Route answering once, then failing with ``status``."""
+
+    def __init__(self, status):
+        self.status = status
+        self.calls = 0
+
+    def __call__(self, handler):
+        self.calls += 1
+        if self.calls == 1:
+            return 200, {"jumlah": 4500}, {}
+        return self.status, {"message": "error"}, {}
+
+
+def client(server, **policy):
+    return api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=MemoryCache(),
+               cache_policy=CachePolicy(ttls={"count": TTL}, **policy))
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    """Expired entries are served at once while one refresh runs."""
+
+    def test_serves_stale_and_refreshes_once(self):
+        route = Versioned()
+        with StubServer({"/pt/count": route}) as server:
+            with client(server, stale_while_revalidate=60) as c:
+                self.assertEqual(c.get_pt_count(), {"version": 1})
+                time.sleep(TTL * 2)
+                started = time.perf_counter()
+                results = []
+                threads = [threading.Thread(target=lambda: results.append(c.get_pt_count())) for _ in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+                self.assertTrue(c.H.wait_for_refreshes(timeout=5))
+                self.assertEqual(c.get_pt_count(), {"version": 2})
+            hits = server.hits["/pt/count"]
+
+        self.assertEqual(results, [{"version": 1}] * 8)
+        self.assertLess(elapsed, SLOW)
+        self.assertEqual(hits, 2)
+
+    def test_window_limits_staleness(self):
+        route = Versioned()
+        with StubServer({"/pt/count": route}) as server:
+            with client(server, stale_while_revalidate={"count": TTL}) as c:
+                c.get_pt_count()
+                time.sleep(TTL * 3)
+                # Expired beyond the window: a blocking refetch
+                self.assertEqual(c.get_pt_count(), {"version": 2})
+                self.assertEqual(c.H._refreshes, {})
+
+    def test_async_client(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        route = Versioned()
+        with StubServer({"/pt/count": route}) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=MemoryCache(),
+                                    cache_policy=CachePolicy(ttls={"count": TTL},
+                                                             stale_while_revalidate=60)) as c:
+                    first = await c.get_pt_count()
+                    await asyncio.sleep(TTL * 2)
+                    stale = await asyncio.gather(*[c.get_pt_count() for _ in range(8)])
+                    self.assertTrue(await c.H.wait_for_refreshes(timeout=5))
+                    return first, stale, await c.get_pt_count()
+            first, stale, fresh = asyncio.run(main())
+            hits = server.hits["/pt/count"]
+
+        self.assertEqual(first, {"version": 1})
+        self.assertEqual(stale, [{"version": 1}] * 8)
+        self.assertEqual((fresh, hits), ({"version": 2}, 2))
+
+
+class TestStaleIfError(unittest.TestCase):
+    """Expired entries stand in for upstream failures only."""
+
+    def test_serves_stale_on_upstream_error(self):
+        with StubServer({"/pt/count": Failing(503)}) as server:
+            with client(server, stale_if_error=60) as c:
+                c.get_pt_count()
+                time.sleep(TTL * 2)
+                self.assertEqual(c.get_pt_count(), {"jumlah": 4500})
+                self.assertEqual(c.get_pt_count(), {"jumlah": 4500})
+            hits = server.hits["/pt/count"]
+        self.assertEqual(hits, 3)
+
+    def test_client_errors_and_expired_window_raise(self):
+        with StubServer({"/pt/count": Failing(404)}) as server:
+            with client(server, stale_if_error=60) as c:
+                c.get_pt_count()
+                time.sleep(TTL * 2)
+                self.assertIsNone(c.get_pt_count())
+        with StubServer({"/pt/count": Failing(503)}) as server:
+            with client(server, stale_if_error=TTL) as c:
+                c.get_pt_count()
+                time.sleep(TTL * 3)
+                self.assertIsNone(c.get_pt_count())
+
+
+class TestRetention(unittest.TestCase):
+    """Backends keep expired entries for their stale window."""
+
+    def test_memory_cache(self):
+        cache = MemoryCache()
+        now = time.time()
+        cache.set("stale", CacheEntry(1, now - 1, stale_until=now + 60))
+        cache.set("gone", CacheEntry(2, now - 1, stale_until=now - 0.5))
+        self.assertIsNone(cache.get("stale"))
+        self.assertIsNone(cache.get("gone"))
+        self.assertEqual(cache.get_stale("stale").value, 1)
+        self.assertIsNone(cache.get_stale("gone"))
+
+    def test_sqlite_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SQLiteCache(os.path.join(tmp, "cache.db"))
+            now = time.time()
+            cache.set("stale", CacheEntry(1, now - 1, stale_until=now + 60))
+            cache.set("gone", CacheEntry(2, now - 1))
+            self.assertEqual(cache.prune(), 1)
+            self.assertEqual(cache.get_stale("stale").stale_until, now + 60)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
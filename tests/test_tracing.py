@@ -0,0 +1,118 @@
+"""
+Offline tests for tracing hooks.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pddiktipy import api
+from pddiktipy.exceptions import APIResponseError
+from pddiktipy.tracing import RecordingTracer, Tracer
+from tests.stub_server import StubServer
+
+PT_ID = "pt-0123456789"
+MISSING_ID = "pt-missing-0123456789"
+
+
+def routes():
+    return {f"/detail/pt/{PT_ID}": (200, {"id": PT_ID}, {})}
+
+
+class TestTracing(unittest.TestCase):
+    """Spans emitted around API calls."""
+
+    def test_sync_spans(self):
+        tracer = RecordingTracer()
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", retries=0, cache=True,
+                     tracer=tracer) as client:
+                client.get_detail_pt(PT_ID)
+                spans = {span.name: span for span in tracer.spans}
+                self.assertEqual([span.name for span in tracer.spans], [
+                    "pddikti.validate", "pddikti.headers", "pddikti.http", "pddikti.decode",
+                    "pddikti.request", "pddikti.get_detail_pt",
+                ])
+                self.assertEqual(spans["pddikti.validate"].parent, "pddikti.get_detail_pt")
+                self.assertEqual(spans["pddikti.request"].parent, "pddikti.get_detail_pt")
+                for phase in ("pddikti.headers", "pddikti.http", "pddikti.decode"):
+                    self.assertEqual(spans[phase].parent, "pddikti.request", phase)
+                self.assertEqual(spans["pddikti.get_detail_pt"].attributes, {"pddikti.method": "get_detail_pt"})
+                self.assertEqual(spans["pddikti.request"].attributes, {
+                    "pddikti.endpoint": "detail/pt/{id}",
+                    "pddikti.cache_hit": False,
+                    "http.status_code": 200,
+                    "pddikti.response_bytes": len('{"id": "pt-0123456789"}'),
+                    "pddikti.attempts": 1,
+                })
+
+                tracer.clear()
+                client.get_detail_pt(PT_ID)
+                request = [span for span in tracer.spans if span.name == "pddikti.request"][0]
+                self.assertTrue(request.attributes["pddikti.cache_hit"])
+                self.assertEqual(request.attributes["pddikti.attempts"], 0)
+
+                tracer.clear()
+                self.assertIsNone(client.get_detail_pt(MISSING_ID))
+                spans = {span.name: span for span in tracer.spans}
+                self.assertIsInstance(spans["pddikti.get_detail_pt"].error, APIResponseError)
+                self.assertEqual(spans["pddikti.request"].attributes["http.status_code"], 404)
+
+                tracer.clear()
+                client.get_detail_pt("")
+                self.assertEqual([span.name for span in tracer.spans], ["pddikti.validate", "pddikti.get_detail_pt"])
+
+    def test_noop_tracer(self):
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", tracer=Tracer(),
+                     return_results=True) as client:
+                self.assertEqual(client.get_detail_pt(PT_ID).data, {"id": PT_ID})
+
+    def test_async_spans(self):
+        if importlib.util.find_spec("aiohttp") is None:  # pragma: no cover
+            self.skipTest("aiohttp not installed")
+        from pddiktipy.aio import AsyncApi
+
+        tracer = RecordingTracer()
+        with StubServer(routes()) as server:
+            async def main():
+                async with AsyncApi(base_url=server.base_url, user_ip="127.0.0.1", tracer=tracer) as client:
+                    await asyncio.gather(client.get_detail_pt(PT_ID), client.get_detail_pt(PT_ID))
+            asyncio.run(main())
+        requests = [span for span in tracer.spans if span.name == "pddikti.request"]
+        self.assertEqual(len(requests), 2)
+        self.assertTrue(all(span.parent == "pddikti.get_detail_pt" for span in requests))
+        self.assertEqual(requests[0].attributes["http.status_code"], 200)
+        for phase in ("pddikti.validate", "pddikti.headers", "pddikti.http", "pddikti.decode"):
+            spans = [span for span in tracer.spans if span.name == phase]
+            parent = "pddikti.get_detail_pt" if phase == "pddikti.validate" else "pddikti.request"
+            self.assertEqual([span.parent for span in spans], [parent] * 2, phase)
+
+    def test_opentelemetry_adapter(self):
+        try:
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        except ImportError:
+            self.skipTest("opentelemetry-sdk not installed")
+        from pddiktipy.tracing import OpenTelemetryTracer
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = OpenTelemetryTracer(provider.get_tracer("test"))
+        with StubServer(routes()) as server:
+            with api(base_url=server.base_url, user_ip="127.0.0.1", tracer=tracer) as client:
+                client.get_detail_pt(PT_ID)
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        self.assertEqual(spans["pddikti.request"].parent.span_id,
+                         spans["pddikti.get_detail_pt"].context.span_id)
+        self.assertEqual(spans["pddikti.request"].attributes["pddikti.endpoint"], "detail/pt/{id}")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)